@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+"""
+import_time.py
+
+Measures what importing a pipeline module costs a cold process, e.g. a
+worker that starts for every job. Each run imports the module in a fresh
+interpreter under `python -X importtime` and reports the best total over
+the runs, the slowest imports the module makes and any heavy package
+(plotting, LLM client, statistics) that the import pulled in although
+only the stages that use it should.
+
+Examples:
+    python import_time.py                     # import main
+    python import_time.py dcopf --runs 10
+    python import_time.py --max-ms 1500       # exit 1 above the budget or when a heavy package loads
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Packages the solve path must not import; they belong to the plot and report stages
+HEAVY_PACKAGES = ["matplotlib", "seaborn", "networkx", "openai", "statsmodels", "dotenv"]
+
+
+def measure(module: str):
+    """
+    (total import time in ms, {direct import of module: cumulative ms},
+    heavy packages loaded) of one fresh `import module`
+    """
+    code = (
+        f"import sys; import {module}; "
+        f"print(','.join(p for p in {HEAVY_PACKAGES!r} if p in sys.modules))"
+    )
+    run = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=SCRIPTS_DIR, capture_output=True, text=True
+    )
+    if run.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{run.stderr[-2000:]}")
+
+    # Lines read "import time: <self us> | <cumulative us> | <name indented by depth>",
+    # and every module is listed after the imports it made
+    total_ms, children, direct = 0.0, {}, {}
+    for line in run.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        ms = int(cumulative) / 1000.0
+        if depth == 1:
+            children[name.strip()] = ms
+        elif depth == 0:
+            total_ms += ms
+            if name.strip() == module:
+                direct = children
+            children = {}
+    heavy = [p for p in run.stdout.strip().split(",") if p]
+    return total_ms, direct, heavy
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the cold import time of a pipeline module")
+    parser.add_argument("module", nargs="?", default="main", help="module to import, relative to scripts/")
+    parser.add_argument("--runs", type=int, default=5, help="fresh imports; the fastest counts")
+    parser.add_argument("--top", type=int, default=10, help="slowest direct imports of the module to list")
+    parser.add_argument("--max-ms", type=float, help="fail when the import takes longer")
+    parser.add_argument("-o", "--output", help="JSON file to write")
+    args = parser.parse_args(argv)
+
+    runs = [measure(args.module) for _ in range(max(args.runs, 1))]
+    total_ms, direct, heavy = min(runs, key=lambda run: run[0])
+    slowest = sorted(direct.items(), key=lambda item: item[1], reverse=True)[:args.top]
+
+    print(f"import {args.module}: {total_ms:.1f} ms (best of {len(runs)})")
+    for name, ms in slowest:
+        print(f"  {ms:9.1f} ms  {name}")
+    if heavy:
+        print(f"Heavy packages imported: {', '.join(heavy)}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "module": args.module,
+                "python": sys.version.split()[0],
+                "runs_ms": [round(run[0], 1) for run in runs],
+                "best_ms": round(total_ms, 1),
+                "slowest": {name: round(ms, 1) for name, ms in slowest},
+                "heavy_packages": heavy,
+            }, f, indent=2)
+        print(f"Import times saved to '{args.output}'")
+
+    over_budget = args.max_ms is not None and total_ms > args.max_ms
+    if over_budget:
+        print(f"Over the budget of {args.max_ms:.0f} ms", file=sys.stderr)
+    return 1 if over_budget or (args.max_ms is not None and heavy) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
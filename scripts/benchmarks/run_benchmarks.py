@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+
+"""
+run_benchmarks.py
+
+Times the DCOPF core on synthetic cases of increasing size and writes the
+results as JSON, so that runs of different versions can be compared.
+
+Every case is timed in four phases:
+    prepare  - pivot the input frames into arrays (prepare_dcopf_data)
+    build    - assemble the sparse LP (build_dcopf_lp)
+    solve    - solve it (with lazy flow limits if requested)
+    extract  - unpack the solution and build the result frames
+The timings come from an untraced run. A second pass under tracemalloc then
+records the peak Python-heap memory (numpy/scipy buffers included) of
+prepare, build and extract; memory held inside the solver only shows in the
+peak resident set size of the process, which is reported as well.
+
+Examples:
+    python run_benchmarks.py                         # default suite
+    python run_benchmarks.py --cases small medium --formulation ptdf --lazy
+    python run_benchmarks.py --buses 500 --hours 8760 --storage 100 -o big.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+# Add the scripts directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import scipy
+
+from benchmarks.synthetic import synthetic_case
+from core.lazy_limits import solve_with_lazy_flow_limits
+from core.lp_builder import build_dcopf_lp
+from core.model_data import prepare_dcopf_data
+from core.ptdf import _PTDF_CACHE, recover_flows_and_angles
+from core.results import build_result_frames
+from core.solvers import resolve_solver_options, solve_lp
+
+# name -> (buses, hours, storage units)
+SUITE = {
+    "small": (10, 168, 0),
+    "medium": (100, 168, 10),
+    "week_large": (500, 168, 50),
+    "year_small": (30, 8760, 5),
+    "year_medium": (100, 8760, 20),
+}
+DEFAULT_CASES = ["small", "medium"]
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+class _Phase:
+    """Wall time, CPU time and, while tracemalloc runs, peak traced memory of one block"""
+
+    def __enter__(self):
+        self._traced = tracemalloc.is_tracing()
+        if self._traced:
+            tracemalloc.reset_peak()
+            self._base = tracemalloc.get_traced_memory()[0]
+        self._wall, self._cpu = time.perf_counter(), time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        self.wall = time.perf_counter() - self._wall
+        self.cpu = time.process_time() - self._cpu
+        self.peak_mb = None
+        if self._traced:
+            self.peak_mb = (tracemalloc.get_traced_memory()[1] - self._base) / 1024 ** 2
+        return False
+
+
+def _extract(lp, data, lp_solution, formulation):
+    if not lp_solution.optimal:
+        return None
+    solution = lp.unpack(lp_solution.x)
+    solution['cost'], solution['status'] = lp_solution.objective, lp_solution.status
+    if formulation == "ptdf":
+        recover_flows_and_angles(data, solution)
+    return build_result_frames(data, solution)
+
+
+def _traced_memory(case, formulation, lazy_flow_limits, lp_solution, report):
+    """
+    Peak traced memory of prepare, build and extract, from a second pass
+    under tracemalloc. Tracing slows allocation-heavy code several times, so
+    it never runs during the timed pass, and the solve is not repeated: the
+    solver's own memory is invisible to tracemalloc anyway.
+    """
+    _PTDF_CACHE.clear()
+    phases = {}
+    tracemalloc.start()
+    try:
+        with _Phase() as phases["prepare"]:
+            data = prepare_dcopf_data(case.gen_time_series, case.branch, case.bus, case.demand_time_series)
+        with _Phase() as phases["build"]:
+            lp = build_dcopf_lp(data, formulation, flow_limits=report.limits if lazy_flow_limits else None)
+        with _Phase() as phases["extract"]:
+            _extract(lp, data, lp_solution, formulation)
+    finally:
+        tracemalloc.stop()
+    return {phase: round(p.peak_mb, 2) for phase, p in phases.items()}
+
+
+def run_case(name, n_buses, n_hours, n_storage, formulation="angle", solver=None,
+             lazy_flow_limits=False, seed=0, trace_memory=True):
+    """Benchmark one synthetic case; returns a JSON-ready dict"""
+    case = synthetic_case(n_buses=n_buses, n_hours=n_hours, n_storage=n_storage, seed=seed)
+    options = resolve_solver_options(solver)
+    _PTDF_CACHE.clear()  # PTDF computation belongs to the build phase of every case
+
+    phases = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        with _Phase() as phases["prepare"]:
+            data = prepare_dcopf_data(case.gen_time_series, case.branch, case.bus, case.demand_time_series)
+
+        with _Phase() as phases["build"]:
+            lp = build_dcopf_lp(data, formulation, flow_limits=np.array([], dtype=int) if lazy_flow_limits else None)
+
+        with _Phase() as phases["solve"]:
+            if lazy_flow_limits:
+                lp_solution, report = solve_with_lazy_flow_limits(lp, options)
+            else:
+                lp_solution, report = solve_lp(lp, options), None
+
+        with _Phase() as phases["extract"]:
+            results = _extract(lp, data, lp_solution, formulation)
+
+        max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        peak_memory_mb = None
+        if trace_memory:
+            peak_memory_mb = _traced_memory(case, formulation, lazy_flow_limits, lp_solution, report)
+
+    result = {
+        "case": name,
+        "n_buses": case.n_buses,
+        "n_branches": case.n_branches,
+        "n_hours": n_hours,
+        "n_gens": case.n_gens,
+        "n_storage": n_storage,
+        "formulation": formulation,
+        "solver": lp_solution.backend,
+        "lazy_flow_limits": lazy_flow_limits,
+        "lp_rows": lp.n_rows,
+        "lp_cols": lp.n_cols,
+        "lp_nnz": lp.nnz,
+        "status": lp_solution.status,
+        "cost": results["cost"] if results else None,
+        "time_s": {phase: round(p.wall, 4) for phase, p in phases.items()},
+        "cpu_s": {phase: round(p.cpu, 4) for phase, p in phases.items()},
+        "peak_memory_mb": peak_memory_mb,
+        "max_rss_mb": round(max_rss_mb, 1),
+    }
+    result["time_s"]["total"] = round(sum(p.wall for p in phases.values()), 4)
+    if report is not None:
+        result["flow_limits"] = report.to_dict()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the DCOPF core on synthetic grids")
+    parser.add_argument("--cases", nargs="+", choices=sorted(SUITE), help="named cases of the suite")
+    parser.add_argument("--buses", type=int, help="custom case: number of buses")
+    parser.add_argument("--hours", type=int, default=168, help="custom case: number of hours")
+    parser.add_argument("--storage", type=int, default=0, help="custom case: number of storage units")
+    parser.add_argument("--formulation", default="angle", choices=["angle", "ptdf"])
+    parser.add_argument("--solver", default=None, help="solver backend, e.g. highs, highspy, cbc")
+    parser.add_argument("--lazy", action="store_true", help="use lazy flow limits")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the extra tracemalloc pass that measures per-phase memory")
+    parser.add_argument("-o", "--output", help="JSON file to write (default: stdout)")
+    args = parser.parse_args(argv)
+
+    if args.buses:
+        cases = {f"custom_{args.buses}b_{args.hours}h_{args.storage}s": (args.buses, args.hours, args.storage)}
+    else:
+        cases = {name: SUITE[name] for name in (args.cases or DEFAULT_CASES)}
+
+    trace_memory = not args.no_memory
+    results = []
+    for name, (n_buses, n_hours, n_storage) in cases.items():
+        print(f"Running {name}: {n_buses} buses, {n_hours} hours, {n_storage} storage units...", file=sys.stderr)
+        result = run_case(name, n_buses, n_hours, n_storage, args.formulation, args.solver,
+                          args.lazy, args.seed, trace_memory)
+        print(f"  {result['status']} in {result['time_s']['total']} s "
+              f"({result['lp_rows']} rows, {result['lp_cols']} columns)", file=sys.stderr)
+        results.append(result)
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scipy": scipy.__version__,
+        "cases": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+        print(f"Benchmark results saved to '{args.output}'", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
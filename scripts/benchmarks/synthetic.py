@@ -0,0 +1,161 @@
+"""
+Synthetic DCOPF inputs of configurable size, in the same frames dcopf() takes.
+
+The grid is a random spanning tree plus extra random lines, so it is always
+connected and meshed. Every load bus also hosts an expensive peaker, which
+keeps the problem feasible whatever the line ratings while cheaper remote
+generation still congests the network.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# type -> (gencost, pmax range in MW); wind and solar pmax follow their profiles
+FLEET = {
+    "nuclear": (5.0, (200.0, 800.0)),
+    "gas": (8.0, (50.0, 250.0)),
+    "wind": (0.0, (20.0, 150.0)),
+    "solar": (0.0, (20.0, 150.0)),
+}
+PEAKER_COST = 50.0
+
+BUS_COLUMNS = ["bus_i", "type", "Pd", "Qd", "Gs", "Bs", "area", "Vm", "Va", "baseKV", "zone", "Vmax", "Vmin"]
+GEN_COLUMNS = ["time", "id", "type", "pmax", "pmin", "gencost", "emax", "einitial", "eta", "season", "bus"]
+
+
+@dataclass
+class SyntheticCase:
+    """One benchmark instance"""
+    bus: pd.DataFrame
+    branch: pd.DataFrame
+    gen_time_series: pd.DataFrame
+    demand_time_series: pd.DataFrame
+    n_hours: int
+    n_gens: int
+    n_storage: int
+
+    @property
+    def n_buses(self) -> int:
+        return len(self.bus)
+
+    @property
+    def n_branches(self) -> int:
+        return len(self.branch)
+
+
+def synthetic_grid(n_buses: int, rng: np.random.Generator, extra_lines: float = 0.5, load_share: float = 0.6):
+    """MATPOWER-style bus and branch tables; branch carries ratea and sus like main.py prepares it"""
+    buses = np.arange(1, n_buses + 1)
+    bus_type = np.where(rng.random(n_buses) < load_share, 1, 2)
+    bus_type[min(1, n_buses - 1)] = 1  # at least one load bus
+    bus = pd.DataFrame({
+        "bus_i": buses, "type": bus_type, "Pd": 0, "Qd": 0, "Gs": 0, "Bs": 0, "area": 1,
+        "Vm": 1, "Va": 0, "baseKV": 230, "zone": 1, "Vmax": 1.1, "Vmin": 0.9
+    })[BUS_COLUMNS]
+
+    # Spanning tree, then extra lines between random distinct pairs
+    fbus = [int(rng.integers(1, b)) for b in buses[1:]]
+    tbus = list(buses[1:])
+    n_extra = int(extra_lines * n_buses) if n_buses > 2 else 0
+    for _ in range(n_extra):
+        f, t = rng.choice(buses, size=2, replace=False)
+        fbus.append(int(f))
+        tbus.append(int(t))
+
+    n_branches = len(fbus)
+    x = rng.uniform(0.01, 0.1, n_branches)
+    ratea = rng.uniform(40.0, 200.0, n_branches)
+    branch = pd.DataFrame({
+        "fbus": fbus, "tbus": tbus, "r": x / 10, "x": x, "b": 0.0,
+        "ratea": ratea, "rateb": ratea, "ratec": ratea, "ratio": 0, "angle": 0,
+        "status": 1, "angmin": -360, "angmax": 360
+    })
+    branch["sus"] = 1 / branch["x"]
+    branch["id"] = np.arange(1, n_branches + 1)
+    return bus, branch
+
+
+def synthetic_profiles(times: pd.DatetimeIndex, rng: np.random.Generator):
+    """Hourly load, wind and solar shapes in [0, 1]-ish per unit"""
+    hour = times.hour.to_numpy()
+    day = times.dayofyear.to_numpy()
+    seasonal = 1 + 0.2 * np.cos(2 * np.pi * (day - 15) / 365)
+
+    load = seasonal * (0.7 + 0.3 * np.sin(np.pi * (hour - 6) / 12).clip(0)) * rng.uniform(0.9, 1.1, len(times))
+    solar = np.sin(np.pi * (hour - 6) / 12).clip(0) * (2 - seasonal) * rng.uniform(0.3, 1.0, len(times))
+
+    # Wind as a smoothed random walk
+    wind = np.cumsum(rng.normal(0, 0.15, len(times)))
+    wind = (wind - wind.min()) / (np.ptp(wind) or 1.0)
+    return load / load.max(), wind, solar / (solar.max() or 1.0)
+
+
+def synthetic_case(
+    n_buses: int = 10,
+    n_hours: int = 168,
+    n_gens: Optional[int] = None,
+    n_storage: int = 0,
+    seed: int = 0,
+    start: str = "2023-01-01 00:00:00",
+    peak_load_per_bus: float = 80.0
+) -> SyntheticCase:
+    """
+    A random grid with n_buses, a fleet of n_gens generators (default one per
+    three buses) drawn from FLEET, a peaker per load bus and n_storage
+    batteries, over n_hours hourly steps. The same seed gives the same case.
+    """
+    rng = np.random.default_rng(seed)
+    bus, branch = synthetic_grid(n_buses, rng)
+    times = pd.date_range(start, periods=n_hours, freq="h")
+    load_shape, wind_shape, solar_shape = synthetic_profiles(times, rng)
+
+    load_buses = bus.loc[bus["type"] == 1, "bus_i"].to_numpy()
+    demand_time_series = pd.DataFrame({
+        "time": np.tile(times, len(load_buses)),
+        "bus": np.repeat(load_buses, n_hours),
+        "pd": (np.outer(rng.uniform(0.3, 1.0, len(load_buses)) * peak_load_per_bus, load_shape)).ravel(),
+        "season": "synthetic"
+    })
+
+    # Fleet: (bus, type, pmax per hour, gencost, emax, eta)
+    if n_gens is None:
+        n_gens = max(1, n_buses // 3)
+    fleet = []
+    types = list(FLEET)
+    for bus_id, gen_type in zip(rng.choice(bus["bus_i"], n_gens), rng.choice(types, n_gens)):
+        cost, (low, high) = FLEET[gen_type]
+        pmax = rng.uniform(low, high)
+        shape = {"wind": wind_shape, "solar": solar_shape}.get(gen_type, 1.0)
+        fleet.append((bus_id, gen_type, pmax * shape * np.ones(n_hours), cost, 0.0, 1.0))
+    for bus_id in load_buses:
+        fleet.append((bus_id, "peaker", np.full(n_hours, 2 * peak_load_per_bus), PEAKER_COST, 0.0, 1.0))
+    for bus_id in rng.choice(bus["bus_i"], n_storage):
+        pmax = rng.uniform(10.0, 60.0)
+        fleet.append((bus_id, "battery", np.full(n_hours, pmax), 0.0, 2 * pmax, 0.95))
+
+    n = len(fleet)
+    gen_time_series = pd.DataFrame({
+        "time": np.tile(times, n),
+        "id": np.repeat(np.arange(1, n + 1), n_hours),
+        "type": np.repeat([f[1] for f in fleet], n_hours),
+        "pmax": np.concatenate([f[2] for f in fleet]),
+        "pmin": np.repeat([-f[2][0] if f[4] > 0 else 0.0 for f in fleet], n_hours),
+        "gencost": np.repeat([f[3] for f in fleet], n_hours),
+        "emax": np.repeat([f[4] for f in fleet], n_hours),
+        "einitial": 0.0,
+        "eta": np.repeat([f[5] for f in fleet], n_hours),
+        "season": "synthetic",
+        "bus": np.repeat([f[0] for f in fleet], n_hours),
+    })[GEN_COLUMNS]
+
+    return SyntheticCase(
+        bus=bus,
+        branch=branch,
+        gen_time_series=gen_time_series,
+        demand_time_series=demand_time_series,
+        n_hours=n_hours,
+        n_gens=n - n_storage,
+        n_storage=n_storage
+    )
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+
+"""
+cli.py
+
+Non-interactive entry point of the scenario pipeline, for batch and
+scheduler runs. Every stage of main.py is a subcommand that saves its
+results to the results directory, so stages can also run separately
+against stored results:
+
+    solve   - solve the scenarios and load variants, write scenario_results.csv
+              and the storage dispatch (plus any --outputs frames) per scenario
+    invest  - investment analysis of scenario_results.csv, written to
+              scenario_results_with_investment.csv; --variants or --load-grid
+              variants missing from it are solved first, with the settings of
+              the stored solve (solve_config.json), and added to it
+    plot    - storage and annual summary plots from the stored results
+    report  - LLM scenario and global comparison reports, README links
+    all     - solve, invest, plot and report in one run
+
+Settings come from the defaults in main.py, then a TOML (or JSON) file
+given with --config, then the command-line flags. In the file, top-level
+keys apply to every stage and a table per stage only to that stage
+(invest also reads [solve], for the variants it solves):
+
+    results_dir = "data/results/batch_01"
+    verbosity = "quiet"
+
+    [solve]
+    variants = ["nominal", "high", "low"]   # or {nominal = 1.0, peak = 1.35}
+    load_grid = [0.5, 1.5, 0.05]             # low, high, step: 21 more variants
+    seasons = ["winter", "summer"]
+    solver = "highs"
+    workers = 8
+    outputs = ["flows"]
+
+    [solver_options]                         # any SolverOptions field
+    time_limit = 600
+
+    [report]
+    global_report = false
+
+Examples:
+    python cli.py solve --variants nominal high low --workers 8
+    python cli.py solve --scenarios scenario_1 scenario_2 --seasons winter --solver cbc
+    python cli.py invest
+    python cli.py invest --load-grid 0.5 1.5 0.05 --workers 8
+    python cli.py plot --no-storage
+    python cli.py all --config batch.toml --trace trace.json
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Any, Dict, Iterable, List, Optional
+
+import main as pipeline
+from core.results import RESULT_FRAMES
+from core.solvers import SolverOptions
+from core.tracing import QUIET, INFO, DEBUG, TRACER, set_verbosity
+
+STAGES = ["solve", "invest", "plot", "report"]
+# Settings that must match the stored results for variants solved by invest
+SOLVE_SETTINGS = ["mode", "seasons", "solver", "solver_options", "formulation", "lazy_flow_limits", "outputs"]
+VERBOSITY = {"quiet": QUIET, "info": INFO, "debug": DEBUG}
+
+
+def default_settings() -> Dict[str, Any]:
+    """Settings of a run before the config file and flags, from main.py"""
+    return {
+        # Every stage
+        "results_dir": pipeline.results_root,
+        "verbosity": "info",
+        "trace": pipeline.trace_file,
+        "trace_format": pipeline.trace_format,
+        # solve
+        "scenarios": None,
+        "variants": ["nominal"],
+        "load_grid": None,
+        "mode": pipeline.simulation_mode,
+        "seasons": None,
+        "solver": pipeline.solver_options.backend,
+        "solver_options": {},
+        "formulation": pipeline.dcopf_formulation,
+        "lazy_flow_limits": pipeline.lazy_flow_limits,
+        "workers": pipeline.max_workers,
+        "outputs": [],
+        "persist_cache": pipeline.persist_solve_cache,
+        # plot
+        "storage_plots": True,
+        "summary_plots": True,
+        # report
+        "individual": True,
+        "global_report": True,
+        "readme": True,
+    }
+
+
+def load_config_file(path: str, stages: List[str]) -> Dict[str, Any]:
+    """
+    Settings of a TOML or JSON config file for the given stages: the
+    top-level keys, overridden by the tables of those stages in order
+    """
+    if path.endswith(".json"):
+        with open(path) as f:
+            raw = json.load(f)
+    else:
+        # Only TOML files need a parser beyond the standard library on Python < 3.11
+        try:
+            import tomllib
+        except ModuleNotFoundError:
+            import tomli as tomllib
+        with open(path, "rb") as f:
+            raw = tomllib.load(f)
+
+    settings = {key: value for key, value in raw.items() if key not in STAGES}
+    for stage in stages:
+        settings.update(raw.get(stage, {}))
+    unknown = set(settings) - set(default_settings())
+    if unknown:
+        raise ValueError(f"Unknown setting(s) {sorted(unknown)} in {path}")
+    return settings
+
+
+def parse_variants(variants) -> Dict[str, float]:
+    """
+    Load variants as name -> factor on the scenarios' load_factor, from a
+    mapping or a list of names of main.sensitivity_variants and name=factor
+    """
+    if isinstance(variants, dict):
+        return {str(name): float(factor) for name, factor in variants.items()}
+    parsed = {}
+    for variant in variants:
+        name, _, factor = str(variant).partition("=")
+        if factor:
+            parsed[name] = float(factor)
+        elif name in pipeline.sensitivity_variants:
+            parsed[name] = pipeline.sensitivity_variants[name]
+        else:
+            raise ValueError(
+                f"Unknown variant '{name}': use one of {list(pipeline.sensitivity_variants)} or name=factor"
+            )
+    return parsed
+
+
+def requested_variants(settings: Dict[str, Any]) -> Dict[str, float]:
+    """The variants and load_grid settings as name -> factor"""
+    variants = parse_variants(settings["variants"])
+    if settings["load_grid"] is not None:
+        variants.update(pipeline.load_factor_grid(*map(float, settings["load_grid"])))
+    return variants
+
+
+def run_config(settings: Dict[str, Any]) -> pipeline.RunConfig:
+    """The RunConfig of the solve stage (and of variants solved by invest) from resolved settings"""
+    return pipeline.RunConfig(
+        simulation_mode=settings["mode"],
+        seasons=settings["seasons"],
+        scenarios=settings["scenarios"],
+        variants=requested_variants(settings),
+        solver_options=SolverOptions(**{**settings["solver_options"], "backend": settings["solver"]}),
+        formulation=settings["formulation"],
+        lazy_flow_limits=settings["lazy_flow_limits"],
+        save_frames=tuple(settings["outputs"]),
+        persist_solve_cache=settings["persist_cache"],
+        max_workers=max(int(settings["workers"]), 1),
+        results_root=settings["results_dir"],
+    )
+
+
+def stored_solve_settings(
+    settings: Dict[str, Any],
+    solve_settings: Dict[str, Any],
+    explicit: Iterable[str] = ()
+) -> Dict[str, Any]:
+    """
+    The SOLVE_SETTINGS of stored results (RunConfig.solve_settings()) as
+    settings; a ValueError names the explicit settings that differ from them
+    """
+    options = dict(solve_settings["solver_options"])
+    stored = {
+        "mode": solve_settings["simulation_mode"],
+        "seasons": solve_settings["seasons"],
+        "solver": options.pop("backend"),
+        "solver_options": options,
+        "formulation": solve_settings["formulation"],
+        "lazy_flow_limits": solve_settings["lazy_flow_limits"],
+        # Results saved before the outputs were stored
+        "outputs": solve_settings.get("save_frames", settings["outputs"]),
+    }
+    conflicts = []
+    for key in SOLVE_SETTINGS:
+        if key not in explicit:
+            continue
+        if key == "solver_options":
+            conflicts += [f"{key}.{name}" for name, value in settings[key].items() if options.get(name) != value]
+        elif (list(settings[key]) if isinstance(settings[key], tuple) else settings[key]) != stored[key]:
+            conflicts.append(key)
+    if conflicts:
+        solved_with = ", ".join(f"{key}={stored[key]!r}" for key in SOLVE_SETTINGS)
+        raise ValueError(
+            f"Setting(s) {conflicts} differ from those of the stored results ({solved_with}); "
+            f"solve again with them or leave them out"
+        )
+    return stored
+
+
+def run(stages: List[str], settings: Dict[str, Any], explicit: Iterable[str] = ()) -> None:
+    """
+    Run the given stages in pipeline order. Stages of one run hand their
+    results over in memory; each also saves them to the results directory,
+    from which a stage run on its own reads its input. explicit names the
+    settings given by the config file or flags rather than the defaults.
+    """
+    set_verbosity(VERBOSITY[settings["verbosity"]])
+    TRACER.enabled = settings["trace"] is not None
+    results_dir = settings["results_dir"]
+    solved, final_results, scenarios_df, data_context = None, None, None, None
+
+    if "solve" in stages:
+        config = run_config(settings)
+        data_context = pipeline.load_data_context(config)
+        scenarios_df = data_context['scenarios_df']
+        solved = pipeline.solve_scenarios(data_context, config)
+        solved.save(results_dir)
+    if "invest" in stages:
+        solved = solved or pipeline.SolveResults.load(results_dir)
+        if solved.solve_settings is not None:
+            # Missing variants are solved like the stored ones, so that their costs compare
+            settings = {**settings, **stored_solve_settings(settings, solved.solve_settings, explicit)}
+        config = run_config(settings)
+        # Loads the data only if a requested variant was not solved yet
+        solver = pipeline.VariantSolver(config, data_context, scenarios_df)
+        final_results = pipeline.invest_scenarios(solved, scenarios_df, config.variants, solver, data_context)
+        if solver.variants:
+            solved.save(results_dir)
+        pipeline.save_investment_results(final_results, results_dir)
+    if "plot" in stages:
+        if settings["storage_plots"]:
+            solved = solved or pipeline.SolveResults.load(results_dir)
+            pipeline.plot_storage(solved.storage, results_dir)
+        if settings["summary_plots"]:
+            if final_results is None:
+                final_results = pipeline.load_investment_results(results_dir)
+            pipeline.plot_summaries(final_results, results_dir)
+    if "report" in stages:
+        if final_results is None and (settings["individual"] or settings["global_report"]):
+            final_results = pipeline.load_investment_results(results_dir)
+        pipeline.report_scenarios(final_results, results_dir, settings["individual"], settings["global_report"])
+        if settings["readme"]:
+            pipeline.refresh_readme()
+
+    pipeline.write_trace(settings["trace"], settings["trace_format"])
+
+
+def _add_common(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--config", help="TOML or JSON file with the run settings")
+    parser.add_argument("--results-dir", dest="results_dir", help="directory the stages read and write")
+    parser.add_argument("--verbosity", choices=sorted(VERBOSITY))
+    parser.add_argument("--trace", help="write timed spans of every phase to this file")
+    parser.add_argument("--trace-format", dest="trace_format", choices=["json", "chrome"])
+
+
+def _add_solve(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_argument_group("solve")
+    group.add_argument("--scenarios", nargs="+", help="scenario names to solve (default: all)")
+    group.add_argument("--mode", choices=["representative", "full_year", "clustered"], help="simulation mode")
+    group.add_argument("--seasons", nargs="+", help="subset of the mode's seasons (annual totals cover only these)")
+    group.add_argument("--solver", help="LP backend, e.g. highs, highspy, cbc")
+    group.add_argument("--formulation", choices=["angle", "ptdf"])
+    group.add_argument("--lazy-flow-limits", dest="lazy_flow_limits", action=argparse.BooleanOptionalAction)
+    group.add_argument("--outputs", nargs="+", choices=RESULT_FRAMES,
+                       help="result frames to write per variant and season to <scenario>/frames")
+    group.add_argument("--persist-cache", dest="persist_cache", action=argparse.BooleanOptionalAction,
+                       help="keep season results on disk between runs")
+
+
+def _add_variants(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_argument_group("load variants")
+    group.add_argument("--variants", nargs="+",
+                       help=f"load variants: {', '.join(pipeline.sensitivity_variants)} or name=factor")
+    group.add_argument("--load-grid", dest="load_grid", nargs=3, type=float, metavar=("LOW", "HIGH", "STEP"),
+                       help="also every load factor from LOW to HIGH in STEP increments")
+    group.add_argument("--workers", type=int, help="worker processes for the season solves")
+
+
+def _add_plot(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_argument_group("plot")
+    group.add_argument("--storage", dest="storage_plots", action=argparse.BooleanOptionalAction,
+                       help="storage state-of-charge plots")
+    group.add_argument("--summary", dest="summary_plots", action=argparse.BooleanOptionalAction,
+                       help="annual summary plots")
+
+
+def _add_report(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_argument_group("report")
+    group.add_argument("--individual", action=argparse.BooleanOptionalAction, help="one report per scenario")
+    group.add_argument("--global", dest="global_report", action=argparse.BooleanOptionalAction,
+                       help="global comparison report")
+    group.add_argument("--readme", action=argparse.BooleanOptionalAction, help="update the README links")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run stages of the scenario pipeline without prompts")
+    commands = parser.add_subparsers(dest="command", required=True)
+    options = {
+        "solve": [_add_variants, _add_solve],
+        "invest": [_add_variants],
+        "plot": [_add_plot],
+        "report": [_add_report],
+        "all": [_add_variants, _add_solve, _add_plot, _add_report],
+    }
+    for command, adders in options.items():
+        # Flags not given stay out of the namespace, so they do not override the config file
+        sub = commands.add_parser(command, argument_default=argparse.SUPPRESS)
+        _add_common(sub)
+        for add in adders:
+            add(sub)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = vars(build_parser().parse_args(argv))
+    command = args.pop("command")
+    stages = STAGES if command == "all" else [command]
+
+    settings = default_settings()
+    explicit = set(args)
+    config_file = args.pop("config", None)
+    if config_file is not None:
+        file_settings = load_config_file(config_file, ["solve", *stages] if stages == ["invest"] else stages)
+        settings.update(file_settings)
+        explicit |= set(file_settings)
+    settings.update(args)
+    settings["results_dir"] = os.path.abspath(settings["results_dir"])
+
+    run(stages, settings, explicit)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,77 @@
-from .time_series import build_gen_time_series, build_demand_time_series
+from .time_series import build_unit_table, build_season_profiles, build_gen_time_series, build_demand_time_series
 from .helpers import ask_user_confirmation
+from .model_data import DCOPFData, prepare_dcopf_data
+from .lp_builder import LPMatrices, build_dcopf_lp
+from .ptdf import PTDF, get_ptdf
+from .solvers import SolverOptions, LPSolution, available_backends, get_backend, solve_lp
+from .lazy_limits import LazyLimitReport, solve_with_lazy_flow_limits
+from .results import RESULT_FRAMES, PRIMAL_FRAMES, DUAL_FRAMES, build_result_frames
+from .duals import DCOPFDuals, extract_duals
+from .dcopf_model import DCOPFModel
+from .solve_cache import SolveCache, fingerprint
+from .rolling_horizon import RollingHorizonReport, solve_rolling_horizon
+from .clustering import RepresentativePeriods, select_representative_periods, reconstruction_error
+from .gen_store import GenStore, load_gen_store, write_gen_store
+from .metrics import TypeMetrics, type_metrics, dcopf_type_metrics, weighted_sum
+from .finance import TechnologyCosts, FinancialResults, capacity_matrix, evaluate
+from .risk import Distribution, Uncertainty, RiskResults, monte_carlo
+from .raw_data import load_raw_profiles, read_raw_profiles, period_values
+from .tracing import TRACER, log, set_verbosity, span, traced
 
 __all__ = [
+    'build_unit_table',
+    'build_season_profiles',
     'build_gen_time_series',
     'build_demand_time_series',
-    'ask_user_confirmation'
-] 
\ No newline at end of file
+    'ask_user_confirmation',
+    'DCOPFData',
+    'prepare_dcopf_data',
+    'LPMatrices',
+    'build_dcopf_lp',
+    'SolverOptions',
+    'LPSolution',
+    'available_backends',
+    'get_backend',
+    'solve_lp',
+    'PTDF',
+    'get_ptdf',
+    'LazyLimitReport',
+    'solve_with_lazy_flow_limits',
+    'RESULT_FRAMES',
+    'PRIMAL_FRAMES',
+    'DUAL_FRAMES',
+    'DCOPFDuals',
+    'extract_duals',
+    'build_result_frames',
+    'DCOPFModel',
+    'SolveCache',
+    'fingerprint',
+    'RollingHorizonReport',
+    'solve_rolling_horizon',
+    'RepresentativePeriods',
+    'select_representative_periods',
+    'reconstruction_error',
+    'GenStore',
+    'load_gen_store',
+    'write_gen_store',
+    'TypeMetrics',
+    'type_metrics',
+    'dcopf_type_metrics',
+    'weighted_sum',
+    'TechnologyCosts',
+    'FinancialResults',
+    'capacity_matrix',
+    'evaluate',
+    'Distribution',
+    'Uncertainty',
+    'RiskResults',
+    'monte_carlo',
+    'read_raw_profiles',
+    'load_raw_profiles',
+    'period_values',
+    'TRACER',
+    'log',
+    'set_verbosity',
+    'span',
+    'traced'
+] 
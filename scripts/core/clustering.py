@@ -0,0 +1,151 @@
+"""Selection of representative periods by clustering hourly profiles"""
+from dataclasses import dataclass
+from typing import Dict
+
+import numpy as np
+
+METHODS = ("kmedoids", "hierarchical")
+
+
+@dataclass
+class RepresentativePeriods:
+    """
+    K periods standing in for all periods of a year. labels[p] is the
+    cluster of period p, medoids[k] the period chosen for cluster k, and
+    weights[k] the number of periods it represents.
+    """
+    period_hours: int
+    labels: np.ndarray    # (P,)
+    medoids: np.ndarray   # (K,) period indices, in chronological order
+    weights: np.ndarray   # (K,)
+
+    @property
+    def n_periods(self) -> int:
+        return len(self.labels)
+
+    @property
+    def k(self) -> int:
+        return len(self.medoids)
+
+
+def period_matrix(profile: np.ndarray, period_hours: int) -> np.ndarray:
+    """Cut an hourly profile into whole periods, (P x period_hours); trailing hours are dropped"""
+    n_periods = len(profile) // period_hours
+    return np.asarray(profile[:n_periods * period_hours], dtype=float).reshape(n_periods, period_hours)
+
+
+def period_features(profiles: Dict[str, np.ndarray], period_hours: int) -> np.ndarray:
+    """
+    One row per period with the hourly values of every profile side by side.
+    Each profile is scaled by its peak so that load, wind and solar weigh
+    the same in the distances whatever their units.
+    """
+    blocks = []
+    for profile in profiles.values():
+        periods = period_matrix(profile, period_hours)
+        peak = np.abs(periods).max()
+        blocks.append(periods / peak if peak > 0 else periods)
+    return np.hstack(blocks)
+
+
+def _medoid(X: np.ndarray, members: np.ndarray) -> int:
+    """Member with the smallest total distance to the others"""
+    D = np.linalg.norm(X[members, None, :] - X[None, members, :], axis=2)
+    return int(members[D.sum(axis=1).argmin()])
+
+
+def kmedoids(X: np.ndarray, k: int, seed: int = 0, max_iter: int = 100) -> np.ndarray:
+    """
+    Alternating k-medoids: assign every period to its nearest medoid, then
+    move each medoid to the member minimising the in-cluster distance, until
+    the medoids stop changing. Starts from a k-means++ style seeding.
+    Returns the labels.
+    """
+    rng = np.random.default_rng(seed)
+    D = np.linalg.norm(X[:, None, :] - X[None, :, :], axis=2)
+
+    medoids = [int(rng.integers(len(X)))]
+    while len(medoids) < k:
+        nearest = D[:, medoids].min(axis=1) ** 2
+        medoids.append(int(rng.choice(len(X), p=nearest / nearest.sum())))
+    medoids = np.array(medoids)
+
+    for _ in range(max_iter):
+        labels = D[:, medoids].argmin(axis=1)
+        new = np.array([
+            _medoid(X, np.flatnonzero(labels == c)) if (labels == c).any() else medoids[c]
+            for c in range(k)
+        ])
+        if np.array_equal(new, medoids):
+            break
+        medoids = new
+    return D[:, medoids].argmin(axis=1)
+
+
+def hierarchical(X: np.ndarray, k: int) -> np.ndarray:
+    """Ward agglomerative clustering cut at k clusters; returns the labels"""
+    from scipy.cluster.hierarchy import fcluster, linkage
+    return fcluster(linkage(X, method='ward'), t=k, criterion='maxclust') - 1
+
+
+def select_representative_periods(
+    profiles: Dict[str, np.ndarray],
+    k: int,
+    period_hours: int = 168,
+    method: str = "kmedoids",
+    seed: int = 0
+) -> RepresentativePeriods:
+    """
+    Cluster the periods of the given hourly profiles into k groups and pick
+    one real period (the medoid) per group, weighted by the group size.
+    Medoids are actual periods, so their hour-to-hour chronology, which the
+    storage model depends on, is preserved.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown clustering method '{method}', expected one of {METHODS}")
+    X = period_features(profiles, period_hours)
+    if not 1 <= k <= len(X):
+        raise ValueError(f"k must be between 1 and the number of periods ({len(X)})")
+
+    labels = kmedoids(X, k, seed) if method == "kmedoids" else hierarchical(X, k)
+
+    # Relabel clusters in chronological order of their medoids; drop empty ones
+    clusters = np.unique(labels)
+    medoids = np.array([_medoid(X, np.flatnonzero(labels == c)) for c in clusters])
+    order = np.argsort(medoids)
+    relabel = np.empty(clusters.max() + 1, dtype=int)
+    relabel[clusters[order]] = np.arange(len(clusters))
+    labels = relabel[labels]
+
+    return RepresentativePeriods(
+        period_hours=period_hours,
+        labels=labels,
+        medoids=medoids[order],
+        weights=np.bincount(labels, minlength=len(clusters))
+    )
+
+
+def reconstruct(profile: np.ndarray, periods: RepresentativePeriods) -> np.ndarray:
+    """The profile as the representative periods see it: every period replaced by its medoid"""
+    P = period_matrix(profile, periods.period_hours)
+    return P[periods.medoids[periods.labels]].ravel()
+
+
+def reconstruction_error(profiles: Dict[str, np.ndarray], periods: RepresentativePeriods) -> Dict[str, Dict[str, float]]:
+    """
+    Per profile, how far the representative periods are from the full year:
+      - nrmse:          hourly RMSE over the profile's mean
+      - energy_error:   relative error of the weighted total
+      - duration_nrmse: RMSE of the sorted (duration curve) values over the mean
+    """
+    errors = {}
+    for name, profile in profiles.items():
+        actual = period_matrix(profile, periods.period_hours).ravel()
+        approx = reconstruct(profile, periods)
+        mean = np.abs(actual).mean() or 1.0
+        errors[name] = {
+            'nrmse': float(np.sqrt(np.mean((approx - actual) ** 2)) / mean),
+            'energy_error': float((approx.sum() - actual.sum()) / (np.abs(actual.sum()) or 1.0)),
+            'duration_nrmse': float(np.sqrt(np.mean((np.sort(approx) - np.sort(actual)) ** 2)) / mean),
+        }
+    return errors
@@ -0,0 +1,204 @@
+"""Stateful DCOPF model: built once, updated in place and re-solved"""
+from dataclasses import replace
+from typing import Any, Dict, Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .duals import extract_duals
+from .lazy_limits import solve_with_lazy_flow_limits
+from .lp_builder import build_dcopf_lp
+from .model_data import DCOPFData, demand_array, prepare_dcopf_data
+from .ptdf import get_ptdf, recover_flows_and_angles
+from .results import DUAL_FRAMES, build_result_frames, resolve_outputs
+from .solvers import SolverOptions, get_backend, resolve_solver_options
+from .tracing import INFO, log, lp_stats, span
+
+
+class DCOPFModel:
+    """
+    The dcopf formulation for one asset set and horizon, kept alive between
+    solves. Demand, generator bounds, generation costs and storage initial
+    SoC can be changed in place; only the affected entries of the LP are
+    rewritten, and backends that support it re-solve from the previous
+    basis. A sensitivity sweep is then one build plus N cheap re-solves.
+    """
+
+    def __init__(
+        self,
+        data: DCOPFData,
+        formulation: str = "angle",
+        solver: Union[SolverOptions, str, None] = None,
+        lazy_flow_limits: bool = False
+    ):
+        self.data = data
+        self.bus = None
+        self.formulation = formulation
+        self.options = resolve_solver_options(solver)
+        self.backend = get_backend(self.options.backend)
+        self.lazy_flow_limits = lazy_flow_limits
+        with span("lp_build", formulation=formulation) as s:
+            self.lp = build_dcopf_lp(
+                data, formulation,
+                flow_limits=np.array([], dtype=int) if lazy_flow_limits else None
+            )
+            s.set(**lp_stats(self.lp))
+        self.n_solves = 0
+        self._session = None
+        self._limits = None
+
+    @classmethod
+    def from_frames(
+        cls,
+        gen_time_series: pd.DataFrame,
+        branch: pd.DataFrame,
+        bus: pd.DataFrame,
+        demand_time_series: pd.DataFrame,
+        delta_t: float = 1,
+        units: Optional[pd.DataFrame] = None,
+        **kwargs
+    ) -> Optional["DCOPFModel"]:
+        """Build from the same frames dcopf() takes; None if the inputs are incomplete"""
+        with span("prepare_data"):
+            data = prepare_dcopf_data(gen_time_series, branch, bus, demand_time_series, delta_t, units=units)
+        if data is None:
+            return None
+        model = cls(data, **kwargs)
+        model.bus = bus
+        return model
+
+    #######################
+    # In-place updates
+    #######################
+    def set_demand(self, demand: Union[np.ndarray, pd.DataFrame]) -> None:
+        """New (bus x hour) demand, given as an array or as a demand time series frame"""
+        if isinstance(demand, pd.DataFrame):
+            if self.bus is None:
+                raise ValueError("Demand frames need the bus table; build the model with from_frames()")
+            demand = demand_array(self.bus, demand, self.data.times)
+        demand = np.asarray(demand, dtype=float)
+        self.data = replace(self.data, demand=demand)
+
+        lp = self.lp
+        if self.formulation == "angle":
+            lp.b_eq[lp.eq_rows['balance'].slice] = demand.ravel()
+        else:
+            # System balance RHS, and the demand part of PTDF flows moves into b_ub
+            lp.b_eq[lp.eq_rows['balance'].slice] = demand.sum(axis=0)
+            lp.flow_offset[:] = (get_ptdf(self.data).matrix @ demand).ravel()
+            self._refresh_flow_limit_rhs()
+
+    def scale_demand(self, factor: float) -> None:
+        """Scale the current demand, e.g. for a load-factor variant"""
+        self.set_demand(self.data.demand * factor)
+
+    def set_gen_bounds(self, pmin: Optional[np.ndarray] = None, pmax: Optional[np.ndarray] = None) -> None:
+        """New (gen x hour) pmin and/or pmax profiles"""
+        gen = self.lp.columns['gen']
+        if pmin is not None:
+            pmin = np.broadcast_to(np.asarray(pmin, dtype=float), gen.shape)
+            self.data = replace(self.data, gen_pmin=pmin)
+            self.lp.bounds[gen.slice, 0] = pmin.ravel()
+        if pmax is not None:
+            pmax = np.broadcast_to(np.asarray(pmax, dtype=float), gen.shape)
+            self.data = replace(self.data, gen_pmax=pmax)
+            self.lp.bounds[gen.slice, 1] = pmax.ravel()
+
+    def set_gencost(self, gencost: np.ndarray) -> None:
+        """New (gen x hour) generation costs; a (gen,) vector applies to every hour"""
+        gen = self.lp.columns['gen']
+        gencost = np.asarray(gencost, dtype=float)
+        if gencost.ndim == 1:
+            gencost = gencost[:, None]
+        gencost = np.broadcast_to(gencost, gen.shape)
+        self.data = replace(self.data, gen_cost=gencost)
+        self.lp.c[gen.slice] = gencost.ravel()
+
+    def set_einitial(self, einitial: np.ndarray) -> None:
+        """New initial state of charge per storage unit; also the final one unless set_efinal() was used"""
+        einitial = np.asarray(einitial, dtype=float)
+        self.data = replace(self.data, storage_einitial=einitial)
+        self.lp.b_eq[self.lp.eq_rows['initial_soc'].slice] = einitial
+        self.lp.b_eq[self.lp.eq_rows['final_soc'].slice] = self.data.final_soc
+
+    def set_efinal(self, efinal: Optional[np.ndarray]) -> None:
+        """New final state of charge per storage unit; None ties it to einitial again"""
+        if efinal is not None:
+            efinal = np.asarray(efinal, dtype=float)
+        self.data = replace(self.data, storage_efinal=efinal)
+        self.lp.b_eq[self.lp.eq_rows['final_soc'].slice] = self.data.final_soc
+
+    def _refresh_flow_limit_rhs(self) -> None:
+        lp = self.lp
+        pairs = lp.flow_limit_pairs
+        lp.b_ub = np.concatenate([
+            lp.flow_rate[pairs] + lp.flow_offset[pairs],
+            lp.flow_rate[pairs] - lp.flow_offset[pairs]
+        ])
+
+    #######################
+    # Solving
+    #######################
+    def solve_lp(self):
+        """Solve the current LP and return the raw LPSolution (plus lazy-limit report)"""
+        self.n_solves += 1
+        with span("solve", backend=self.options.backend) as s:
+            solution, report = self._solve_lp()
+            s.set(status=solution.status, **lp_stats(self.lp))
+            if report is not None:
+                s.set(lazy_iterations=report.iterations, lazy_rows_added=report.constraints_added)
+        return solution, report
+
+    def _solve_lp(self):
+        if self.lazy_flow_limits:
+            # Start from the limits that were binding in the previous solve
+            solution, report = solve_with_lazy_flow_limits(self.lp, self.options, initial_limits=self._limits)
+            self._limits = report.limits
+            return solution, report
+
+        if self.backend.supports_warm_start:
+            if self._session is None:
+                self._session = self.backend.open(self.lp, self.options)
+            else:
+                self._session.update(self.lp)
+            return self._session.solve(), None
+
+        return self.backend.solve(self.lp, self.options), None
+
+    def solve(self, outputs: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Solve and return the dcopf result dictionary, or None if not optimal.
+        outputs selects the result frames to build (see results.RESULT_FRAMES),
+        by default the primal ones, e.g. ('generation', 'storage') to skip
+        angles and flows. The dual frames (prices, congestion, ...) come from
+        the same solve and are only built when named.
+        """
+        outputs = resolve_outputs(outputs)
+        lp_solution, lazy_report = self.solve_lp()
+        log(f"[DCOPF] Solver returned status '{lp_solution.status}' ({lp_solution.backend})")
+        if lazy_report is not None:
+            log(f"[DCOPF] Lazy flow limits: {lazy_report.iterations} iterations, "
+                f"{lazy_report.constraints_added} of {lazy_report.total_limits} limit rows added")
+
+        if not lp_solution.optimal:
+            log(f"[DCOPF] Not optimal => returning None.", INFO)
+            return None
+
+        with span("extract"):
+            solution = self.lp.unpack(lp_solution.x)
+            solution['cost'] = lp_solution.objective
+            solution['status'] = lp_solution.status
+            if self.formulation == "ptdf":
+                recover_flows_and_angles(self.data, solution, 'flows' in outputs, 'angles' in outputs)
+            if set(outputs) & set(DUAL_FRAMES):
+                solution['duals'] = extract_duals(
+                    self.data, self.lp, lp_solution,
+                    lazy_report.limits if lazy_report is not None else None
+                )
+                if solution['duals'] is None:
+                    log(f"[DCOPF] The {lp_solution.backend} backend reported no duals", INFO)
+
+            results = build_result_frames(self.data, solution, outputs)
+        if lazy_report is not None:
+            results['flow_limits'] = lazy_report.to_dict()
+        return results
@@ -0,0 +1,88 @@
+"""
+Dual values of a solved DCOPF: nodal prices, line shadow prices and
+congestion rents, storage energy values and first-order cost sensitivities.
+
+The duals come from the same solve as the dispatch. A dual is the change
+of the optimal cost per unit increase of a constraint's right-hand side,
+so the price of bus n in hour t is the cost of serving one more MW there:
+
+    angle: the dual of the bus power balance (bus, hour)
+    ptdf:  lambda_t + sum_l PTDF[l, n] * (mu_upper[l, t] - mu_lower[l, t])
+
+with lambda_t the dual of the system balance and mu the (<= 0) duals of
+the upper and lower flow limits, whose right-hand sides carry -/+ the
+PTDF flows of the demand. Prices are per MW of demand over one interval
+(per MWh with delta_t = 1).
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from .lp_builder import LPMatrices
+from .model_data import DCOPFData
+from .ptdf import get_ptdf
+from .solvers import LPSolution
+
+
+@dataclass
+class DCOPFDuals:
+    """Dual values of one solve, as (item x hour) arrays"""
+    prices: np.ndarray         # (bus x hour) marginal cost of demand
+    shadow_prices: np.ndarray  # (branch x hour) cost saved per MW more line rating, >= 0
+    flows: np.ndarray          # (branch x hour)
+    storage_values: np.ndarray # (storage x hour) value of one more MWh stored at the end of the hour
+
+    def congestion_rents(self) -> np.ndarray:
+        """(branch x hour) shadow price times flow; sums to the merchandising surplus of the lines"""
+        return self.shadow_prices * np.abs(self.flows)
+
+    def load_sensitivity(self, demand: np.ndarray) -> float:
+        """
+        Cost change per unit of relative load scaling: d cost / d s of the
+        demand s * demand at s = 1, e.g. 0.2 times it estimates +20% load
+        """
+        return float((self.prices * demand).sum())
+
+
+def extract_duals(
+    data: DCOPFData,
+    lp: LPMatrices,
+    solution: LPSolution,
+    limit_pairs: Optional[np.ndarray] = None
+) -> Optional[DCOPFDuals]:
+    """
+    Duals of an optimal solution of lp, or None if the backend reported
+    none. limit_pairs are the flat (branch, hour) positions of the flow
+    limit rows that were in the solved LP (default lp.flow_limit_pairs);
+    limits left out of a lazy solve are not binding and get a zero dual.
+    """
+    if solution.eq_duals is None or solution.ub_duals is None:
+        return None
+    if limit_pairs is None:
+        limit_pairs = lp.flow_limit_pairs
+    T, L = data.n_hours, data.n_branches
+
+    # Duals of the -rate <= flow <= rate rows, scattered onto every (branch, hour)
+    n_limits = len(limit_pairs)
+    mu_upper, mu_lower = np.zeros(L * T), np.zeros(L * T)
+    mu_upper[limit_pairs] = solution.ub_duals[:n_limits]
+    mu_lower[limit_pairs] = solution.ub_duals[n_limits:2 * n_limits]
+    mu_upper, mu_lower = mu_upper.reshape(L, T), mu_lower.reshape(L, T)
+
+    balance = solution.eq_duals[lp.eq_rows['balance'].slice].reshape(lp.eq_rows['balance'].shape)
+    if lp.formulation == "angle":
+        prices = balance
+    else:
+        prices = balance + get_ptdf(data).matrix.T @ (mu_upper - mu_lower)
+
+    # The SoC dynamics rows read E[t+1] - E[t] - ... == 0; raising their
+    # right-hand side adds energy to the store at the end of hour t
+    storage_values = -solution.eq_duals[lp.eq_rows['dynamics'].slice].reshape(lp.eq_rows['dynamics'].shape)
+
+    return DCOPFDuals(
+        prices=prices,
+        shadow_prices=-(mu_upper + mu_lower),
+        flows=lp.flows(solution.x).reshape(L, T),
+        storage_values=storage_values
+    )
@@ -0,0 +1,205 @@
+"""
+Array-based investment cash flows: NPV, annuity, IRR and LCOE of many
+scenarios over grids of discount rates and horizons at once.
+
+Every scenario is a row of a (scenario x technology) capacity matrix plus
+its yearly operating cost. Its cash flows follow InvestmentAnalysis:
+CAPEX is paid up front, and each operating year y = 0, 1, ... costs the
+operating cost plus O&M (a share of CAPEX) plus the CAPEX of every
+technology whose lifetime divides y > 0, discounted by (1 + r)^(y + 1).
+"""
+from dataclasses import dataclass
+from typing import Iterable, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class TechnologyCosts:
+    """
+    Investment parameters per technology, as arrays aligned with
+    `technologies`. lifetime 0 means the technology is never replaced.
+    """
+    technologies: np.ndarray
+    capex: np.ndarray          # per MW
+    opex_percent: np.ndarray   # yearly O&M as a share of CAPEX
+    lifetime: np.ndarray       # years
+
+    @classmethod
+    def from_dicts(
+        cls,
+        capex: Mapping[str, float],
+        opex_percent: Mapping[str, float],
+        lifetime: Mapping[str, int]
+    ) -> "TechnologyCosts":
+        """From the per-technology dicts of InvestmentAnalysis; CAPEX defines the technologies"""
+        technologies = list(capex)
+        return cls(
+            technologies=np.array(technologies, dtype=str),
+            capex=np.array([capex[t] for t in technologies], dtype=float),
+            opex_percent=np.array([opex_percent.get(t, 0.0) for t in technologies], dtype=float),
+            lifetime=np.array([lifetime.get(t, 0) for t in technologies], dtype=int)
+        )
+
+
+def capacity_matrix(installed: Iterable[Mapping[str, float]], technologies: Sequence[str]) -> np.ndarray:
+    """(scenario x technology) capacities from one {technology: MW} dict per scenario; others are ignored"""
+    position = {tech: i for i, tech in enumerate(technologies)}
+    installed = list(installed)
+    capacity = np.zeros((len(installed), len(position)))
+    for row, techs in enumerate(installed):
+        for tech, mw in techs.items():
+            if tech in position:
+                capacity[row, position[tech]] += mw
+    return capacity
+
+
+def replacement_costs(capacity: np.ndarray, costs: TechnologyCosts, years: int) -> np.ndarray:
+    """(scenario x year) CAPEX of the replacements due in operating years 0..years-1"""
+    year = np.arange(years)[:, None]
+    lifetime = costs.lifetime[None, :]
+    due = (year > 0) & (lifetime > 0) & (year % np.maximum(lifetime, 1) == 0)  # (year x technology)
+    return capacity @ (due * costs.capex).T
+
+
+def discount_factors(rates: np.ndarray, years: int) -> np.ndarray:
+    """(rate x year) factors 1 / (1 + r)^(y + 1) of operating years 0..years-1"""
+    return (1.0 + np.asarray(rates, dtype=float)[:, None]) ** -np.arange(1, years + 1)
+
+
+def annuity(npv: np.ndarray, rates: np.ndarray, years: np.ndarray) -> np.ndarray:
+    """
+    Yearly payment over `years` equivalent to a negative NPV (0 for NPV >= 0),
+    broadcasting npv against rates and years
+    """
+    rates, years = np.asarray(rates, dtype=float), np.asarray(years, dtype=float)
+    growth = (1.0 + rates) ** years
+    with np.errstate(divide="ignore", invalid="ignore"):
+        factor = np.where(rates == 0, 1.0 / years, rates * growth / (growth - 1.0))
+    return np.where(npv >= 0, 0.0, -npv * factor)
+
+
+def irr(initial: np.ndarray, flows: np.ndarray, horizons: Sequence[int],
+        low: float = -0.99, high: float = 10.0, tol: float = 1e-10) -> np.ndarray:
+    """
+    (scenario x horizon) internal rate of return of -initial followed by the
+    (scenario x year) flows, by bisection of all rows at once. NaN where the
+    NPV does not change sign between low and high.
+    """
+    horizons = np.asarray(horizons)
+    in_horizon = np.arange(flows.shape[1])[:, None] < horizons[None, :]  # (year x horizon)
+
+    def npv_at(rate):  # rate: (scenario x horizon)
+        # Horner's rule in v = 1 / (1 + r): sum of flow_y * v^(y + 1), without powers
+        v = 1.0 / (1.0 + rate)
+        total = np.zeros_like(rate)
+        for year in range(flows.shape[1] - 1, -1, -1):
+            total = (total + flows[:, year, None] * in_horizon[year]) * v
+        return total - initial[:, None]
+
+    shape = (len(initial), len(horizons))
+    lo, hi = np.full(shape, low), np.full(shape, high)
+    f_lo = npv_at(lo)
+    valid = np.sign(f_lo) != np.sign(npv_at(hi))
+    for _ in range(int(np.ceil(np.log2((high - low) / tol)))):
+        mid = 0.5 * (lo + hi)
+        f_mid = npv_at(mid)
+        left = np.sign(f_mid) == np.sign(f_lo)
+        lo, f_lo = np.where(left, mid, lo), np.where(left, f_mid, f_lo)
+        hi = np.where(left, hi, mid)
+    return np.where(valid, 0.5 * (lo + hi), np.nan)
+
+
+@dataclass
+class FinancialResults:
+    """
+    Metrics of every scenario (rows of the inputs) for every discount rate
+    and horizon: arrays shaped (scenario x rate x horizon), except the
+    rate-independent irr (scenario x horizon). NPV counts costs negative
+    and revenue positive; LCOE is the discounted cost per discounted MWh.
+    """
+    rates: np.ndarray
+    horizons: np.ndarray
+    initial_investment: np.ndarray  # (scenario,)
+    annual_cost: np.ndarray         # (scenario,) operating cost plus O&M
+    npv: np.ndarray
+    annuity: np.ndarray
+    lcoe: np.ndarray                # NaN without energy
+    irr: np.ndarray                 # NaN without revenue
+
+    def to_frame(self) -> pd.DataFrame:
+        """Long frame, one row per scenario, rate and horizon"""
+        n_scenarios, n_rates, n_horizons = self.npv.shape
+        scenario, rate, horizon = np.meshgrid(
+            np.arange(n_scenarios), np.arange(n_rates), np.arange(n_horizons), indexing="ij"
+        )
+        return pd.DataFrame({
+            "scenario": scenario.ravel(),
+            "discount_rate": self.rates[rate.ravel()],
+            "horizon": self.horizons[horizon.ravel()],
+            "initial_investment": self.initial_investment[scenario.ravel()],
+            "annual_cost": self.annual_cost[scenario.ravel()],
+            "npv": self.npv.ravel(),
+            "annuity": self.annuity.ravel(),
+            "lcoe": self.lcoe.ravel(),
+            "irr": self.irr[scenario.ravel(), horizon.ravel()],
+        })
+
+
+def evaluate(
+    capacity: np.ndarray,
+    operating_cost: np.ndarray,
+    costs: TechnologyCosts,
+    rates: Sequence[float],
+    horizons: Sequence[int],
+    energy: Optional[np.ndarray] = None,
+    revenue: Optional[np.ndarray] = None
+) -> FinancialResults:
+    """
+    NPV, annuity, LCOE and IRR of the scenarios given by their (scenario x
+    technology) capacity and yearly operating cost, for every rate and
+    horizon. energy (MWh per year) enables LCOE, revenue (per year) IRR;
+    both are per scenario.
+
+    The (scenario x year) cash flows are built once for the longest horizon;
+    every (rate, horizon) pair is then one column of a discount matrix, so
+    all NPVs come from a single matrix product.
+    """
+    rates = np.asarray(rates, dtype=float)
+    horizons = np.asarray(horizons, dtype=int)
+    operating_cost = np.asarray(operating_cost, dtype=float)
+    years = int(horizons.max())
+    n_scenarios = len(operating_cost)
+
+    initial = capacity @ costs.capex
+    annual = operating_cost + capacity @ (costs.capex * costs.opex_percent)
+    cost_flows = annual[:, None] + replacement_costs(capacity, costs, years)  # (scenario x year), positive
+    income = np.zeros(n_scenarios) if revenue is None else np.asarray(revenue, dtype=float)
+
+    # (year x rate*horizon): discount factor of year y for a rate, zero beyond the horizon
+    in_horizon = np.arange(years)[:, None] < horizons[None, :]
+    weights = (discount_factors(rates, years).T[:, :, None] * in_horizon[:, None, :]).reshape(years, -1)
+    present_cost = (initial[:, None] + cost_flows @ weights).reshape(n_scenarios, len(rates), len(horizons))
+    present_year = weights.sum(axis=0).reshape(len(rates), len(horizons))  # PV of 1 per year
+
+    npv = income[:, None, None] * present_year[None] - present_cost
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lcoe = (
+            present_cost / (np.asarray(energy, dtype=float)[:, None, None] * present_year[None])
+            if energy is not None else np.full(npv.shape, np.nan)
+        )
+    rate_returns = (
+        irr(initial, income[:, None] - cost_flows, horizons)
+        if revenue is not None else np.full((n_scenarios, len(horizons)), np.nan)
+    )
+    return FinancialResults(
+        rates=rates,
+        horizons=horizons,
+        initial_investment=initial,
+        annual_cost=annual,
+        npv=npv,
+        annuity=annuity(npv, rates[None, :, None], horizons[None, None, :]),
+        lcoe=lcoe,
+        irr=rate_returns
+    )
@@ -0,0 +1,145 @@
+"""
+Columnar storage of master_gen: static asset parameters plus float32 profiles.
+
+A store is a directory with
+    assets.csv    one row per asset id: type and the parameters of its first
+                  row (pmax, pmin, gencost, emax, einitial, eta)
+    seasons.csv   season, offset and hours of its time axis in times.npy
+    members.csv   season and id of every asset with data in that season
+    times.npy     int64 nanosecond timestamps of all seasons, back to back
+    profiles.csv  season, id, column and offset into profiles.npy of every
+                  parameter that is not constant at the asset's static value
+    profiles.npy  float32 values of those profiles, back to back
+
+Only time-varying parameters (wind and solar pmax) take space per hour, and
+both .npy files are memory-mapped, so opening a store costs a few small CSV
+reads however long or wide the profile library is.
+"""
+import os
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+PARAMETERS = ('pmax', 'pmin', 'gencost', 'emax', 'einitial', 'eta')
+COLUMNS = ['time', 'id', 'type', *PARAMETERS, 'season']
+
+
+def write_gen_store(master_gen: pd.DataFrame, path: str) -> None:
+    """Write a long master_gen frame (columns COLUMNS) as a store at path"""
+    master_gen = master_gen.sort_values(['season', 'time', 'id'], kind='stable')
+    assets = master_gen.sort_values('time', kind='stable').drop_duplicates(subset=['id'])
+    assets = assets[['id', 'type', *PARAMETERS]].reset_index(drop=True)
+    static = assets.set_index('id')
+
+    seasons, members, times, index, values = [], [], [], [], []
+    time_offset = value_offset = 0
+    for season, rows in master_gen.groupby('season', sort=False):
+        axis = pd.DatetimeIndex(sorted(rows['time'].unique()))
+        seasons.append((season, time_offset, len(axis)))
+        times.append(axis.as_unit('ns').asi8)
+        time_offset += len(axis)
+
+        for asset_id, asset_rows in rows.groupby('id', sort=True):
+            members.append((season, asset_id))
+            asset_rows = asset_rows.drop_duplicates(subset=['time']).set_index('time').reindex(axis)
+            for column in PARAMETERS:
+                profile = asset_rows[column].to_numpy(dtype=float)
+                if np.array_equal(profile, np.full(len(axis), static.at[asset_id, column])):
+                    continue
+                index.append((season, asset_id, column, value_offset))
+                values.append(profile.astype(np.float32))
+                value_offset += len(axis)
+
+    os.makedirs(path, exist_ok=True)
+    assets.to_csv(os.path.join(path, 'assets.csv'), index=False)
+    pd.DataFrame(seasons, columns=['season', 'offset', 'hours']).to_csv(os.path.join(path, 'seasons.csv'), index=False)
+    pd.DataFrame(members, columns=['season', 'id']).to_csv(os.path.join(path, 'members.csv'), index=False)
+    pd.DataFrame(index, columns=['season', 'id', 'column', 'offset']).to_csv(os.path.join(path, 'profiles.csv'), index=False)
+    np.save(os.path.join(path, 'times.npy'), np.concatenate(times) if times else np.zeros(0, dtype=np.int64))
+    np.save(os.path.join(path, 'profiles.npy'), np.concatenate(values) if values else np.zeros(0, dtype=np.float32))
+
+
+class GenStore:
+    """
+    Read access to a store written by write_gen_store(). season_frame()
+    rebuilds the master_gen rows of one season and a set of ids on demand.
+    Pickling keeps only the path, so worker processes map the files again.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.assets = pd.read_csv(os.path.join(path, 'assets.csv'))
+        self.season_axes = pd.read_csv(os.path.join(path, 'seasons.csv')).set_index('season')
+        self.members = pd.read_csv(os.path.join(path, 'members.csv'))
+        self.profile_index = pd.read_csv(os.path.join(path, 'profiles.csv'))
+        self.times = np.load(os.path.join(path, 'times.npy'), mmap_mode='r')
+        self.values = np.load(os.path.join(path, 'profiles.npy'), mmap_mode='r')
+        self._static = self.assets.set_index('id')
+        self._profiles = self.profile_index.set_index(['season', 'id', 'column'])['offset']
+
+    def __getstate__(self):
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'])
+
+    @property
+    def seasons(self) -> list:
+        return self.season_axes.index.tolist()
+
+    def season_times(self, season: str) -> pd.DatetimeIndex:
+        offset, hours = self.season_axes.loc[season, ['offset', 'hours']]
+        return pd.DatetimeIndex(np.asarray(self.times[offset:offset + hours]).view('datetime64[ns]'))
+
+    def profile(self, season: str, asset_id: int, column: str) -> np.ndarray:
+        """Hourly values of one parameter: a float32 view of the mapped file, or the static value"""
+        hours = int(self.season_axes.at[season, 'hours'])
+        key = (season, asset_id, column)
+        if key in self._profiles.index:
+            offset = int(self._profiles.loc[key])
+            return self.values[offset:offset + hours]
+        return np.full(hours, self._static.at[asset_id, column])
+
+    def season_frame(self, season: str, ids: Optional[Iterable[int]] = None) -> pd.DataFrame:
+        """master_gen rows (columns COLUMNS) of a season, for the given ids or all with data in it"""
+        times = self.season_times(season)
+        present = self.members.loc[self.members['season'] == season, 'id'].to_numpy()
+        ids = present if ids is None else np.array([i for i in dict.fromkeys(ids) if i in present], dtype=int)
+        frame = {
+            'time': np.tile(times, len(ids)),
+            'id': np.repeat(ids, len(times)),
+            'type': np.repeat(self._static.loc[ids, 'type'].to_numpy(), len(times)),
+        }
+        for column in PARAMETERS:
+            frame[column] = np.concatenate(
+                [self.profile(season, i, column) for i in ids]
+            ).astype(float) if len(ids) else np.zeros(0)
+        frame['season'] = season
+        return pd.DataFrame(frame, columns=COLUMNS)
+
+    def type_ratings(self) -> dict:
+        """Rated power (MW) of each asset type: the peak pmax of its assets over all seasons"""
+        peaks = self._static['pmax'].astype(float).to_dict()
+        for season, asset_id, column, offset in self.profile_index.itertuples(index=False):
+            if column == 'pmax':
+                hours = int(self.season_axes.at[season, 'hours'])
+                peaks[asset_id] = max(peaks[asset_id], float(self.values[offset:offset + hours].max(initial=0.0)))
+        return pd.Series(peaks).groupby(self._static['type']).max().to_dict()
+
+    def to_frame(self) -> pd.DataFrame:
+        """The whole store as one long master_gen frame"""
+        return pd.concat([self.season_frame(season) for season in self.seasons], ignore_index=True)
+
+
+def load_gen_store(path: str, csv_path: Optional[str] = None) -> GenStore:
+    """
+    Open the store at path. With csv_path, (re)build it first when it is
+    missing or older than that master_gen CSV.
+    """
+    marker = os.path.join(path, 'profiles.npy')
+    if csv_path is not None and (
+        not os.path.exists(marker) or os.path.getmtime(marker) < os.path.getmtime(csv_path)
+    ):
+        write_gen_store(pd.read_csv(csv_path, parse_dates=['time']), path)
+    return GenStore(path)
@@ -0,0 +1,64 @@
+"""Lazy generation of branch flow-limit constraints"""
+from dataclasses import dataclass, field
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+from .lp_builder import LPMatrices
+from .solvers import LPSolution, SolverOptions, solve_lp
+from .tracing import INFO, log
+
+
+@dataclass
+class LazyLimitReport:
+    iterations: int         # number of LP solves
+    constraints_added: int  # flow-limit rows in the final LP
+    total_limits: int       # rows the full formulation would have had
+    limits: np.ndarray = field(default_factory=lambda: np.array([], dtype=int))  # active (branch, hour) pairs
+
+    def to_dict(self):
+        return {
+            'iterations': self.iterations,
+            'constraints_added': self.constraints_added,
+            'total_limits': self.total_limits
+        }
+
+
+def solve_with_lazy_flow_limits(
+    lp: LPMatrices,
+    solver: Union[SolverOptions, str, None] = None,
+    tolerance: float = 1e-6,
+    max_iterations: int = 50,
+    initial_limits: Optional[np.ndarray] = None
+) -> Tuple[LPSolution, LazyLimitReport]:
+    """
+    Solve without line limits, then add the (branch, hour) limits that the
+    solution violates and re-solve until no flow exceeds its ratea.
+
+    Added limits are kept for all later iterations, so the loop ends after
+    at most one pass per newly congested (branch, hour) pair. Hitting
+    max_iterations falls back to the full set of limits.
+
+    initial_limits seeds the active set, e.g. with the limits found for a
+    previous solve of the same network.
+    """
+    active = np.array([], dtype=int) if initial_limits is None else np.asarray(initial_limits, dtype=int)
+    total = 2 * len(lp.flow_rate)
+
+    for iteration in range(1, max_iterations + 1):
+        solution = solve_lp(lp.with_flow_limits(active), solver)
+        if not solution.optimal:
+            return solution, LazyLimitReport(iteration, 2 * len(active), total, active)
+
+        violated = np.flatnonzero(np.abs(lp.flows(solution.x)) > lp.flow_rate + tolerance)
+        violated = np.setdiff1d(violated, active)
+        log(f"[DCOPF] Lazy flow limits: iteration {iteration}, {len(violated)} violated (branch, hour) limits")
+        if len(violated) == 0:
+            return solution, LazyLimitReport(iteration, 2 * len(active), total, active)
+
+        active = np.union1d(active, violated)
+
+    log("[DCOPF] Lazy flow limits did not converge, solving with every limit", INFO)
+    every_limit = np.arange(len(lp.flow_rate))
+    solution = solve_lp(lp.with_flow_limits(every_limit), solver)
+    return solution, LazyLimitReport(max_iterations + 1, total, total, every_limit)
@@ -0,0 +1,110 @@
+"""Per-type energy and cost metrics of solved dispatches"""
+from dataclasses import dataclass
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .model_data import DCOPFData
+
+
+@dataclass
+class TypeMetrics:
+    """
+    Energy metrics of one dispatch aggregated per asset type, as arrays
+    aligned with `types`. Energies are in MWh, cost in currency units.
+    available is the energy the units could have produced at their hourly
+    pmax; curtailment the part of it left unused by zero-cost units.
+    """
+    types: np.ndarray
+    generation: np.ndarray
+    cost: np.ndarray
+    available: np.ndarray
+    curtailment: np.ndarray
+
+    @property
+    def capacity_factor(self) -> np.ndarray:
+        return np.divide(
+            self.generation, self.available,
+            out=np.zeros_like(self.generation), where=self.available > 0
+        )
+
+    def as_dict(self, field: str) -> Dict[str, float]:
+        """One metric ('generation', 'capacity_factor', ...) as type -> value"""
+        return dict(zip(self.types.tolist(), getattr(self, field).tolist()))
+
+
+_FIELDS = ('generation', 'cost', 'available', 'curtailment')
+
+
+def type_metrics(
+    types: np.ndarray,
+    gen: np.ndarray,
+    pmax: np.ndarray,
+    cost: np.ndarray,
+    delta_t: float = 1.0,
+    curtailable: Optional[np.ndarray] = None
+) -> TypeMetrics:
+    """
+    Aggregate (unit x hour) dispatch gen, hourly capacity pmax and marginal
+    cost per unit type (types, one per unit). curtailable marks the units
+    whose unused energy counts as curtailment; by default those with zero
+    cost throughout, i.e. wind and solar.
+    """
+    if curtailable is None:
+        curtailable = (cost == 0).all(axis=1)
+    labels, inverse = np.unique(np.asarray(types), return_inverse=True)
+    per_unit = {
+        'generation': gen.sum(axis=1),
+        'cost': (gen * cost).sum(axis=1),
+        'available': pmax.sum(axis=1),
+    }
+    per_unit['curtailment'] = np.where(curtailable, per_unit['available'] - per_unit['generation'], 0.0)
+    totals = {
+        name: np.bincount(inverse, weights=values, minlength=len(labels)) * delta_t
+        for name, values in per_unit.items()
+    }
+    return TypeMetrics(labels, **totals)
+
+
+def dcopf_type_metrics(
+    data: DCOPFData,
+    generation: pd.DataFrame,
+    id_to_type: Mapping[int, str],
+    storage_cost: Optional[Mapping[int, float]] = None
+) -> TypeMetrics:
+    """
+    Type metrics of a dcopf result: generation is its 'generation' frame,
+    whose gen column holds the generators and then the storage units of data
+    hour by hour. Storage enters with its net output against its power
+    rating, at the per-id cost in storage_cost (zero if not given).
+    """
+    n_units = data.n_gens + data.n_storage
+    gen = generation['gen'].to_numpy().reshape(n_units, data.n_hours)
+
+    storage_cost = storage_cost or {}
+    ids = np.concatenate([data.gen_ids, data.storage_ids])
+    pmax = np.vstack([data.gen_pmax, np.repeat(data.storage_pmax[:, None], data.n_hours, axis=1)])
+    cost = np.vstack([
+        data.gen_cost,
+        np.repeat(np.array([storage_cost.get(i, 0.0) for i in data.storage_ids], dtype=float)[:, None],
+                  data.n_hours, axis=1)
+    ])
+    curtailable = np.concatenate([(data.gen_cost == 0).all(axis=1), np.zeros(data.n_storage, dtype=bool)])
+
+    # Units of unknown type are left out, as they have no column to go to
+    known = np.array([i in id_to_type for i in ids], dtype=bool)
+    types = np.array([id_to_type[i] for i in ids[known]], dtype=str)
+    return type_metrics(types, gen[known], pmax[known], cost[known], data.delta_t, curtailable[known])
+
+
+def weighted_sum(weighted: Iterable[Tuple[TypeMetrics, float]]) -> TypeMetrics:
+    """Sum of metrics times weights, e.g. seasons scaled to a year, over the union of their types"""
+    weighted = list(weighted)
+    types = np.unique(np.concatenate([m.types for m, _ in weighted])) if weighted else np.array([], dtype=str)
+    totals = {name: np.zeros(len(types)) for name in _FIELDS}
+    for metrics, weight in weighted:
+        positions = np.searchsorted(types, metrics.types)
+        for name in _FIELDS:
+            totals[name][positions] += getattr(metrics, name) * weight
+    return TypeMetrics(types, **totals)
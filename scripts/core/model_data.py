@@ -0,0 +1,246 @@
+"""Dense array representation of the DCOPF inputs"""
+from dataclasses import dataclass, replace
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .tracing import INFO, log
+
+
+@dataclass
+class DCOPFData:
+    """
+    Inputs of one DCOPF horizon pivoted into (asset x hour) arrays.
+
+    Hours are addressed by integer position into `times`, buses by position
+    into `buses`. Incidence matrices map assets and branches onto buses so
+    that the power balance of bus n reads:
+
+        gen_incidence[n] @ GEN + storage_incidence[n] @ (DIS - CH)
+            - branch_incidence[n] @ FLOW == demand[n]
+    """
+    times: pd.DatetimeIndex
+    delta_t: float
+
+    # Network
+    buses: np.ndarray             # bus ids, shape (N,)
+    slack: int                    # position of the slack bus
+    demand: np.ndarray            # (N, T)
+    branch_from: np.ndarray       # from-bus ids, shape (L,)
+    branch_to: np.ndarray         # to-bus ids, shape (L,)
+    branch_sus: np.ndarray        # (L,)
+    branch_ratea: np.ndarray      # (L,)
+    branch_incidence: np.ndarray  # (N, L): +1 at from-bus, -1 at to-bus
+
+    # Non-storage generators, one per placed unit
+    gen_units: np.ndarray         # unit index, (G,)
+    gen_ids: np.ndarray           # asset id whose profile the unit follows, (G,)
+    gen_node: np.ndarray          # bus of each unit, (G,)
+    gen_pmin: np.ndarray          # (G, T)
+    gen_pmax: np.ndarray          # (G, T)
+    gen_cost: np.ndarray          # (G, T)
+    gen_incidence: np.ndarray     # (N, G)
+
+    # Storage units
+    storage_units: np.ndarray     # (S,)
+    storage_ids: np.ndarray       # (S,)
+    storage_node: np.ndarray      # (S,)
+    storage_pmax: np.ndarray      # (S,)
+    storage_emax: np.ndarray      # (S,)
+    storage_einitial: np.ndarray  # (S,)
+    storage_eta: np.ndarray       # (S,)
+    storage_incidence: np.ndarray  # (N, S)
+    storage_efinal: Optional[np.ndarray] = None  # (S,) final SoC, None for einitial
+
+    @property
+    def n_hours(self) -> int:
+        return len(self.times)
+
+    @property
+    def n_buses(self) -> int:
+        return len(self.buses)
+
+    @property
+    def n_branches(self) -> int:
+        return len(self.branch_sus)
+
+    @property
+    def n_gens(self) -> int:
+        return len(self.gen_ids)
+
+    @property
+    def n_storage(self) -> int:
+        return len(self.storage_ids)
+
+    @property
+    def final_soc(self) -> np.ndarray:
+        """SoC each storage unit must end the horizon with"""
+        return self.storage_einitial if self.storage_efinal is None else self.storage_efinal
+
+
+def slice_hours(data: DCOPFData, start: int, stop: int) -> DCOPFData:
+    """Sub-horizon of hours [start, stop); storage parameters and SoC targets are unchanged"""
+    hours = slice(start, stop)
+    return replace(
+        data,
+        times=data.times[hours],
+        demand=data.demand[:, hours],
+        gen_pmin=data.gen_pmin[:, hours],
+        gen_pmax=data.gen_pmax[:, hours],
+        gen_cost=data.gen_cost[:, hours]
+    )
+
+
+def _pivot(frame: pd.DataFrame, key: str, keys: np.ndarray, times: pd.DatetimeIndex, column: str) -> np.ndarray:
+    """Pivot one column of a long (key, time) frame into a (key x hour) array"""
+    if len(keys) == 0:
+        return np.zeros((0, len(times)))
+    wide = frame.groupby([key, 'time'])[column].first().unstack('time')
+    return wide.reindex(index=keys, columns=times).to_numpy(dtype=float)
+
+
+def unit_table(gen_time_series: pd.DataFrame) -> pd.DataFrame:
+    """
+    Units of a gen time series that carries one block of rows per placed
+    asset: its 'unit' column if present, else one unit per (id, bus) pair
+    in order of appearance
+    """
+    if 'unit' in gen_time_series.columns:
+        return gen_time_series[['unit', 'id', 'bus']].drop_duplicates(subset=['unit'])
+    units = gen_time_series[['id', 'bus']].drop_duplicates()
+    return units.assign(unit=np.arange(len(units)))[['unit', 'id', 'bus']]
+
+
+def demand_array(bus: pd.DataFrame, demand_time_series: pd.DataFrame, times: pd.DatetimeIndex) -> np.ndarray:
+    """Pivot a demand frame into a (bus x hour) array; demand only counts at load buses (type 1)"""
+    buses = bus['bus_i'].to_numpy()
+    load_buses = bus.loc[bus['type'] == 1, 'bus_i'].to_numpy()
+    load_rows = demand_time_series[demand_time_series['bus'].isin(load_buses)]
+    if load_rows.empty:
+        return np.zeros((len(buses), len(times)))
+    return (
+        load_rows.groupby(['bus', 'time'])['pd'].sum()
+        .unstack('time')
+        .reindex(index=buses, columns=times)
+        .fillna(0.0)
+        .to_numpy(dtype=float)
+    )
+
+
+def prepare_dcopf_data(
+    gen_time_series: pd.DataFrame,
+    branch: pd.DataFrame,
+    bus: pd.DataFrame,
+    demand_time_series: pd.DataFrame,
+    delta_t: float = 1,
+    slack_bus: int = 1,
+    units: Optional[pd.DataFrame] = None
+) -> Optional[DCOPFData]:
+    """
+    Pivot the long gen/load frames once into dense arrays and precompute the
+    bus incidence of generators, storage units and branches.
+
+    Every placed asset is its own unit with its own variables, so several
+    units of one type can sit on different buses. units (columns unit, id,
+    bus; see time_series.build_unit_table) places them explicitly, and
+    gen_time_series then only needs one profile per id. Without it the
+    units are read from gen_time_series (see unit_table()).
+
+    Returns None when the horizon is empty or a generator lacks data for
+    some hour, mirroring the checks of the row-based build.
+    """
+    times = pd.DatetimeIndex(sorted(demand_time_series['time'].unique()))
+    if len(times) == 0:
+        log("[DCOPF] No time steps found in demand_time_series. Returning None.", INFO)
+        return None
+
+    buses = bus['bus_i'].to_numpy()
+    bus_index = pd.Index(buses)
+    n_buses = len(buses)
+    slack = int(bus_index.get_loc(slack_bus)) if slack_bus in bus_index else 0
+
+    demand = demand_array(bus, demand_time_series, times)
+
+    # Branches
+    branch_from = branch['fbus'].to_numpy().astype(int)
+    branch_to = branch['tbus'].to_numpy().astype(int)
+    n_branches = len(branch)
+    branch_incidence = np.zeros((n_buses, n_branches))
+    branch_incidence[bus_index.get_indexer(branch_from), np.arange(n_branches)] += 1
+    branch_incidence[bus_index.get_indexer(branch_to), np.arange(n_branches)] -= 1
+
+    # Units and their profiles. With a unit table the frame holds one
+    # profile per asset id, shared by all units of that id; otherwise every
+    # unit brings its own rows.
+    if units is None:
+        if 'unit' not in gen_time_series.columns:
+            gen_time_series = gen_time_series.merge(unit_table(gen_time_series), on=['id', 'bus'])
+        units = unit_table(gen_time_series)
+        key = 'unit'
+    else:
+        key = 'id'
+    units = units.reset_index(drop=True)
+
+    first = gen_time_series.drop_duplicates(subset=[key]).set_index(key)
+    missing = ~units[key].isin(first.index)
+    if missing.any():
+        log(f"[DCOPF] No data for unit(s) {units.loc[missing, 'unit'].tolist()}. Returning None.", INFO)
+        return None
+    profile_row = first.index.get_indexer(units[key])
+    is_storage = first['emax'].to_numpy()[profile_row] > 0
+    gens, storage = units[~is_storage], units[is_storage]
+
+    # Non-storage generators: (unit x hour) bounds and costs. Profiles
+    # are pivoted once per profile and then indexed by unit
+    profile_keys = gens[key].unique()
+    rows = pd.Index(profile_keys).get_indexer(gens[key])
+    gen_rows = gen_time_series[gen_time_series[key].isin(profile_keys)]
+    gen_pmin, gen_pmax, gen_cost = (
+        _pivot(gen_rows, key, profile_keys, times, column)[rows]
+        for column in ('pmin', 'pmax', 'gencost')
+    )
+    gen_ids = gens['id'].to_numpy()
+    gen_node = gens['bus'].to_numpy()
+
+    if np.isnan(gen_pmax).any() or np.isnan(gen_pmin).any():
+        g, t = np.argwhere(np.isnan(gen_pmax) | np.isnan(gen_pmin))[0]
+        log(f"[DCOPF] Missing data for generator={gen_ids[g]}, time={times[t]}. Returning None.", INFO)
+        return None
+
+    gen_incidence = np.zeros((n_buses, len(gens)))
+    gen_incidence[bus_index.get_indexer(gen_node), np.arange(len(gens))] = 1
+
+    # Storage units: parameters from the first row of their profile
+    storage_first = first.iloc[profile_row[is_storage]]
+    storage_node = storage['bus'].to_numpy()
+    storage_incidence = np.zeros((n_buses, len(storage)))
+    storage_incidence[bus_index.get_indexer(storage_node), np.arange(len(storage))] = 1
+
+    return DCOPFData(
+        times=times,
+        delta_t=delta_t,
+        buses=buses,
+        slack=slack,
+        demand=demand,
+        branch_from=branch_from,
+        branch_to=branch_to,
+        branch_sus=branch['sus'].to_numpy(dtype=float),
+        branch_ratea=branch['ratea'].to_numpy(dtype=float),
+        branch_incidence=branch_incidence,
+        gen_units=gens['unit'].to_numpy(),
+        gen_ids=gen_ids,
+        gen_node=gen_node,
+        gen_pmin=gen_pmin,
+        gen_pmax=gen_pmax,
+        gen_cost=gen_cost,
+        gen_incidence=gen_incidence,
+        storage_units=storage['unit'].to_numpy(),
+        storage_ids=storage['id'].to_numpy(),
+        storage_node=storage_node,
+        storage_pmax=storage_first['pmax'].to_numpy(dtype=float),
+        storage_emax=storage_first['emax'].to_numpy(dtype=float),
+        storage_einitial=storage_first['einitial'].to_numpy(dtype=float),
+        storage_eta=storage_first['eta'].to_numpy(dtype=float),
+        storage_incidence=storage_incidence
+    )
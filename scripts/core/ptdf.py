@@ -0,0 +1,97 @@
+"""Power transfer distribution factors for the reduced DCOPF formulation"""
+import hashlib
+from dataclasses import dataclass
+from typing import Dict
+
+import numpy as np
+
+from .model_data import DCOPFData
+
+
+@dataclass
+class PTDF:
+    """
+    Linear sensitivities of the DC network around the slack bus.
+
+    With nodal injections P (N x T), branch flows are `matrix @ P` and bus
+    angles are `angles @ P`; the slack column of both is zero.
+    """
+    matrix: np.ndarray   # (L, N) flow per unit injection
+    angles: np.ndarray   # (N, N) angle per unit injection
+    topology: str        # hash of the network the factors belong to
+
+    def flows(self, injections: np.ndarray) -> np.ndarray:
+        return self.matrix @ injections
+
+    def thetas(self, injections: np.ndarray) -> np.ndarray:
+        return self.angles @ injections
+
+
+# PTDFs already computed in this process, keyed by topology hash
+_PTDF_CACHE: Dict[str, PTDF] = {}
+
+
+def topology_hash(data: DCOPFData) -> str:
+    """Fingerprint of everything the PTDF depends on: buses, branches, susceptances and slack"""
+    h = hashlib.sha1()
+    for arr in (data.buses, data.branch_incidence, data.branch_sus):
+        h.update(np.ascontiguousarray(arr, dtype=float).tobytes())
+    h.update(str(data.slack).encode())
+    return h.hexdigest()
+
+
+def compute_ptdf(data: DCOPFData) -> PTDF:
+    """
+    Build the PTDF from branch susceptances and the slack bus.
+
+    B_bus = A' diag(b) A with A the (L x N) branch-bus incidence. Dropping
+    the slack row/column makes B_bus invertible for a connected network,
+    giving angles X = B_red^-1 and flows diag(b) A X.
+    """
+    A = data.branch_incidence.T            # (L, N): +1 from, -1 to
+    b = data.branch_sus
+    B_bus = A.T @ (b[:, None] * A)
+
+    keep = np.delete(np.arange(data.n_buses), data.slack)
+    try:
+        X_red = np.linalg.inv(B_bus[np.ix_(keep, keep)])
+    except np.linalg.LinAlgError:
+        raise ValueError("Cannot build PTDF: the network is not connected to the slack bus")
+
+    X = np.zeros((data.n_buses, data.n_buses))
+    X[np.ix_(keep, keep)] = X_red
+    return PTDF(matrix=(b[:, None] * A) @ X, angles=X, topology=topology_hash(data))
+
+
+def get_ptdf(data: DCOPFData) -> PTDF:
+    """PTDF for the network in data, computed once per topology"""
+    key = topology_hash(data)
+    if key not in _PTDF_CACHE:
+        _PTDF_CACHE[key] = compute_ptdf(data)
+    return _PTDF_CACHE[key]
+
+
+def nodal_injections(data: DCOPFData, solution: Dict[str, np.ndarray]) -> np.ndarray:
+    """Net injection per bus and hour (N x T) of a solved dispatch"""
+    return (
+        data.gen_incidence @ solution['gen']
+        + data.storage_incidence @ (solution['discharge'] - solution['charge'])
+        - data.demand
+    )
+
+
+def recover_flows_and_angles(
+    data: DCOPFData,
+    solution: Dict[str, np.ndarray],
+    flows: bool = True,
+    angles: bool = True
+) -> None:
+    """Fill in 'flow' and/or 'theta' of a PTDF solution from its injections"""
+    if not (flows or angles):
+        return
+    ptdf = get_ptdf(data)
+    injections = nodal_injections(data, solution)
+    if flows:
+        solution['flow'] = ptdf.flows(injections)
+    if angles:
+        solution['theta'] = ptdf.thetas(injections)
@@ -0,0 +1,139 @@
+"""
+Single-pass ingestion of the raw load, wind and solar series in data/raw.
+
+Every raw file is read once, resampled to hourly values, validated and
+scaled to MW, and the result is cached as one .npz next to the solve cache.
+The scripts that write the master files then slice any number of periods
+and bus assignments from the in-memory profiles.
+"""
+import os
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .tracing import INFO, log
+
+# Raw file of each series in data/raw
+RAW_FILES = {
+    "load": "data-load-becc.csv",
+    "wind": "wind-sion-2023.csv",
+    "solar": "pv-sion-2023.csv",
+}
+
+# Scale raw values to the MW of the master files
+RENEWABLE_SCALE = 0.1   # kW per 1000 kW installed (renewables.ninja) -> MW
+LOAD_SCALE = 100.0
+
+# Longest run of missing hours that is filled by interpolation
+MAX_GAP_HOURS = 3
+
+# Bump when the parsing or scaling below changes
+RAW_CACHE_VERSION = 1
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_RAW_DIR = os.path.join(_PROJECT_ROOT, "data", "raw")
+DEFAULT_CACHE_FILE = os.path.join(_PROJECT_ROOT, "data", "cache", "raw_profiles.npz")
+
+
+def _read_ninja(path: str) -> pd.Series:
+    """renewables.ninja export: '#' header lines, UTC 'time', 'electricity' in kW"""
+    df = pd.read_csv(path, comment="#", usecols=["time", "electricity"], parse_dates=["time"])
+    return df.set_index("time")["electricity"] * RENEWABLE_SCALE
+
+
+def _read_load(path: str) -> pd.Series:
+    """Load export: ';'-separated, day-first 'time', 'load'"""
+    df = pd.read_csv(path, sep=";")
+    df["time"] = pd.to_datetime(df["time"], format="%d.%m.%y %H:%M")
+    return df.set_index("time")["load"] * LOAD_SCALE
+
+
+_READERS = {"load": _read_load, "wind": _read_ninja, "solar": _read_ninja}
+
+
+def _hourly(series: pd.Series, name: str, index: pd.DatetimeIndex) -> np.ndarray:
+    """
+    Average duplicate or sub-hourly samples to hours on index, then fill
+    gaps of up to MAX_GAP_HOURS by interpolation. Longer gaps and negative
+    values are errors.
+    """
+    hourly = series.groupby(series.index.floor("h")).mean().reindex(index)
+    missing = hourly.isna().to_numpy()
+    if missing.any():
+        # Length of the longest run of consecutive missing hours
+        runs = np.diff(np.flatnonzero(np.diff(np.concatenate(([0], missing.astype(int), [0])))))[::2]
+        if runs.max() > MAX_GAP_HOURS:
+            raise ValueError(f"Raw series '{name}' has a gap of {runs.max()} hours (at most {MAX_GAP_HOURS} are filled)")
+        log(f"Raw series '{name}': interpolating {missing.sum()} missing hours", INFO)
+        hourly = hourly.interpolate(limit_direction="both")
+    if (hourly < 0).any():
+        raise ValueError(f"Raw series '{name}' has negative values")
+    return hourly.to_numpy(dtype=float)
+
+
+def read_raw_profiles(raw_dir: str = DEFAULT_RAW_DIR, files: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """
+    Read every raw series once and return them as one frame of hourly MW
+    values, columns load/wind/solar, over the hours all of them cover.
+    """
+    files = files or RAW_FILES
+    raw = {name: _READERS[name](os.path.join(raw_dir, file)) for name, file in files.items()}
+    start = max(series.index.min() for series in raw.values()).floor("h")
+    end = min(series.index.max() for series in raw.values()).floor("h")
+    index = pd.date_range(start, end, freq="h")
+    return pd.DataFrame({name: _hourly(series, name, index) for name, series in raw.items()}, index=index)
+
+
+def _source_signature(raw_dir: str, files: Dict[str, str]) -> str:
+    """Version, scales and size/modification time of every raw file"""
+    parts = [f"v{RAW_CACHE_VERSION}", f"{RENEWABLE_SCALE}", f"{LOAD_SCALE}", f"{MAX_GAP_HOURS}"]
+    for name, file in sorted(files.items()):
+        stat = os.stat(os.path.join(raw_dir, file))
+        parts.append(f"{name}:{file}:{stat.st_size}:{stat.st_mtime_ns}")
+    return "|".join(parts)
+
+
+def load_raw_profiles(
+    raw_dir: str = DEFAULT_RAW_DIR,
+    cache_file: Optional[str] = DEFAULT_CACHE_FILE,
+    files: Optional[Dict[str, str]] = None
+) -> pd.DataFrame:
+    """
+    read_raw_profiles(), served from cache_file while the raw files are
+    unchanged; cache_file None always reads the raw files.
+    """
+    files = files or RAW_FILES
+    signature = _source_signature(raw_dir, files)
+    if cache_file is not None and os.path.exists(cache_file):
+        with np.load(cache_file, allow_pickle=False) as cached:
+            if str(cached["signature"]) == signature:
+                return pd.DataFrame(
+                    cached["values"],
+                    index=pd.DatetimeIndex(cached["times"].view("datetime64[ns]")),
+                    columns=cached["columns"].tolist()
+                )
+
+    profiles = read_raw_profiles(raw_dir, files)
+    if cache_file is not None:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        tmp = f"{cache_file}.tmp.npz"
+        np.savez(
+            tmp,
+            signature=np.array(signature),
+            times=profiles.index.as_unit("ns").asi8,
+            columns=np.array(profiles.columns.tolist()),
+            values=profiles.to_numpy()
+        )
+        os.replace(tmp, cache_file)
+    return profiles
+
+
+def period_values(profiles: pd.DataFrame, column: str, start, end, shift_hours: int = 0) -> pd.Series:
+    """
+    Hourly values of one series over [start, end], taken shift_hours later
+    in the data; shifts past the end wrap around to its beginning.
+    """
+    values = np.roll(profiles[column].to_numpy(), -shift_hours)
+    mask = (profiles.index >= pd.to_datetime(start)) & (profiles.index <= pd.to_datetime(end))
+    return pd.Series(values[mask], index=profiles.index[mask], name=column)
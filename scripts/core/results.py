@@ -0,0 +1,127 @@
+"""Result frames of a solved DCOPF"""
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .model_data import DCOPFData
+
+# Frames of the primal solution, all by default
+PRIMAL_FRAMES = ('generation', 'angles', 'flows', 'storage')
+# Frames built from the duals of the solve (core.duals), when the backend
+# reports them; only built when named
+DUAL_FRAMES = ('prices', 'congestion', 'storage_values', 'sensitivities')
+# Frames a solve can return
+RESULT_FRAMES = PRIMAL_FRAMES + DUAL_FRAMES
+
+
+def resolve_outputs(outputs: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    """Validate a selection of result frames; None selects the PRIMAL_FRAMES"""
+    if outputs is None:
+        return PRIMAL_FRAMES
+    outputs = tuple(outputs)
+    unknown = set(outputs) - set(RESULT_FRAMES)
+    if unknown:
+        raise ValueError(f"Unknown result frames {sorted(unknown)}, expected some of {list(RESULT_FRAMES)}")
+    return outputs
+
+
+def build_result_frames(
+    data: DCOPFData,
+    solution: Dict[str, Any],
+    outputs: Optional[Iterable[str]] = None
+) -> Dict[str, Any]:
+    """
+    Turn solved (asset x hour) arrays into the dcopf result DataFrames.
+    Only the frames named in outputs are built; the solution needs 'theta'
+    only for 'angles', 'flow' only for 'flows' and its 'duals'
+    (core.duals.DCOPFDuals) for the DUAL_FRAMES, which are left out without.
+    """
+    outputs = resolve_outputs(outputs)
+    n_hours = data.n_hours
+    charge, discharge = solution['charge'], solution['discharge']
+    results = {}
+
+    # a) Non-storage generation followed by b) storage net output
+    if 'generation' in outputs:
+        results['generation'] = pd.DataFrame({
+            'time': np.tile(data.times, data.n_gens + data.n_storage),
+            'id': np.repeat(np.concatenate([data.gen_ids, data.storage_ids]), n_hours),
+            'unit': np.repeat(np.concatenate([data.gen_units, data.storage_units]), n_hours),
+            'node': np.repeat(np.concatenate([data.gen_node, data.storage_node]), n_hours),
+            'gen': np.concatenate([solution['gen'].ravel(), (discharge - charge).ravel()])
+        })
+
+    # c) Angles
+    if 'angles' in outputs:
+        results['angles'] = pd.DataFrame({
+            'time': np.tile(data.times, data.n_buses),
+            'bus': np.repeat(data.buses, n_hours),
+            'theta': solution['theta'].ravel()
+        })
+
+    # d) Flows
+    if 'flows' in outputs:
+        results['flows'] = pd.DataFrame({
+            'time': np.tile(data.times, data.n_branches),
+            'from_bus': np.repeat(data.branch_from, n_hours),
+            'to_bus': np.repeat(data.branch_to, n_hours),
+            'flow': solution['flow'].ravel()
+        })
+
+    # e) Storage states, with E reported at the end of each interval
+    if 'storage' in outputs:
+        results['storage'] = pd.DataFrame({
+            'storage_id': np.repeat(data.storage_ids, n_hours),
+            'unit': np.repeat(data.storage_units, n_hours),
+            'time': np.tile(data.times, data.n_storage),
+            'E': solution['soc'][:, 1:].ravel(),
+            'P_charge': charge.ravel(),
+            'P_discharge': discharge.ravel()
+        }, columns=["storage_id", "unit", "time", "E", "P_charge", "P_discharge"])
+
+    duals = solution.get('duals')
+    if duals is not None:
+        # f) Nodal prices
+        if 'prices' in outputs:
+            results['prices'] = pd.DataFrame({
+                'time': np.tile(data.times, data.n_buses),
+                'bus': np.repeat(data.buses, n_hours),
+                'price': duals.prices.ravel()
+            })
+
+        # g) Line shadow prices and congestion rents
+        if 'congestion' in outputs:
+            results['congestion'] = pd.DataFrame({
+                'time': np.tile(data.times, data.n_branches),
+                'from_bus': np.repeat(data.branch_from, n_hours),
+                'to_bus': np.repeat(data.branch_to, n_hours),
+                'flow': duals.flows.ravel(),
+                'shadow_price': duals.shadow_prices.ravel(),
+                'rent': duals.congestion_rents().ravel()
+            })
+
+        # h) Value of stored energy at the end of each interval
+        if 'storage_values' in outputs:
+            results['storage_values'] = pd.DataFrame({
+                'storage_id': np.repeat(data.storage_ids, n_hours),
+                'unit': np.repeat(data.storage_units, n_hours),
+                'time': np.tile(data.times, data.n_storage),
+                'value': duals.storage_values.ravel()
+            })
+
+        # i) First-order cost sensitivities: to a relative scaling of all
+        #    demand, and to each unit's generation cost (its dispatch)
+        if 'sensitivities' in outputs:
+            results['sensitivities'] = pd.DataFrame({
+                'parameter': ['load'] + ['gencost'] * data.n_gens,
+                'id': np.concatenate([[np.nan], data.gen_ids]),
+                'unit': np.concatenate([[np.nan], data.gen_units]),
+                'sensitivity': np.concatenate([
+                    [duals.load_sensitivity(data.demand)], solution['gen'].sum(axis=1)
+                ])
+            })
+
+    results['cost'] = solution['cost']
+    results['status'] = solution['status']
+    return results
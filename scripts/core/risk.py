@@ -0,0 +1,235 @@
+"""
+Monte Carlo risk analysis of investment cash flows (see core/finance.py).
+
+CAPEX, O&M share and lifetime of every technology, the discount rate and
+the electricity price are drawn from configurable distributions. All
+scenarios are evaluated on the same draws, in batches whose size keeps
+the per-draw arrays under a fixed element budget, and
+every batch only updates fixed-size histogram sketches, so memory does not
+grow with the number of draws.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .finance import TechnologyCosts
+
+# Largest (scenario x draw x horizon) plus (draw x technology x year) arrays a batch may build
+BATCH_ELEMENTS = 1 << 22
+
+
+@dataclass
+class Distribution:
+    """
+    A sampled parameter: kind 'fixed' (value), 'uniform' (low, high),
+    'normal' (mean, std), 'lognormal' (mean, sigma of the log) or
+    'triangular' (low, mode, high)
+    """
+    kind: str
+    params: Tuple[float, ...]
+
+    def sample(self, rng: np.random.Generator, size) -> np.ndarray:
+        if self.kind == "fixed":
+            return np.full(size, float(self.params[0]))
+        if self.kind == "uniform":
+            return rng.uniform(*self.params, size=size)
+        if self.kind == "normal":
+            return rng.normal(*self.params, size=size)
+        if self.kind == "lognormal":
+            return rng.lognormal(*self.params, size=size)
+        if self.kind == "triangular":
+            return rng.triangular(*self.params, size=size)
+        raise ValueError(f"Unknown distribution '{self.kind}'")
+
+
+PerTechnology = Union[Distribution, Mapping[str, Distribution]]
+
+
+@dataclass
+class Uncertainty:
+    """
+    Distributions of the uncertain inputs. capex, opex_percent and lifetime
+    are factors on the point values, either one distribution for every
+    technology or one per technology (missing ones stay at 1). Each
+    technology's factor is drawn independently. discount_rate and price
+    (currency per MWh, for the loss probability) are absolute values.
+    """
+    capex: PerTechnology = field(default_factory=lambda: Distribution("fixed", (1.0,)))
+    opex_percent: PerTechnology = field(default_factory=lambda: Distribution("fixed", (1.0,)))
+    lifetime: PerTechnology = field(default_factory=lambda: Distribution("fixed", (1.0,)))
+    discount_rate: Distribution = field(default_factory=lambda: Distribution("fixed", (0.08,)))
+    price: Optional[Distribution] = None
+
+
+def _factors(spec: PerTechnology, technologies: np.ndarray, rng: np.random.Generator, n: int) -> np.ndarray:
+    """(draw x technology) factors of a per-technology specification"""
+    if isinstance(spec, Distribution):
+        return spec.sample(rng, (n, len(technologies)))
+    factors = np.ones((n, len(technologies)))
+    for j, tech in enumerate(technologies):
+        if tech in spec:
+            factors[:, j] = spec[tech].sample(rng, n)
+    return factors
+
+
+class QuantileSketch:
+    """
+    Fixed-memory quantile estimates of many value streams at once. The bin
+    range of every stream is set by its first batch, widened by half its
+    span on each side; later values outside it land in an under- or
+    overflow bin bounded by the exact minimum and maximum seen. Quantiles
+    interpolate linearly within bins, so their error is at most one bin
+    width (1/bins of the widened range) unless they fall in an outer bin.
+    """
+
+    def __init__(self, n_streams: int, bins: int = 4096):
+        self.bins = bins
+        self.counts = np.zeros((n_streams, bins + 2))
+        self.low = self.high = None
+        self.min = np.full(n_streams, np.inf)
+        self.max = np.full(n_streams, -np.inf)
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a (stream x value) batch"""
+        if self.low is None:
+            lo, hi = values.min(axis=1), values.max(axis=1)
+            pad = 0.5 * np.maximum(hi - lo, 1e-9 * np.maximum(np.abs(hi), 1.0))
+            self.low, self.high = lo - pad, hi + pad
+        self.min = np.minimum(self.min, values.min(axis=1))
+        self.max = np.maximum(self.max, values.max(axis=1))
+
+        width = (self.high - self.low) / self.bins
+        position = np.floor((values - self.low[:, None]) / width[:, None])
+        # Bin 0 is the underflow, bins + 1 the overflow
+        index = np.clip(position + 1, 0, self.bins + 1).astype(np.int64)
+        index += np.arange(len(values))[:, None] * (self.bins + 2)
+        self.counts += np.bincount(index.ravel(), minlength=self.counts.size).reshape(self.counts.shape)
+
+    def quantiles(self, qs: Sequence[float]) -> np.ndarray:
+        """(stream x quantile) estimates"""
+        n_streams = len(self.counts)
+        edges = self.low[:, None] + (self.high - self.low)[:, None] * np.arange(self.bins + 1) / self.bins
+        # Bin edges including the under- and overflow bins
+        edges = np.hstack([np.minimum(self.min, self.low)[:, None], edges, np.maximum(self.max, self.high)[:, None]])
+        cumulative = np.cumsum(self.counts, axis=1)
+        result = np.empty((n_streams, len(qs)))
+        for k, q in enumerate(qs):
+            rank = q * cumulative[:, -1]
+            b = np.minimum((cumulative < rank[:, None]).sum(axis=1), self.bins + 1)
+            rows = np.arange(n_streams)
+            below = np.where(b > 0, cumulative[rows, b - 1], 0.0)
+            inside = np.divide(rank - below, self.counts[rows, b], out=np.zeros(n_streams), where=self.counts[rows, b] > 0)
+            result[:, k] = edges[rows, b] + inside * (edges[rows, b + 1] - edges[rows, b])
+        return np.clip(result, self.min[:, None], self.max[:, None])
+
+
+@dataclass
+class RiskResults:
+    """
+    NPV quantiles (scenario x horizon x quantile), mean NPV and probability
+    of loss (scenario x horizon) over all draws. NPV counts costs only, like
+    FinancialResults; a loss is a draw whose discounted revenue at the drawn
+    price falls short of its discounted costs (NaN without a price).
+    """
+    horizons: np.ndarray
+    quantile_levels: np.ndarray
+    npv_quantiles: np.ndarray
+    npv_mean: np.ndarray
+    loss_probability: np.ndarray
+    draws: int
+
+    def to_frame(self) -> pd.DataFrame:
+        """One row per scenario and horizon, a column npv_p<level> per quantile"""
+        n_scenarios, n_horizons = self.npv_mean.shape
+        frame = pd.DataFrame({
+            "scenario": np.repeat(np.arange(n_scenarios), n_horizons),
+            "horizon": np.tile(self.horizons, n_scenarios),
+            "npv_mean": self.npv_mean.ravel(),
+        })
+        for k, level in enumerate(self.quantile_levels):
+            frame[f"npv_p{round(level * 100)}"] = self.npv_quantiles[:, :, k].ravel()
+        frame["loss_probability"] = self.loss_probability.ravel()
+        return frame
+
+
+def monte_carlo(
+    capacity: np.ndarray,
+    operating_cost: np.ndarray,
+    costs: TechnologyCosts,
+    uncertainty: Uncertainty,
+    horizons: Sequence[int],
+    draws: int = 100_000,
+    energy: Optional[np.ndarray] = None,
+    energy_cost: Optional[np.ndarray] = None,
+    quantile_levels: Sequence[float] = (0.1, 0.5, 0.9),
+    seed: Optional[int] = None,
+    batch_size: Optional[int] = None
+) -> RiskResults:
+    """
+    Monte Carlo NPV of the scenarios given by their (scenario x technology)
+    capacity and yearly operating cost, over `draws` samples of the
+    uncertain inputs. energy (MWh per year, per scenario) together with
+    uncertainty.price gives the probability of loss; energy_cost is the
+    yearly operating cost of the units producing it, counted against their
+    revenue in place of operating_cost (default operating_cost).
+    """
+    rng = np.random.default_rng(seed)
+    horizons = np.asarray(horizons, dtype=int)
+    operating_cost = np.asarray(operating_cost, dtype=float)
+    n_scenarios, years = len(operating_cost), int(horizons.max())
+    if batch_size is None:
+        batch_size = max(1, BATCH_ELEMENTS // (n_scenarios * len(horizons) + len(costs.technologies) * years))
+    with_loss = energy is not None and uncertainty.price is not None
+    if with_loss:
+        energy = np.asarray(energy, dtype=float)
+        energy_cost = operating_cost if energy_cost is None else np.asarray(energy_cost, dtype=float)
+
+    sketch = QuantileSketch(n_scenarios * len(horizons))
+    npv_sum = np.zeros((n_scenarios, len(horizons)))
+    losses = np.zeros((n_scenarios, len(horizons)))
+    year = np.arange(years)
+
+    done = 0
+    while done < draws:
+        n = min(batch_size, draws - done)
+        capex = costs.capex * _factors(uncertainty.capex, costs.technologies, rng, n)               # (draw x tech)
+        opex = costs.opex_percent * _factors(uncertainty.opex_percent, costs.technologies, rng, n)
+        lifetime = np.maximum(np.rint(costs.lifetime * _factors(uncertainty.lifetime, costs.technologies, rng, n)), 0)
+        rate = uncertainty.discount_rate.sample(rng, n)
+
+        # (draw x year) discount factors; discounted replacement CAPEX per MW
+        # of each technology up to each horizon (draw x tech x horizon)
+        discount = (1.0 + rate[:, None]) ** -(year + 1.0)
+        due = (year > 0) & (lifetime[:, :, None] > 0) & (year % np.maximum(lifetime, 1)[:, :, None] == 0)
+        replacement_pv = np.cumsum(capex[:, :, None] * due * discount[:, None, :], axis=2)[:, :, horizons - 1]
+
+        initial = capacity @ capex.T                                    # (scenario x draw)
+        annual = operating_cost[:, None] + capacity @ (capex * opex).T  # (scenario x draw)
+        annuity_pv = np.cumsum(discount, axis=1)[:, horizons - 1]       # (draw x horizon)
+        cost_pv = (
+            initial[:, :, None]
+            + annual[:, :, None] * annuity_pv[None]
+            + np.einsum("st,nth->snh", capacity, replacement_pv)
+        )                                                               # (scenario x draw x horizon)
+        npv = -cost_pv
+
+        sketch.update(npv.transpose(0, 2, 1).reshape(n_scenarios * len(horizons), n))
+        npv_sum += npv.sum(axis=1)
+        if with_loss:
+            price = uncertainty.price.sample(rng, n)
+            revenue_pv = energy[:, None, None] * (price[:, None] * annuity_pv)[None]
+            producer_cost_pv = cost_pv + (energy_cost - operating_cost)[:, None, None] * annuity_pv[None]
+            losses += (revenue_pv < producer_cost_pv).sum(axis=1)
+        done += n
+
+    quantiles = sketch.quantiles(quantile_levels).reshape(n_scenarios, len(horizons), len(quantile_levels))
+    return RiskResults(
+        horizons=horizons,
+        quantile_levels=np.asarray(quantile_levels, dtype=float),
+        npv_quantiles=quantiles,
+        npv_mean=npv_sum / draws,
+        loss_probability=losses / draws if with_loss else np.full((n_scenarios, len(horizons)), np.nan),
+        draws=draws
+    )
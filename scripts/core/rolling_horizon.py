@@ -0,0 +1,137 @@
+"""Rolling-horizon solution of long DCOPF horizons"""
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Iterable, Optional, Union
+
+import numpy as np
+
+from .dcopf_model import DCOPFModel
+from .lp_builder import STORAGE_CYCLING_COST
+from .model_data import DCOPFData, slice_hours
+from .ptdf import recover_flows_and_angles
+from .results import build_result_frames, resolve_outputs
+from .solvers import SolverOptions
+from .tracing import INFO, log
+
+# Arrays stitched hour by hour from the committed part of each window
+_HOURLY = ('gen', 'charge', 'discharge', 'flow', 'theta')
+
+
+@dataclass
+class RollingHorizonReport:
+    """Window layout and cost of a rolling-horizon solve"""
+    window_hours: int
+    lookahead_hours: int
+    n_windows: int
+    cost: float
+    monolithic_cost: Optional[float] = None
+
+    @property
+    def cost_gap(self) -> Optional[float]:
+        """Relative cost increase over the monolithic solve, when that was run"""
+        if self.monolithic_cost is None or self.monolithic_cost == 0:
+            return None
+        return (self.cost - self.monolithic_cost) / abs(self.monolithic_cost)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'window_hours': self.window_hours,
+            'lookahead_hours': self.lookahead_hours,
+            'n_windows': self.n_windows,
+            'cost': self.cost,
+            'monolithic_cost': self.monolithic_cost,
+            'cost_gap': self.cost_gap
+        }
+
+
+def dispatch_cost(data: DCOPFData, solution: Dict[str, np.ndarray]) -> float:
+    """Objective value of a dispatch: generation cost plus the storage cycling cost"""
+    return float(
+        (data.gen_cost * solution['gen']).sum()
+        + STORAGE_CYCLING_COST * (solution['charge'].sum() + solution['discharge'].sum())
+    )
+
+
+def solve_rolling_horizon(
+    data: DCOPFData,
+    window_hours: int = 168,
+    lookahead_hours: int = 24,
+    formulation: str = "angle",
+    solver: Union[SolverOptions, str, None] = None,
+    lazy_flow_limits: bool = False,
+    compare_monolithic: bool = False,
+    outputs: Optional[Iterable[str]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Solve the horizon of data as consecutive windows of window_hours, each
+    extended by lookahead_hours so that storage sees what comes next. Only
+    the first window_hours of every window are kept; the state of charge at
+    their end becomes einitial of the next window. Every window must end at
+    the horizon's final SoC target, which the look-ahead makes less binding.
+
+    Windows of equal length share one DCOPFModel that is updated in place.
+    Returns the dcopf result dictionary for the whole horizon, with a
+    'rolling_horizon' entry (RollingHorizonReport.to_dict()), or None if a
+    window is not optimal. compare_monolithic also solves the full horizon
+    as one LP to report the cost gap. outputs selects the result frames as
+    in DCOPFModel.solve(); flows and angles not asked for are not stitched.
+    """
+    if window_hours < 1 or lookahead_hours < 0:
+        raise ValueError("window_hours must be positive and lookahead_hours non-negative")
+    outputs = resolve_outputs(outputs)
+    hourly = tuple(
+        name for name in _HOURLY
+        if (name != 'flow' or 'flows' in outputs) and (name != 'theta' or 'angles' in outputs)
+    )
+
+    T = data.n_hours
+    starts = range(0, T, window_hours)
+    soc = data.storage_einitial
+    stitched = {name: [] for name in hourly + ('soc',)}
+    model = None
+
+    for i, start in enumerate(starts):
+        stop = min(start + window_hours + lookahead_hours, T)
+        commit = min(window_hours, T - start)
+        window = replace(slice_hours(data, start, stop), storage_einitial=soc, storage_efinal=data.final_soc)
+
+        if model is None or model.data.n_hours != window.n_hours:
+            model = DCOPFModel(window, formulation, solver, lazy_flow_limits)
+        else:
+            model.set_demand(window.demand)
+            model.set_gen_bounds(window.gen_pmin, window.gen_pmax)
+            model.set_gencost(window.gen_cost)
+            model.set_einitial(soc)
+            model.data = replace(model.data, times=window.times)
+
+        lp_solution, _ = model.solve_lp()
+        if not lp_solution.optimal:
+            log(f"[DCOPF] Rolling horizon: window {i + 1}/{len(starts)} returned "
+                f"'{lp_solution.status}' => returning None.", INFO)
+            return None
+
+        solution = model.lp.unpack(lp_solution.x)
+        if formulation == "ptdf":
+            recover_flows_and_angles(model.data, solution, 'flows' in outputs, 'angles' in outputs)
+        for name in hourly:
+            stitched[name].append(solution[name][:, :commit])
+        stitched['soc'].append(solution['soc'][:, :commit])
+        soc = solution['soc'][:, commit]
+        log(f"[DCOPF] Rolling horizon: window {i + 1}/{len(starts)}, hours {start}-{stop - 1}, "
+            f"kept {commit}")
+
+    solution = {name: np.hstack(parts) for name, parts in stitched.items()}
+    solution['soc'] = np.hstack([solution['soc'], soc[:, None]])
+    solution['cost'] = dispatch_cost(data, solution)
+    solution['status'] = "Optimal"
+
+    report = RollingHorizonReport(window_hours, lookahead_hours, len(starts), solution['cost'])
+    if compare_monolithic:
+        monolithic, _ = DCOPFModel(data, formulation, solver, lazy_flow_limits).solve_lp()
+        if monolithic.optimal:
+            report.monolithic_cost = monolithic.objective
+            log(f"[DCOPF] Rolling horizon cost {report.cost:.4f} vs monolithic "
+                f"{report.monolithic_cost:.4f} (gap {report.cost_gap:.4%})")
+
+    results = build_result_frames(data, solution, outputs)
+    results['rolling_horizon'] = report.to_dict()
+    return results
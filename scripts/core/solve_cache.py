@@ -0,0 +1,129 @@
+"""Memoization of season solves within a run and, optionally, across runs"""
+import dataclasses
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+# Bump when the meaning of a cached result changes (formulation, metrics, ...)
+CACHE_VERSION = 2
+
+
+def fingerprint(*parts: Any) -> str:
+    """
+    Canonical hash of solve inputs. DataFrames are hashed by content and
+    column names (row order matters, index does not), arrays by dtype,
+    shape and bytes, dataclasses by their fields, anything else by repr.
+    """
+    h = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+    for part in parts:
+        if isinstance(part, pd.DataFrame):
+            h.update(repr(list(part.columns)).encode())
+            h.update(pd.util.hash_pandas_object(part, index=False).to_numpy().tobytes())
+        elif isinstance(part, np.ndarray):
+            h.update(f"{part.dtype}{part.shape}".encode())
+            h.update(np.ascontiguousarray(part).tobytes())
+        elif dataclasses.is_dataclass(part):
+            h.update(repr(dataclasses.asdict(part)).encode())
+        else:
+            h.update(repr(part).encode())
+        h.update(b"|")
+    return h.hexdigest()
+
+
+class SolveCache:
+    """
+    Results keyed by fingerprint. Lookups hit the in-memory dict first;
+    with a cache_dir, results are also pickled to disk and shared between
+    runs. The disk store is evicted least-recently-used first (file mtime
+    is bumped on every hit) once it grows beyond max_bytes.
+
+    hits and misses count get() lookups; `key in cache` checks without
+    counting. Results solved ahead of their lookup are put with miss=True:
+    they count as the miss right away, and their first get() as no hit.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = 512 * 1024 ** 2):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._unread = set()  # keys put with miss=True and not looked up since
+        self.hits = 0
+        self.misses = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def get(self, key: str) -> Optional[Any]:
+        if key in self._memory:
+            if key in self._unread:
+                self._unread.discard(key)
+            else:
+                self.hits += 1
+            self._memory.move_to_end(key)
+            return self._memory[key]
+
+        if self.cache_dir:
+            path = self._path(key)
+            try:
+                with open(path, 'rb') as f:
+                    value = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                value = None
+            if value is not None:
+                os.utime(path)  # mark as recently used
+                self._memory[key] = value
+                self.hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._memory or bool(self.cache_dir) and os.path.exists(self._path(key))
+
+    def put(self, key: str, value: Any, miss: bool = False) -> None:
+        self._memory[key] = value
+        if miss:
+            self.misses += 1
+            self._unread.add(key)
+        if not self.cache_dir:
+            return
+
+        tmp_path = self._path(key) + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self._path(key))
+        self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used files until the store fits in max_bytes"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".pkl"):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.cache_dir, name))
+            total -= size
+
+    def clear(self) -> None:
+        self._memory.clear()
+        self._unread.clear()
+        if self.cache_dir:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".pkl"):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+    def __len__(self) -> int:
+        return len(self._memory)
@@ -0,0 +1,374 @@
+"""
+Pluggable LP solver backends for the matrix-form DCOPF.
+
+Every backend takes an LPMatrices instance and returns an LPSolution, so
+the model is built once and handed to whichever solver suits the problem:
+
+    highs   - HiGHS through scipy.optimize.linprog, fully in memory
+    highspy - HiGHS through its own Python bindings (optional install),
+              in memory, with thread control and warm-started re-solves
+    cbc     - CBC through PuLP (subprocess + MPS/solution files)
+    cplex   - CPLEX through PuLP's python API binding, when installed
+    gurobi  - Gurobi through PuLP's gurobipy binding, when installed
+    auto    - the fastest in-memory backend that is installed
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from .lp_builder import LPMatrices
+
+
+@dataclass
+class SolverOptions:
+    """Backend selection and the options every backend understands"""
+    backend: str = "cbc"
+    threads: Optional[int] = None       # None lets the solver decide
+    time_limit: Optional[float] = None  # seconds
+    tolerance: Optional[float] = None   # primal/dual feasibility tolerance
+    msg: bool = False                   # solver log on stdout
+
+
+@dataclass
+class LPSolution:
+    x: Optional[np.ndarray]
+    objective: float
+    status: str  # PuLP-style status string: 'Optimal', 'Infeasible', ...
+    backend: str = ""
+    # Change of the objective per unit increase of each b_eq / b_ub entry
+    # (inequality duals are <= 0); None when the backend reports no duals
+    eq_duals: Optional[np.ndarray] = None
+    ub_duals: Optional[np.ndarray] = None
+
+    @property
+    def optimal(self) -> bool:
+        return self.status == "Optimal"
+
+
+class SolverBackend:
+    """Base class: solve an LPMatrices instance with one specific solver"""
+    name = ""
+    # Backends that can keep a model alive between solves implement open(),
+    # returning a session with update(lp) and solve()
+    supports_warm_start = False
+
+    def is_available(self) -> bool:
+        return True
+
+    def solve(self, lp: LPMatrices, options: SolverOptions) -> LPSolution:
+        raise NotImplementedError
+
+
+class HighsBackend(SolverBackend):
+    """HiGHS via scipy.optimize.linprog; scipy does not expose a thread count"""
+    name = "highs"
+
+    # linprog status code -> PuLP-style status
+    STATUS = {0: "Optimal", 1: "Not Solved", 2: "Infeasible", 3: "Unbounded", 4: "Undefined"}
+
+    def is_available(self) -> bool:
+        try:
+            import scipy.optimize  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def solve(self, lp: LPMatrices, options: SolverOptions) -> LPSolution:
+        from scipy.optimize import linprog
+
+        highs_options = {'disp': options.msg}
+        if options.time_limit is not None:
+            highs_options['time_limit'] = options.time_limit
+        if options.tolerance is not None:
+            highs_options['primal_feasibility_tolerance'] = options.tolerance
+            highs_options['dual_feasibility_tolerance'] = options.tolerance
+
+        res = linprog(
+            lp.c, A_ub=lp.A_ub, b_ub=lp.b_ub, A_eq=lp.A_eq, b_eq=lp.b_eq,
+            bounds=lp.bounds, method="highs", options=highs_options
+        )
+        status = self.STATUS.get(res.status, "Undefined")
+        optimal = res.status == 0
+        return LPSolution(
+            x=res.x if optimal else None,
+            objective=res.fun if optimal else float('inf'),
+            status=status,
+            backend=self.name,
+            eq_duals=res.eqlin.marginals if optimal else None,
+            ub_duals=res.ineqlin.marginals if optimal else None
+        )
+
+
+class HighspyBackend(SolverBackend):
+    """HiGHS via the highspy bindings: in memory, with thread control and warm starts"""
+    name = "highspy"
+    supports_warm_start = True
+
+    def is_available(self) -> bool:
+        try:
+            import highspy  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def solve(self, lp: LPMatrices, options: SolverOptions) -> LPSolution:
+        return self.open(lp, options).solve()
+
+    def open(self, lp: LPMatrices, options: SolverOptions) -> "HighsSession":
+        return HighsSession(lp, options)
+
+
+class HighsSession:
+    """
+    A live highspy model. update() pushes changed costs, bounds and
+    right-hand sides in place, so the next solve() starts from the basis
+    of the previous one instead of from scratch.
+    """
+
+    def __init__(self, lp: LPMatrices, options: SolverOptions):
+        import highspy
+        import scipy.sparse as sp
+
+        self._highspy = highspy
+        A = sp.vstack([lp.A_eq, lp.A_ub], format='csr')
+        self.n_eq = lp.A_eq.shape[0]
+        self.c, self.col_lower, self.col_upper, self.row_lower, self.row_upper = self._vectors(lp)
+
+        model = highspy.HighsLp()
+        model.num_col_ = lp.n_cols
+        model.num_row_ = A.shape[0]
+        model.col_cost_ = self.c
+        model.col_lower_ = self.col_lower
+        model.col_upper_ = self.col_upper
+        model.row_lower_ = self.row_lower
+        model.row_upper_ = self.row_upper
+        model.a_matrix_.format_ = highspy.MatrixFormat.kRowwise
+        model.a_matrix_.start_ = A.indptr
+        model.a_matrix_.index_ = A.indices
+        model.a_matrix_.value_ = A.data
+
+        h = highspy.Highs()
+        h.setOptionValue('output_flag', options.msg)
+        if options.threads is not None:
+            h.setOptionValue('threads', int(options.threads))
+        if options.time_limit is not None:
+            h.setOptionValue('time_limit', float(options.time_limit))
+        if options.tolerance is not None:
+            h.setOptionValue('primal_feasibility_tolerance', float(options.tolerance))
+            h.setOptionValue('dual_feasibility_tolerance', float(options.tolerance))
+        h.passModel(model)
+        self.highs = h
+
+    def _vectors(self, lp: LPMatrices):
+        """Costs, column bounds and row bounds (equality rows first) in HiGHS form"""
+        inf = self._highspy.kHighsInf
+        return (
+            lp.c.copy(),
+            np.where(np.isinf(lp.bounds[:, 0]), -inf, lp.bounds[:, 0]),
+            np.where(np.isinf(lp.bounds[:, 1]), inf, lp.bounds[:, 1]),
+            np.concatenate([lp.b_eq, np.full(len(lp.b_ub), -inf)]),
+            np.concatenate([lp.b_eq, lp.b_ub]),
+        )
+
+    def update(self, lp: LPMatrices) -> None:
+        """Push the entries of c, bounds, b_eq and b_ub that changed since the last solve"""
+        c, col_lower, col_upper, row_lower, row_upper = self._vectors(lp)
+
+        changed = np.flatnonzero(c != self.c)
+        if len(changed):
+            self.highs.changeColsCost(len(changed), changed.astype(np.int32), c[changed])
+        changed = np.flatnonzero((col_lower != self.col_lower) | (col_upper != self.col_upper))
+        if len(changed):
+            self.highs.changeColsBounds(len(changed), changed.astype(np.int32), col_lower[changed], col_upper[changed])
+        changed = np.flatnonzero((row_lower != self.row_lower) | (row_upper != self.row_upper))
+        if len(changed):
+            self.highs.changeRowsBounds(len(changed), changed.astype(np.int32), row_lower[changed], row_upper[changed])
+
+        self.c, self.col_lower, self.col_upper, self.row_lower, self.row_upper = c, col_lower, col_upper, row_lower, row_upper
+
+    def solve(self) -> LPSolution:
+        highspy = self._highspy
+        self.highs.run()
+
+        status = self.highs.getModelStatus()
+        if status == highspy.HighsModelStatus.kOptimal:
+            solution = self.highs.getSolution()
+            row_dual = np.asarray(solution.row_dual)
+            return LPSolution(
+                x=np.asarray(solution.col_value),
+                objective=self.highs.getInfo().objective_function_value,
+                status="Optimal",
+                backend=HighspyBackend.name,
+                eq_duals=row_dual[:self.n_eq],
+                ub_duals=row_dual[self.n_eq:]
+            )
+        status_str = {
+            highspy.HighsModelStatus.kInfeasible: "Infeasible",
+            highspy.HighsModelStatus.kUnbounded: "Unbounded",
+            highspy.HighsModelStatus.kTimeLimit: "Not Solved",
+        }.get(status, "Undefined")
+        return LPSolution(x=None, objective=float('inf'), status=status_str, backend=HighspyBackend.name)
+
+
+class PulpBackend(SolverBackend):
+    """
+    Solve through a PuLP solver class. The matrices are turned into a PuLP
+    problem with compact column names x0, x1, ... and row names r0, r1, ...
+    """
+    pulp_solver = ""
+
+    def is_available(self) -> bool:
+        try:
+            import pulp
+        except ImportError:
+            return False
+        return self.pulp_solver in pulp.listSolvers(onlyAvailable=True)
+
+    def make_solver(self, options: SolverOptions):
+        raise NotImplementedError
+
+    def to_pulp(self, lp: LPMatrices):
+        import pulp
+
+        prob = pulp.LpProblem("DCOPF", pulp.LpMinimize)
+        lower = [None if np.isinf(v) else float(v) for v in lp.bounds[:, 0]]
+        upper = [None if np.isinf(v) else float(v) for v in lp.bounds[:, 1]]
+        x = [
+            pulp.LpVariable(name, lowBound=lo, upBound=up)
+            for name, lo, up in zip(lp.column_names(), lower, upper)
+        ]
+
+        nz = np.flatnonzero(lp.c)
+        prob += pulp.LpAffineExpression([(x[j], float(lp.c[j])) for j in nz])
+
+        row = 0
+        for A, b, sense in ((lp.A_eq, lp.b_eq, pulp.LpConstraintEQ), (lp.A_ub, lp.b_ub, pulp.LpConstraintLE)):
+            for i in range(A.shape[0]):
+                cols = A.indices[A.indptr[i]:A.indptr[i + 1]]
+                vals = A.data[A.indptr[i]:A.indptr[i + 1]]
+                expr = pulp.LpAffineExpression([(x[j], float(v)) for j, v in zip(cols, vals)])
+                prob += pulp.LpConstraint(expr, sense=sense, rhs=float(b[i]), name=f"r{row}")
+                row += 1
+        return prob, x
+
+    def solve(self, lp: LPMatrices, options: SolverOptions) -> LPSolution:
+        import pulp
+
+        prob, x = self.to_pulp(lp)
+        prob.solve(self.make_solver(options))
+
+        status = pulp.LpStatus[prob.status]
+        if prob.status != 1:
+            return LPSolution(x=None, objective=float('inf'), status=status, backend=self.name)
+
+        values = np.array([v.varValue for v in x], dtype=float)
+        objective = pulp.value(prob.objective)
+        # Row duals, when the solver reports them
+        duals = [prob.constraints[f"r{i}"].pi for i in range(lp.n_rows)]
+        if any(pi is None for pi in duals):
+            duals = None
+        else:
+            duals = np.array(duals, dtype=float)
+        n_eq = lp.A_eq.shape[0]
+        return LPSolution(
+            x=np.nan_to_num(values),
+            objective=float('inf') if objective is None else objective,
+            status=status,
+            backend=self.name,
+            eq_duals=None if duals is None else duals[:n_eq],
+            ub_duals=None if duals is None else duals[n_eq:]
+        )
+
+
+class CbcBackend(PulpBackend):
+    name = "cbc"
+    pulp_solver = "PULP_CBC_CMD"
+
+    def make_solver(self, options: SolverOptions):
+        import pulp
+
+        cbc_options = []
+        if options.tolerance is not None:
+            cbc_options += [f"primalTolerance {options.tolerance}", f"dualTolerance {options.tolerance}"]
+        return pulp.PULP_CBC_CMD(
+            msg=options.msg,
+            timeLimit=options.time_limit,
+            threads=options.threads,
+            options=cbc_options
+        )
+
+
+class CplexBackend(PulpBackend):
+    name = "cplex"
+    pulp_solver = "CPLEX_PY"
+
+    def make_solver(self, options: SolverOptions):
+        import pulp
+
+        params = {}
+        if options.tolerance is not None:
+            params['simplex.tolerances.feasibility'] = options.tolerance
+            params['simplex.tolerances.optimality'] = options.tolerance
+        return pulp.CPLEX_PY(msg=options.msg, timeLimit=options.time_limit, threads=options.threads, **params)
+
+
+class GurobiBackend(PulpBackend):
+    name = "gurobi"
+    pulp_solver = "GUROBI"
+
+    def make_solver(self, options: SolverOptions):
+        import pulp
+
+        params = {}
+        if options.threads is not None:
+            params['Threads'] = options.threads
+        if options.tolerance is not None:
+            params['FeasibilityTol'] = options.tolerance
+            params['OptimalityTol'] = options.tolerance
+        return pulp.GUROBI(msg=options.msg, timeLimit=options.time_limit, **params)
+
+
+BACKENDS: Dict[str, SolverBackend] = {
+    backend.name: backend
+    for backend in (HighsBackend(), HighspyBackend(), CbcBackend(), CplexBackend(), GurobiBackend())
+}
+
+# Preference order for backend="auto": in-memory first, subprocess last
+AUTO_ORDER = ("highspy", "highs", "cplex", "gurobi", "cbc")
+
+
+def available_backends() -> List[str]:
+    """Names of the backends that can run in this environment"""
+    return [name for name, backend in BACKENDS.items() if backend.is_available()]
+
+
+def get_backend(name: str) -> SolverBackend:
+    """Look up a backend by name, resolving 'auto' to the fastest installed one"""
+    if name == "auto":
+        for candidate in AUTO_ORDER:
+            if BACKENDS[candidate].is_available():
+                return BACKENDS[candidate]
+        raise RuntimeError("No LP solver backend is available")
+
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown solver backend '{name}', expected one of {list(BACKENDS)} or 'auto'")
+    backend = BACKENDS[name]
+    if not backend.is_available():
+        raise RuntimeError(f"Solver backend '{name}' is not installed")
+    return backend
+
+
+def resolve_solver_options(solver: Union[SolverOptions, str, None]) -> SolverOptions:
+    """Accept a SolverOptions, a bare backend name, or None for the defaults (CBC)"""
+    if solver is None:
+        return SolverOptions()
+    if isinstance(solver, str):
+        return SolverOptions(backend=solver)
+    return solver
+
+
+def solve_lp(lp: LPMatrices, solver: Union[SolverOptions, str, None] = None) -> LPSolution:
+    """Solve a matrix-form LP with the configured backend"""
+    options = resolve_solver_options(solver)
+    return get_backend(options.backend).solve(lp, options)
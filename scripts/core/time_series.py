@@ -1,35 +1,44 @@
 """Core time series functionality for DCOPF model"""
+import numpy as np
 import pandas as pd
-from typing import Dict
+from typing import Dict, Union
 
-def build_gen_time_series(master_gen: pd.DataFrame, gen_positions: Dict[int, int], 
+from .gen_store import GenStore
+
+def build_unit_table(gen_positions: Dict[int, int], storage_positions: Dict[int, int]) -> pd.DataFrame:
+    """
+    One row per placed asset: its unit index, the asset id whose profile it
+    follows and its bus. Generators come first, then storage units, each in
+    position order; several units may share an id.
+    """
+    placed = list(gen_positions.items()) + list(storage_positions.items())
+    return pd.DataFrame({
+        'unit': np.arange(len(placed)),
+        'id': [asset_id for _, asset_id in placed],
+        'bus': [bus for bus, _ in placed]
+    })
+
+def build_season_profiles(master_gen: Union[pd.DataFrame, GenStore], units: pd.DataFrame, season: str) -> pd.DataFrame:
+    """The season's rows of master_gen (a frame or a GenStore) for the ids used by units, once per id"""
+    if isinstance(master_gen, GenStore):
+        return master_gen.season_frame(season, units['id'])
+    return master_gen[(master_gen['season'] == season) & master_gen['id'].isin(units['id'])]
+
+def build_gen_time_series(master_gen: Union[pd.DataFrame, GenStore], gen_positions: Dict[int, int],
                          storage_positions: Dict[int, int], season: str) -> pd.DataFrame:
-    """Build generation time series for a specific season"""
-    # Filter master_gen for the season
-    season_gen = master_gen[master_gen['season'] == season]
-    
-    # Create empty DataFrame
-    gen_ts = pd.DataFrame()
-    
-    # Add conventional generators
-    for bus, gen_id in gen_positions.items():
-        if gen_id in season_gen['id'].unique():
-            bus_gen = season_gen[season_gen['id'] == gen_id].copy()
-            bus_gen['bus'] = bus
-            gen_ts = pd.concat([gen_ts, bus_gen])
-    
-    # Add storage units
-    for bus, storage_id in storage_positions.items():
-        if storage_id in season_gen['id'].unique():
-            storage_data = season_gen[season_gen['id'] == storage_id].copy()
-            storage_data['bus'] = bus
-            gen_ts = pd.concat([gen_ts, storage_data])
-    
-    return gen_ts
+    """
+    Build generation time series for a specific season: the profile rows of
+    every placed asset, with its bus and unit index. Assets without data in
+    the season are left out. Prefer build_unit_table() and
+    build_season_profiles(), which do not copy a profile per unit.
+    """
+    units = build_unit_table(gen_positions, storage_positions)
+    season_gen = build_season_profiles(master_gen, units, season)
+    return units.merge(season_gen.drop(columns=['bus', 'unit'], errors='ignore'), on='id')
 
 def build_demand_time_series(master_load: pd.DataFrame, load_factor: float, season: str) -> pd.DataFrame:
     """Build demand time series for a specific season"""
     # Filter for season and apply load factor
     season_load = master_load[master_load['season'] == season].copy()
     season_load['pd'] = season_load['pd'] * load_factor
-    return season_load 
\ No newline at end of file
+    return season_load
@@ -0,0 +1,157 @@
+"""Verbosity-controlled logging and nestable timing spans for the pipeline"""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List
+
+# Verbosity levels: QUIET prints nothing, INFO progress and warnings,
+# DEBUG also the per-solve diagnostics of the hot path
+QUIET, INFO, DEBUG = 0, 1, 2
+_verbosity = INFO
+
+
+def set_verbosity(level: int) -> None:
+    global _verbosity
+    _verbosity = level
+
+
+def get_verbosity() -> int:
+    return _verbosity
+
+
+def log(message: Any = "", level: int = DEBUG) -> None:
+    """print() that only speaks at or above the given verbosity level"""
+    if level <= _verbosity:
+        print(message)
+
+
+@dataclass
+class Span:
+    """One timed block: wall-clock start (epoch seconds), wall and CPU time, nesting depth"""
+    name: str
+    start: float
+    depth: int
+    pid: int
+    tid: int
+    wall: float = 0.0
+    cpu: float = 0.0
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+    def set(self, **attrs) -> None:
+        """Attach attributes, e.g. LP rows/columns/nonzeros, to the span"""
+        self.attrs.update(attrs)
+
+
+class _NullSpan:
+    def set(self, **attrs) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """
+    Collects spans while enabled; when disabled, span() costs one attribute
+    check. Start times are wall-clock so that spans recorded in worker
+    processes line up with the parent's once merged with extend().
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.spans: List[Span] = []
+        self._depth = threading.local()
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        if not self.enabled:
+            yield _NULL_SPAN
+            return
+
+        depth = getattr(self._depth, 'value', 0)
+        span = Span(name, time.time(), depth, os.getpid(), threading.get_ident(), attrs=attrs)
+        self._depth.value = depth + 1
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield span
+        finally:
+            span.wall = time.perf_counter() - wall
+            span.cpu = time.process_time() - cpu
+            self._depth.value = depth
+            self.spans.append(span)
+
+    def drain(self) -> List[Span]:
+        """Hand over the recorded spans and forget them"""
+        spans, self.spans = self.spans, []
+        return spans
+
+    def extend(self, spans: List[Span]) -> None:
+        self.spans.extend(spans)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Count, total wall and total CPU seconds per span name"""
+        totals: Dict[str, Dict[str, float]] = {}
+        for span in self.spans:
+            entry = totals.setdefault(span.name, {'count': 0, 'wall_s': 0.0, 'cpu_s': 0.0})
+            entry['count'] += 1
+            entry['wall_s'] += span.wall
+            entry['cpu_s'] += span.cpu
+        return totals
+
+    def write(self, path: str, format: str = "json") -> None:
+        """
+        Write the spans to path, either as plain JSON ("json": spans plus a
+        per-name summary) or in the Chrome trace-event format ("chrome"),
+        which chrome://tracing and Perfetto display as a timeline.
+        """
+        spans = sorted(self.spans, key=lambda s: s.start)
+        if format == "chrome":
+            origin = spans[0].start if spans else 0.0
+            payload = {"traceEvents": [
+                {
+                    "name": s.name,
+                    "ph": "X",
+                    "ts": (s.start - origin) * 1e6,
+                    "dur": s.wall * 1e6,
+                    "pid": s.pid,
+                    "tid": s.tid,
+                    "args": {**s.attrs, "cpu_ms": s.cpu * 1e3},
+                }
+                for s in spans
+            ]}
+        elif format == "json":
+            payload = {"spans": [asdict(s) for s in spans], "summary": self.summary()}
+        else:
+            raise ValueError(f"Unknown trace format '{format}', expected 'json' or 'chrome'")
+
+        with open(path, 'w') as f:
+            json.dump(payload, f, indent=1, default=str)
+
+
+# Process-wide tracer used by the pipeline
+TRACER = Tracer()
+
+
+def span(name: str, **attrs):
+    """Time a block on the process-wide tracer: `with span("solve") as s: ...; s.set(rows=...)`"""
+    return TRACER.span(name, **attrs)
+
+
+def traced(name: str):
+    """Decorator form of span() for whole functions"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with TRACER.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def lp_stats(lp) -> Dict[str, int]:
+    """Size attributes of an LPMatrices for a span"""
+    return {'rows': lp.n_rows, 'cols': lp.n_cols, 'nnz': lp.nnz}
@@ -3,20 +3,25 @@
 """
 create_master_gen.py
 
-Reads wind-2023.csv and solar-2023.csv (each containing [time, value] for the full year),
-filters three defined seasonal windows, and concatenates them into a single CSV:
+Takes the hourly wind and solar profiles of the year from the raw data
+(core/raw_data.py, read once and cached), slices three defined seasonal
+windows (plus, optionally, the full year as season "full_year"), and
+concatenates them into a single CSV:
 master_gen.csv with columns:
     time, id, type, pmax, pmin, gencost, emax, einitial, eta, season
+It also writes the columnar copy read by main.py (see core/gen_store.py).
 """
 # %%
 import os
 import pandas as pd
 
-# Adjust paths as needed
-processed_dir = "/Users/rvieira/Documents/Master/vt1-energy-investment-model/data"
-wind_file     = os.path.join(processed_dir, "processed/wind-2023.csv")
-solar_file    = os.path.join(processed_dir, "processed/solar-2023.csv")
-output_file   = os.path.join(processed_dir, "working/master_gen.csv")
+from core.gen_store import write_gen_store
+from core.raw_data import load_raw_profiles, period_values
+
+# Path setup
+data_dir      = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+output_file   = os.path.join(data_dir, "working/master_gen.csv")
+store_dir     = os.path.join(data_dir, "working/master_gen")
 
 # Define seasonal date ranges
 season_info = {
@@ -34,6 +39,15 @@ season_info = {
     },
 }
 
+# Full chronological year, solved as one horizon by main.py's "full_year" mode
+include_full_year = True
+full_year_info = {
+    "full_year": {
+        "start": "2023-01-01 00:00:00",
+        "end":   "2023-12-31 23:00:00"
+    },
+}
+
 # Map each gen/storage type to a numeric ID:
 type_to_id = {
     "nuclear": 1,
@@ -44,24 +58,15 @@ type_to_id = {
     "battery2": 102
 }
 
-def load_and_filter(file_path, gen_type, season_name, start_str, end_str):
+def load_and_filter(profiles, gen_type, season_name, start_str, end_str):
     """
-    Reads the entire year from file_path ([time,value]),
-    filters by [start_str, end_str],
+    Slices the profile of gen_type from the year's profiles to
+    [start_str, end_str] as pmax,
     assigns columns including numeric 'id' from type_to_id,
     and returns a DataFrame with the standard columns.
     """
-    df = pd.read_csv(file_path, parse_dates=["time"])
-
-    # Filter by the specified date range
-    mask = (
-        (df["time"] >= pd.to_datetime(start_str)) &
-        (df["time"] <= pd.to_datetime(end_str))
-    )
-    df_season = df.loc[mask].copy()
-
-    # Rename 'value' -> 'pmax'
-    df_season.rename(columns={"value": "pmax"}, inplace=True)
+    pmax = period_values(profiles, gen_type, start_str, end_str)
+    df_season = pd.DataFrame({"time": pmax.index, "pmax": pmax.to_numpy()})
 
     # Add columns
     df_season["type"] = gen_type
@@ -89,7 +94,7 @@ def create_constant_gen(gen_type, season_name, start_str, end_str,
     Now also assigns 'id' from type_to_id dict.
     Columns: time, id, type, pmax, pmin, gencost, emax, einitial, eta, season.
     """
-    date_range = pd.date_range(start=start_str, end=end_str, freq='H')
+    date_range = pd.date_range(start=start_str, end=end_str, freq='h')
     df = pd.DataFrame({"time": date_range})
     
     df["type"]     = gen_type
@@ -108,14 +113,16 @@ def create_constant_gen(gen_type, season_name, start_str, end_str,
 def main():
     # Initialize an empty list to store partial DataFrames
     master_list = []
+    profiles = load_raw_profiles()
 
-    for season_name, rng in season_info.items():
+    periods = {**season_info, **full_year_info} if include_full_year else season_info
+    for season_name, rng in periods.items():
         start_time = rng["start"]
         end_time   = rng["end"]
 
         # 1) Load wind
         wind_df = load_and_filter(
-            file_path=wind_file,
+            profiles=profiles,
             gen_type="wind",
             season_name=season_name,
             start_str=start_time,
@@ -125,7 +132,7 @@ def main():
 
         # 2) Load solar
         solar_df = load_and_filter(
-            file_path=solar_file,
+            profiles=profiles,
             gen_type="solar",
             season_name=season_name,
             start_str=start_time,
@@ -202,6 +209,8 @@ def main():
     # Write final output
     master_gen.to_csv(output_file, index=False)
     print(f"Created {output_file} with {len(master_gen)} rows.")
+    write_gen_store(master_gen, store_dir)
+    print(f"Created columnar store {store_dir}")
 
 if __name__ == "__main__":
     main()
@@ -2,6 +2,10 @@ import pandas as pd
 import numpy as np
 import os
 
+from core.finance import TechnologyCosts, annuity, capacity_matrix, discount_factors, evaluate, replacement_costs
+from core.risk import Distribution, Uncertainty, monte_carlo
+from core.tracing import log
+
 def get_project_root():
     """Get the absolute path to the project root directory"""
     current_dir = os.path.dirname(os.path.abspath(__file__))  # scripts directory
@@ -38,154 +42,279 @@ class InvestmentAnalysis:
             'battery2': 0.04,
         }
 
-        # Add load factors for variants
-        self.load_factors = {
-            'low': 0.8,
-            'nominal': 1.0,
-            'high': 1.2
-        }
+        # Electricity price (CHF/MWh) earned by the invested generators, for
+        # the probability of loss: mode and range of the Swiss day-ahead
+        # baseload annual averages (EPEX SPOT CH), about 35 in 2020, 80 in
+        # 2024 and up to 120 outside the 2022 crisis year
+        self.electricity_price = 80.0
+        self.electricity_price_range = (35.0, 120.0)
+
+        # Monte Carlo risk analysis: factors on the CAPEX, O&M and lifetime
+        # above and standard deviation of the discount rate around its
+        # setting. mc_draws = 0 skips it.
+        self.capex_factor = Distribution('triangular', (0.85, 1.0, 1.3))
+        self.opex_factor = Distribution('triangular', (0.8, 1.0, 1.25))
+        self.lifetime_factor = Distribution('uniform', (0.85, 1.15))
+        self.discount_rate_std = 0.015
+        self.mc_draws = 100_000
+        self.mc_seed = 0
+
+    @property
+    def uncertainty(self) -> Uncertainty:
+        """The Monte Carlo inputs (core.risk.Uncertainty), centred on the settings above"""
+        low, high = self.electricity_price_range
+        return Uncertainty(
+            capex=self.capex_factor,
+            opex_percent=self.opex_factor,
+            lifetime=self.lifetime_factor,
+            discount_rate=Distribution('normal', (self.discount_rate, self.discount_rate_std)),
+            price=Distribution('triangular', (low, self.electricity_price, high))
+        )
+
+    def technology_costs(self) -> TechnologyCosts:
+        """The CAPEX, O&M and lifetime settings above as arrays for core.finance"""
+        return TechnologyCosts.from_dicts(self.capex, self.annual_opex_percent, self.lifetime)
 
     def calculate_initial_investment(self, installed_capacity):
         """Calculate initial investment based on installed capacities"""
-        investment = 0
-        for tech, capacity in installed_capacity.items():
-            # Convert technology name to match capex keys if needed
-            tech_key = tech.lower()  # Convert to lowercase to match capex keys
-            if tech_key in self.capex:
-                investment += capacity * self.capex[tech_key]
-                print(f"Adding investment for {tech_key}: {capacity} MW * ${self.capex[tech_key]}/MW = ${capacity * self.capex[tech_key]}")
-        
-        print(f"Total initial investment: ${investment}")
+        costs = self.technology_costs()
+        investment = float((capacity_matrix([self._normalized(installed_capacity)], costs.technologies) @ costs.capex)[0])
+        log(f"Total initial investment: ${investment}")
         return investment
 
     def calculate_annual_costs(self, operational_costs, installed_capacity):
         """Calculate total annual costs including O&M"""
-        annual_cost = operational_costs  # From scenario results
-        
-        # Add maintenance costs
-        for tech, capacity in installed_capacity.items():
-            if tech in self.annual_opex_percent:
-                maintenance = capacity * self.capex[tech] * self.annual_opex_percent[tech]
-                annual_cost += maintenance
-        
-        return annual_cost
+        costs = self.technology_costs()
+        capacity = capacity_matrix([self._normalized(installed_capacity)], costs.technologies)
+        return operational_costs + float((capacity @ (costs.capex * costs.opex_percent))[0])
 
     def calculate_npv(self, initial_investment, annual_costs, years, installed_capacity):
         """Calculate NPV for a specific time horizon"""
-        npv = -initial_investment
-        for year in range(years):
-            # Add replacement costs if asset lifetime is exceeded
-            replacement_cost = 0
-            if year > 0:  # Check for replacements
-                for tech, lifetime in self.lifetime.items():
-                    if year % lifetime == 0:  # Time to replace
-                        capacity = installed_capacity.get(tech, 0)
-                        replacement_cost += capacity * self.capex[tech]
-            
-            yearly_cashflow = -annual_costs - replacement_cost
-            npv += yearly_cashflow / (1 + self.discount_rate)**(year + 1)
-        return npv
+        costs = self.technology_costs()
+        capacity = capacity_matrix([self._normalized(installed_capacity)], costs.technologies)
+        flows = -annual_costs - replacement_costs(capacity, costs, years)[0]
+        return float(-initial_investment + flows @ discount_factors([self.discount_rate], years)[0])
 
     def calculate_annuity(self, npv, years):
         """Calculate annuity payment for a specific time horizon"""
-        if npv >= 0:  # For positive NPV, return 0 (no payments needed)
-            return 0
-        annuity_factor = (self.discount_rate * (1 + self.discount_rate)**years) / \
-                        ((1 + self.discount_rate)**years - 1)
-        return -npv * annuity_factor  # Negative NPV becomes positive annuity
+        return float(annuity(np.float64(npv), self.discount_rate, years))
+
+    @staticmethod
+    def _normalized(installed_capacity):
+        """Installed capacity keyed by the lower-case technology names of the settings"""
+        normalized = {}
+        for tech, capacity in installed_capacity.items():
+            normalized[tech.lower()] = normalized.get(tech.lower(), 0) + capacity
+        return normalized
+
+    @staticmethod
+    def _value(data, column):
+        """A result column of one variant row, 0 if the scenario has none"""
+        value = data.get(column)
+        return float(value) if value is not None and pd.notna(value) else 0.0
+
+    def evaluate_grid(self, installed_capacities, operating_costs, discount_rates=None,
+                      time_horizons=None, energy=None, revenue=None):
+        """
+        Financial metrics (core.finance.FinancialResults) of many asset sets
+        at once: one installed-capacity dict and yearly operating cost per
+        set, over grids of discount rates and horizons (default: the
+        settings above). energy (MWh/year) adds LCOE, revenue adds IRR.
+        """
+        costs = self.technology_costs()
+        return evaluate(
+            capacity_matrix([self._normalized(c) for c in installed_capacities], costs.technologies),
+            operating_costs,
+            costs,
+            [self.discount_rate] if discount_rates is None else discount_rates,
+            self.time_horizons if time_horizons is None else time_horizons,
+            energy=energy,
+            revenue=revenue
+        )
+
+    def monte_carlo(self, installed_capacities, operating_costs, energy=None, energy_costs=None, draws=None):
+        """
+        NPV quantiles and probability of loss (core.risk.RiskResults) of many
+        asset sets under self.uncertainty, all on the same draws. The loss
+        weighs the revenue of energy (MWh/year) against the asset costs and
+        energy_costs, the yearly operating cost of the units producing it.
+        """
+        costs = self.technology_costs()
+        return monte_carlo(
+            capacity_matrix([self._normalized(c) for c in installed_capacities], costs.technologies),
+            operating_costs,
+            costs,
+            self.uncertainty,
+            self.time_horizons,
+            draws=self.mc_draws if draws is None else draws,
+            energy=energy,
+            energy_cost=energy_costs,
+            seed=self.mc_seed
+        )
+
+    def analyze(self, scenario_results: pd.DataFrame, scenarios_params: pd.DataFrame,
+                variants=None, solve_missing=None, ratings=None) -> pd.DataFrame:
+        """
+        Investment metrics of every scenario and load variant, from the
+        operation actually solved for that variant. scenario_results holds
+        the solved variants (ScenarioVariant.to_dict() rows), scenarios_params
+        the scenario definitions with their asset positions.
+
+        Every variant in scenario_results is analyzed. variants (name ->
+        factor on the scenario's load_factor) adds the ones every scenario
+        must have; those not solved yet are passed as one list of
+        (scenario, variant, factor) to solve_missing, which returns their
+        rows. Without it they are left out.
+
+        ratings (technology -> rated MW of one placed unit) scale the energy
+        and dispatch cost of the invested generators, which the LCOE and the
+        probability of loss weigh against their costs, to the one MW per
+        unit the CAPEX is paid for.
+        Without them the solved totals are used as they are.
+        """
+        scenario_rows = {}  # scenario -> {variant: result row}
+        for row in scenario_results.to_dict('records'):
+            scenario_rows.setdefault(row['base_scenario'], {})[row['variant']] = row
+
+        missing = [
+            (scenario, variant, factor)
+            for scenario, rows in scenario_rows.items()
+            for variant, factor in (variants or {}).items()
+            if variant not in rows
+        ]
+        if missing:
+            if solve_missing is None:
+                log(f"No results for {len(missing)} requested variant(s), left out: {missing}")
+            else:
+                for row in solve_missing(missing):
+                    scenario_rows[row['base_scenario']][row['variant']] = row
 
-    def analyze_scenario(self, scenario_results_path, master_gen_path):
-        """Main analysis function"""
+        variants = []  # (scenario, variant, load factor, results, installed capacity)
+        energy, own_costs = [], []  # per variant: yearly MWh and dispatch cost of the invested generators
+        ratings = ratings or {}
+        for scenario, rows in scenario_rows.items():
+            log(f"\n{'='*50}")
+            log(f"Processing scenario: {scenario}")
+            
+            # Get scenario configuration
+            scenario_config = scenarios_params[scenarios_params['scenario_name'] == scenario].iloc[0]
+            gen_positions = eval(scenario_config['gen_positions'])
+            storage_positions = eval(scenario_config['storage_units'])
+            
+            # Count installed capacity
+            installed_capacity = {}
+            for _, gen_type in gen_positions.items():
+                tech_key = gen_type.lower()
+                installed_capacity[tech_key] = installed_capacity.get(tech_key, 0) + 1
+            
+            for _, storage_type in storage_positions.items():
+                installed_capacity[storage_type] = installed_capacity.get(storage_type, 0) + 1
+            
+            # Invested generating technologies; existing units (no CAPEX
+            # setting) and storage, which only shifts energy, add none
+            invested = sorted({gen_type.lower() for gen_type in gen_positions.values()} & self.capex.keys())
+
+            # Variants in load order, so that they read as a sensitivity curve
+            for variant, data in sorted(rows.items(), key=lambda item: float(item[1]['load_factor'])):
+                variants.append((scenario, variant, float(data['load_factor']), pd.Series(data), installed_capacity))
+                energy.append(sum(self._value(data, f'gen_{tech}') / ratings.get(tech, 1.0) for tech in invested))
+                own_costs.append(sum(self._value(data, f'gen_cost_{tech}') / ratings.get(tech, 1.0) for tech in invested))
+
+        if not variants:
+            return pd.DataFrame()
+
+        # All scenarios, variants and horizons in one pass
+        capacities = [installed for _, _, _, _, installed in variants]
+        annual_costs = np.array([float(data['annual_cost']) for _, _, _, data, _ in variants])
+        finance = self.evaluate_grid(capacities, annual_costs)
+
+        # LCOE of the invested assets: their costs over the energy of the
+        # invested generators only (NaN without any)
+        energy = np.array(energy)
+        lcoe = self.evaluate_grid(
+            capacities,
+            np.array(own_costs),
+            energy=np.where(energy > 0, energy, np.nan)
+        ).lcoe
+
+        # Monte Carlo NPV; a loss is a draw in which the invested generators'
+        # energy at the drawn price does not pay for the invested assets
+        risk = None
+        if self.mc_draws > 0:
+            risk = self.monte_carlo(
+                capacities,
+                annual_costs,
+                energy=energy,
+                energy_costs=np.array(own_costs)
+            )
+        
+        results_list = []
+        for i, (scenario, variant, load_factor, scenario_data, installed_capacity) in enumerate(variants):
+            log(f"\nProcessing variant: {variant} (load factor: {load_factor})")
+            
+            # NPV, annuity and LCOE for the different time horizons
+            npv_results = {f'npv_{years}y': finance.npv[i, 0, h] for h, years in enumerate(self.time_horizons)}
+            annuity_results = {f'annuity_{years}y': finance.annuity[i, 0, h] for h, years in enumerate(self.time_horizons)}
+            lcoe_results = {f'lcoe_{years}y': lcoe[i, 0, h] for h, years in enumerate(self.time_horizons)}
+
+            # Monte Carlo P10/P50/P90 NPV and probability of loss
+            risk_results = {}
+            if risk is not None:
+                for h, years in enumerate(self.time_horizons):
+                    for k, level in enumerate(risk.quantile_levels):
+                        risk_results[f'npv_p{round(level * 100)}_{years}y'] = risk.npv_quantiles[i, h, k]
+                    risk_results[f'loss_probability_{years}y'] = risk.loss_probability[i, h]
+            
+            # Generation of the variant's own solve
+            gen_results = {col: float(scenario_data[col]) for col in scenario_data.index if col.startswith('gen_')}
+            
+            # Compile results for this variant
+            variant_results = {
+                'scenario_id': f"{scenario}_{variant}",
+                'base_scenario': scenario,
+                'variant': variant,
+                'load_factor': load_factor,
+                'installed_capacity': str(installed_capacity),
+                'initial_investment': finance.initial_investment[i],
+                'annual_cost': annual_costs[i],
+                'annual_costs': finance.annual_cost[i],
+                **npv_results,
+                **annuity_results,
+                **lcoe_results,
+                **risk_results,
+                **gen_results,
+                'scenario_name': scenario
+            }
+            
+            results_list.append(variant_results)
+        
+        # Convert results to DataFrame
+        return pd.DataFrame(results_list)
+
+    def analyze_scenario(self, scenario_results_path, master_gen_path, output_path=None):
+        """
+        Main analysis function: analyze() on the variants in scenario_results_path
+        and data/working/scenarios_parameters.csv, with the unit ratings of
+        master_gen_path; the results are also written to output_path
+        (default data/results)
+        """
         try:
             # Get project root for path resolution
             project_root = get_project_root()
             
             # Resolve absolute paths
-            scenario_results_path = os.path.join(project_root, 'data', 'results', 'scenario_results.csv')
+            scenario_results_path = scenario_results_path or os.path.join(project_root, 'data', 'results', 'scenario_results.csv')
             working_dir = os.path.join(project_root, 'data', 'working')
             scenarios_params_path = os.path.join(working_dir, 'scenarios_parameters.csv')
             
             # Load data
             scenario_results = pd.read_csv(scenario_results_path)
             scenarios_params = pd.read_csv(scenarios_params_path)
-            
-            results_list = []  # Change to list to store multiple variants
-            for scenario in scenario_results['base_scenario'].unique():
-                print(f"\n{'='*50}")
-                print(f"Processing scenario: {scenario}")
-                
-                # Get scenario configuration
-                scenario_config = scenarios_params[scenarios_params['scenario_name'] == scenario].iloc[0]
-                gen_positions = eval(scenario_config['gen_positions'])
-                storage_positions = eval(scenario_config['storage_units'])
-                
-                # Count installed capacity
-                installed_capacity = {}
-                for _, gen_type in gen_positions.items():
-                    tech_key = gen_type.lower()
-                    installed_capacity[tech_key] = installed_capacity.get(tech_key, 0) + 1
-                
-                for _, storage_type in storage_positions.items():
-                    installed_capacity[storage_type] = installed_capacity.get(storage_type, 0) + 1
-                
-                # Calculate base values
-                initial_inv = self.calculate_initial_investment(installed_capacity)
-                
-                # Process each variant
-                for variant, load_factor in self.load_factors.items():
-                    scenario_id = f"{scenario}_{variant}"
-                    print(f"\nProcessing variant: {variant} (load factor: {load_factor})")
-                    
-                    # Get scenario data for the variant
-                    scenario_data = scenario_results[
-                        (scenario_results['base_scenario'] == scenario) & 
-                        (scenario_results['variant'] == 'nominal')
-                    ].iloc[0]
-                    
-                    # Scale costs based on load factor
-                    base_annual_cost = float(scenario_data['annual_cost'])
-                    scaled_annual_cost = base_annual_cost * load_factor
-                    annual_costs = self.calculate_annual_costs(scaled_annual_cost, installed_capacity)
-                    
-                    # Calculate NPV and annuity for different time horizons
-                    npv_results = {}
-                    annuity_results = {}
-                    for years in self.time_horizons:
-                        npv = self.calculate_npv(initial_inv, annual_costs, years, installed_capacity)
-                        annuity = self.calculate_annuity(npv, years)
-                        npv_results[f'npv_{years}y'] = npv
-                        annuity_results[f'annuity_{years}y'] = annuity
-                    
-                    # Scale generation values
-                    gen_results = {}
-                    for col in scenario_data.index:
-                        if col.startswith('gen_'):
-                            base_value = float(scenario_data[col])
-                            gen_results[col] = base_value * load_factor
-                    
-                    # Compile results for this variant
-                    variant_results = {
-                        'scenario_id': scenario_id,
-                        'base_scenario': scenario,
-                        'variant': variant,
-                        'load_factor': load_factor,
-                        'installed_capacity': str(installed_capacity),
-                        'initial_investment': initial_inv,
-                        'annual_cost': scaled_annual_cost,
-                        'annual_costs': annual_costs,
-                        **npv_results,
-                        **annuity_results,
-                        **gen_results,
-                        'scenario_name': scenario
-                    }
-                    
-                    results_list.append(variant_results)
-            
-            # Convert results to DataFrame
-            results_df = pd.DataFrame(results_list)
+            ratings = pd.read_csv(master_gen_path, usecols=['type', 'pmax']).groupby('type')['pmax'].max().to_dict()
+            results_df = self.analyze(scenario_results, scenarios_params, ratings=ratings)
             
             # Save results
-            output_path = os.path.join(project_root, 'data', 'results', 'scenario_results_with_investment.csv')
+            output_path = output_path or os.path.join(project_root, 'data', 'results', 'scenario_results_with_investment.csv')
             results_df.to_csv(output_path, index=False)
             print(f"\nResults saved to {output_path}")
             
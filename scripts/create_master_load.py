@@ -7,25 +7,33 @@ create_master_load.py
 Creates master_load.csv with columns:
     time, bus, pd, season
 
-For each season (winter, summer, autumn_spring):
+The year's hourly load comes from the raw data (core/raw_data.py, read
+once and cached). For each season (winter, summer, autumn_spring and,
+optionally, full_year) every bus in load_buses takes the load a given
+number of days after the season range, time-shifted back onto it:
   - Bus 5 uses load data from the same week as the season range.
-  - Bus 6 uses load data from the *following* week, then time-shifts it 
-    so it aligns with the season’s date range.
+  - Bus 6 uses load data from the *following* week.
 
 Example:
   If 'winter' is 2023-01-08 -> 2023-01-14,
-    - bus 5 loads = 2023-01-08 -> 2023-01-14 (from load-2023.csv)
-    - bus 6 loads = 2023-01-15 -> 2023-01-21 (from load-2023.csv), 
+    - bus 5 loads = 2023-01-08 -> 2023-01-14
+    - bus 6 loads = 2023-01-15 -> 2023-01-21, 
       but time-shifted 7 days backward so final times still show 2023-01-08 -> 2023-01-14
+  Shifts past the end of the year wrap around to its beginning, so for
+  full_year bus 6 is the year's load rotated by one week.
 """
 
 import os
 import pandas as pd
 
+from core.raw_data import load_raw_profiles, period_values
+
 # Path setup
-processed_dir = "/Users/rvieira/Documents/Master/vt1-energy-investment-model/data"
-load_file     = os.path.join(processed_dir, "processed/load-2023.csv")
-output_file   = os.path.join(processed_dir, "working/master_load.csv")
+data_dir      = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+output_file   = os.path.join(data_dir, "working/master_load.csv")
+
+# Load bus -> days after the season range its load is taken from
+load_buses = {5: 0, 6: 7}
 
 # Define seasonal date ranges (same as in master_gen)
 season_info = {
@@ -43,70 +51,29 @@ season_info = {
     },
 }
 
-def load_and_filter(load_csv, start_str, end_str):
-    """
-    Loads the full-year load data [time, value] from load_csv,
-    filters it to [start_str, end_str].
-    Returns a DataFrame with columns [time, pd], sorted by time.
-    """
-    df = pd.read_csv(load_csv, parse_dates=["time"])
-    
-    mask = (
-        (df["time"] >= pd.to_datetime(start_str)) &
-        (df["time"] <= pd.to_datetime(end_str))
-    )
-    df_week = df.loc[mask].copy()
-    
-    # Rename 'value' -> 'pd' for clarity
-    df_week.rename(columns={"value": "pd"}, inplace=True)
-
-    # Sort by time
-    df_week.sort_values("time", inplace=True)
-    df_week.reset_index(drop=True, inplace=True)
-    
-    return df_week
-
-def shift_load_data(df, shift_days):
-    """
-    Shifts the 'time' column in df by 'shift_days' (can be positive or negative).
-    E.g., if shift_days = -7, every row's time moves 7 days earlier.
-    """
-    if shift_days != 0:
-        df["time"] = df["time"] + pd.Timedelta(days=shift_days)
-    return df
+# Full chronological year, solved as one horizon by main.py's "full_year" mode
+include_full_year = True
+full_year_info = {
+    "full_year": {
+        "start": "2023-01-01 00:00:00",
+        "end":   "2023-12-31 23:00:00"
+    },
+}
 
 def main():
     master_list = []
-
-    for season_name, rng in season_info.items():
-        start_time = pd.to_datetime(rng["start"])
-        end_time   = pd.to_datetime(rng["end"])
-
-        # 1) Bus 5 load => same time range as the season
-        bus5_df = load_and_filter(load_file, start_time, end_time)
-        # Add columns bus, season
-        bus5_df["bus"]    = 5
-        bus5_df["season"] = season_name
-
-        # 2) Bus 6 load => next week's data, then shift -7 days
-        # Next week means [end_time+1 hour, end_time+7 days], or simply
-        # [start_time+7 days, end_time+7 days], to keep it aligned hour-by-hour.
-        # Let's do [start_time + 7days, end_time + 7days].
-        next_week_start = start_time + pd.Timedelta(days=7)
-        next_week_end   = end_time   + pd.Timedelta(days=7)
-        bus6_df = load_and_filter(load_file, next_week_start, next_week_end)
-
-        # Shift back by 7 days, so its final time range matches [start_time, end_time].
-        bus6_df = shift_load_data(bus6_df, shift_days=-7)
-        bus6_df["bus"]    = 6
-        bus6_df["season"] = season_name
-
-        # Concatenate bus5, bus6 for this season
-        season_load_df = pd.concat([bus5_df, bus6_df], ignore_index=True)
-        # Reorder columns for clarity
-        season_load_df = season_load_df[["time", "bus", "pd", "season"]]
-
-        master_list.append(season_load_df)
+    profiles = load_raw_profiles()
+
+    periods = {**season_info, **full_year_info} if include_full_year else season_info
+    for season_name, rng in periods.items():
+        for bus, shift_days in load_buses.items():
+            load = period_values(profiles, "load", rng["start"], rng["end"], shift_hours=shift_days * 24)
+            master_list.append(pd.DataFrame({
+                "time": load.index,
+                "bus": bus,
+                "pd": load.to_numpy(),
+                "season": season_name
+            }))
     
     # Combine all seasons
     master_load = pd.concat(master_list, ignore_index=True)
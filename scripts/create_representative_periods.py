@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+"""
+create_representative_periods.py
+
+Picks representative periods of 2023 by clustering the hourly load, wind
+and solar profiles in data/raw (instead of the hand-picked weeks of
+create_master_gen.py/create_master_load.py), then:
+  - appends them to master_gen.csv and master_load.csv as seasons
+    rp01 .. rpK, replacing the rp seasons of any earlier run,
+  - writes their weights (number of periods each one stands for) to
+    representative_weights.csv,
+  - prints the reconstruction error for the chosen K and for a range of K,
+    so solve time (one LP per period) can be traded against accuracy.
+
+main.py solves them with simulation_mode = "clustered".
+"""
+
+import os
+import numpy as np
+import pandas as pd
+
+from core.clustering import select_representative_periods, reconstruction_error
+from core.raw_data import load_raw_profiles
+
+# Path setup
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+working_dir  = os.path.join(project_root, "data", "working")
+master_gen_file  = os.path.join(working_dir, "master_gen.csv")
+master_load_file = os.path.join(working_dir, "master_load.csv")
+weights_file     = os.path.join(working_dir, "representative_weights.csv")
+
+# Clustering setup
+n_representative = 4         # K, one LP per representative period
+period_hours     = 168       # 24 for days, 168 for weeks
+method           = "kmedoids"  # or "hierarchical"
+candidate_k      = range(2, 13)
+
+season_prefix = "rp"
+year = pd.date_range("2023-01-01 00:00:00", "2023-12-31 23:00:00", freq="h")
+
+def read_raw_profiles():
+    """Hourly wind, solar and load of the year as one frame indexed by time, in MW"""
+    profiles = load_raw_profiles().reindex(year)
+    if profiles.isna().any().any():
+        raise ValueError("The raw data does not cover the whole year")
+    return profiles[["load", "wind", "solar"]]
+
+def build_master_rows(profiles, periods, master_gen):
+    """master_gen and master_load rows of the representative periods"""
+    # Time-invariant assets keep the parameters they have in master_gen;
+    # wind and solar take their pmax from the raw profiles
+    templates = master_gen.drop_duplicates(subset=["id"]).set_index("id")
+    shifted_load = np.roll(profiles["load"].to_numpy(), -7 * 24)
+
+    gen_list, load_list = [], []
+    for k, medoid in enumerate(periods.medoids):
+        season = f"{season_prefix}{k + 1:02d}"
+        hours = slice(medoid * period_hours, (medoid + 1) * period_hours)
+        times = year[hours]
+
+        for gen_id, template in templates.iterrows():
+            df = pd.DataFrame({"time": times})
+            df["id"] = gen_id
+            for column in ["type", "pmax", "pmin", "gencost", "emax", "einitial", "eta"]:
+                df[column] = template[column]
+            if template["type"] in profiles.columns:
+                df["pmax"] = profiles[template["type"]].to_numpy()[hours]
+            df["season"] = season
+            gen_list.append(df)
+
+        # Bus 5 takes the period's load, bus 6 the load one week later (as in create_master_load.py)
+        for bus, values in ((5, profiles["load"].to_numpy()), (6, shifted_load)):
+            load_list.append(pd.DataFrame({"time": times, "bus": bus, "pd": values[hours], "season": season}))
+
+    gen_rows = pd.concat(gen_list, ignore_index=True)
+    gen_rows = gen_rows[["time", "id", "type", "pmax", "pmin", "gencost", "emax", "einitial", "eta", "season"]]
+    return gen_rows, pd.concat(load_list, ignore_index=True)
+
+def replace_rp_seasons(path, new_rows, sort_columns):
+    """Swap the rp seasons of a master file for new_rows, keeping every other season"""
+    master = pd.read_csv(path, parse_dates=["time"])
+    master = master[~master["season"].str.startswith(season_prefix)]
+    master = pd.concat([master, new_rows], ignore_index=True)
+    master.sort_values(sort_columns, inplace=True)
+    master.reset_index(drop=True, inplace=True)
+    master.to_csv(path, index=False)
+    print(f"Updated {path} with {len(new_rows)} representative-period rows.")
+
+def print_errors(errors):
+    for name, err in errors.items():
+        print(f"  {name:6s} NRMSE {err['nrmse']:7.2%}  energy {err['energy_error']:+7.2%}  "
+              f"duration curve NRMSE {err['duration_nrmse']:7.2%}")
+
+def main():
+    profiles = read_raw_profiles()
+    series = {name: profiles[name].to_numpy() for name in profiles.columns}
+
+    print(f"Reconstruction error by K ({method}, {period_hours} h periods):")
+    for k in candidate_k:
+        errors = reconstruction_error(series, select_representative_periods(series, k, period_hours, method))
+        mean_nrmse = np.mean([err['nrmse'] for err in errors.values()])
+        print(f"  K={k:2d}: mean NRMSE {mean_nrmse:7.2%}")
+
+    periods = select_representative_periods(series, n_representative, period_hours, method)
+    print(f"\nSelected K={periods.k} of {periods.n_periods} periods:")
+    for k, (medoid, weight) in enumerate(zip(periods.medoids, periods.weights)):
+        print(f"  {season_prefix}{k + 1:02d}: starts {year[medoid * period_hours]}, weight {weight}")
+    print_errors(reconstruction_error(series, periods))
+
+    master_gen = pd.read_csv(master_gen_file, parse_dates=["time"]).sort_values("time")
+    gen_rows, load_rows = build_master_rows(profiles, periods, master_gen)
+    replace_rp_seasons(master_gen_file, gen_rows, ["season", "time", "id"])
+    replace_rp_seasons(master_load_file, load_rows, ["season", "time", "bus"])
+
+    weights = pd.DataFrame({
+        "season": [f"{season_prefix}{k + 1:02d}" for k in range(periods.k)],
+        "weight": periods.weights,
+        "start": [year[m * period_hours] for m in periods.medoids],
+        "period_hours": period_hours,
+    })
+    weights.to_csv(weights_file, index=False)
+    print(f"Created {weights_file} with {len(weights)} representative periods.")
+
+if __name__ == "__main__":
+    main()
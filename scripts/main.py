@@ -5,6 +5,7 @@ multi_scenario.py
 
 - Loads scenarios from scenarios_parameters.csv
 - Runs DCOPF for each scenario across winter, summer, autumn_spring
+  (or, in full-year mode, over all 8760 hours with chronological storage)
 - Saves results and plots in /data/results/<scenario_name>/
 - Summarizes costs in scenario_results.csv
 """
@@ -18,19 +19,26 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import pandas as pd
 import numpy as np
 import ast
+import json
 
-from dcopf import dcopf
-from dotenv import load_dotenv
-from scenario_critic import ScenarioCritic
+# Only the solve path is imported here: the plotting (matplotlib, seaborn,
+# networkx) and LLM report (openai) stacks are imported by the stages that
+# use them, so that batch solves and cold-started workers do not pay for them.
+# benchmarks/import_time.py measures what importing this module costs.
+from core.dcopf_model import DCOPFModel
 from update_readme import update_readme_with_scenarios, create_readme_template, get_project_root
 from create_master_invest import InvestmentAnalysis
-from visualization.summary_plots import create_annual_summary_plots, create_scenario_comparison_plot
-from visualization.scenario_plots import plot_scenario_results
-from core.time_series import build_gen_time_series, build_demand_time_series
+from core.time_series import build_unit_table, build_season_profiles, build_demand_time_series
 from core.helpers import ask_user_confirmation
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
-from visualization.report_plots import create_scenario_plots
+from core.solvers import SolverOptions
+from core.results import resolve_outputs
+from core.gen_store import load_gen_store
+from core.metrics import TypeMetrics, dcopf_type_metrics, weighted_sum
+from core.solve_cache import SolveCache, fingerprint
+from core.tracing import TRACER, INFO, DEBUG, log, set_verbosity, get_verbosity, span, traced
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import asdict, dataclass, field
 
 # Paths
 project_root = get_project_root()
@@ -40,8 +48,11 @@ results_root = os.path.join(project_root, "data", "results")
 bus_file = os.path.join(working_dir, "bus.csv")
 branch_file = os.path.join(working_dir, "branch.csv")
 master_gen_file = os.path.join(working_dir, "master_gen.csv")
+# Columnar copy of master_gen.csv (core/gen_store.py), rebuilt whenever the CSV is newer
+master_gen_store = os.path.join(working_dir, "master_gen")
 master_load_file = os.path.join(working_dir, "master_load.csv")
 scenarios_params_file = os.path.join(working_dir, "scenarios_parameters.csv")
+representative_weights_file = os.path.join(working_dir, "representative_weights.csv")
 
 # Season weights
 season_weights = {
@@ -50,14 +61,111 @@ season_weights = {
     "autumn_spring": 26
 }
 
-# Load environment variables
-load_dotenv('../.env.local')
-api_key = os.getenv('OPENAPI_KEY')
-if not api_key:
-    raise ValueError("OpenAI API key not found in .env.local file")
+# "representative": the three weeks above, scaled by season_weights
+# "full_year": one chronological 8760-hour solve of season "full_year" in the
+#              master files (see create_master_gen.py/create_master_load.py)
+# "clustered": the representative periods picked by create_representative_periods.py,
+#              weighted as written to representative_weights.csv
+simulation_mode = "representative"
+full_year_weights = {"full_year": 1}
 
-# Initialize critic
-critic = ScenarioCritic(api_key)
+# LP solver backend and options used for every season solve; CBC as in
+# the original pipeline, "highs"/"highspy" solve in memory and are faster
+solver_options = SolverOptions(backend="cbc")
+
+# DCOPF formulation: "angle" (THETA/FLOW variables, as originally) or
+# "ptdf" (flows from PTDF, a smaller LP)
+dcopf_formulation = "angle"
+
+# Add line limits only where the unconstrained flows violate them; off
+# by default, so every limit is part of the LP as originally
+lazy_flow_limits = False
+
+# Result frames extracted per season solve; the metrics only use dispatch
+# and storage, so angles and flows are not built. Adding "sensitivities"
+# (or passing it to --outputs) extracts the solve's duals and reports
+# cost_load_sensitivity, the cost change per unit of load scaling
+season_outputs = ("generation", "storage")
+
+# Load variants of the sensitivity analysis: name -> factor on the scenario's load_factor
+sensitivity_variants = {"nominal": 1.0, "high": 1.2, "low": 0.8}
+
+def load_factor_grid(low: float, high: float, step: float) -> Dict[str, float]:
+    """
+    Load variants low, low + step, ..., high (inclusive) as name -> factor;
+    factor 1 is the 'nominal' variant, the others are named load_<factor>
+    """
+    factors = np.round(np.arange(low, high + step / 2, step), 6)
+    return {
+        "nominal" if np.isclose(factor, 1.0) else f"load_{factor:g}": float(factor)
+        for factor in factors
+    }
+
+# Season results are memoized within a run; with persist_solve_cache they are
+# also kept on disk so that re-runs with unchanged inputs skip the solves
+persist_solve_cache = False
+solve_cache_dir = os.path.join(project_root, "data", "cache", "solves")
+solve_cache_max_mb = 512
+
+# Worker processes for the season solves; 1 solves everything in this process
+max_workers = os.cpu_count() or 1
+
+# Console output: QUIET, INFO (progress, default) or DEBUG (per-solve diagnostics)
+verbosity = INFO
+
+# Timed spans of every pipeline phase are written here when set; trace_format
+# "json" (spans and per-phase totals) or "chrome" (chrome://tracing, Perfetto)
+trace_file = None
+trace_format = "json"
+
+@dataclass
+class RunConfig:
+    """
+    Settings of one pipeline run. The defaults are the module settings
+    above; the batch CLI (cli.py) builds one from its flags and config file.
+    """
+    simulation_mode: str = simulation_mode
+    seasons: Optional[List[str]] = None              # subset of the mode's seasons; None solves all
+    scenarios: Optional[List[str]] = None            # scenario names to solve; None solves all
+    variants: Dict[str, float] = field(default_factory=lambda: {"nominal": 1.0})
+    solver_options: SolverOptions = field(default_factory=lambda: solver_options)
+    formulation: str = dcopf_formulation
+    lazy_flow_limits: bool = lazy_flow_limits
+    save_frames: Tuple[str, ...] = ()                # result frames written per season, e.g. ("flows",)
+    persist_solve_cache: bool = persist_solve_cache
+    max_workers: int = max_workers
+    results_root: str = results_root
+
+    def solve_settings(self) -> Dict[str, Any]:
+        """The settings the solved results depend on, as JSON values (solve_config.json)"""
+        return {
+            "simulation_mode": self.simulation_mode,
+            "seasons": None if self.seasons is None else list(self.seasons),
+            "solver_options": asdict(self.solver_options),
+            "formulation": self.formulation,
+            "lazy_flow_limits": self.lazy_flow_limits,
+            "save_frames": list(self.save_frames),
+        }
+
+# Environment file with the OPENAPI_KEY of the report critic
+env_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".env.local")
+
+# Created by get_critic() when the first report is generated
+_critic = None
+
+def get_critic():
+    """The ScenarioCritic of the report stage; reads the API key and imports openai on first use"""
+    global _critic
+    if _critic is None:
+        from dotenv import load_dotenv
+        from scenario_critic import ScenarioCritic
+
+        load_dotenv(env_file)
+        api_key = os.getenv('OPENAPI_KEY')
+        if not api_key:
+            raise ValueError(f"OpenAI API key not found in {env_file}")
+        _critic = ScenarioCritic(api_key)
+    return _critic
 
 # Data classes
 @dataclass
@@ -77,6 +185,11 @@ class ScenarioVariant:
     generation_costs: Dict[str, float]
     available_capacity: Dict[str, float]
     capacity_factors: Dict[str, float]
+    curtailment: Dict[str, float]
+    # d annual_cost / d s for the load scaled by s around this variant, from
+    # the duals of its solves (0.2 times it estimates +20% load); None unless
+    # "sensitivities" was among the season outputs
+    cost_load_sensitivity: Optional[float] = None
     
     @property
     def full_name(self) -> str:
@@ -91,6 +204,8 @@ class ScenarioVariant:
             "load_factor": self.load_factor,
             "annual_cost": self.annual_cost
         }
+        if self.cost_load_sensitivity is not None:
+            result["cost_load_sensitivity"] = self.cost_load_sensitivity
         
         # Add seasonal data
         for season, data in self.seasonal_data.items():
@@ -104,70 +219,108 @@ class ScenarioVariant:
             result[f"gen_cost_{asset}"] = self.generation_costs.get(asset, 0)
             result[f"avail_gen_{asset}"] = self.available_capacity.get(asset, 0)
             result[f"capacity_factor_{asset}"] = self.capacity_factors.get(asset, 0)
+            result[f"curtailment_{asset}"] = self.curtailment.get(asset, 0)
             
         return result
 
+    @classmethod
+    def from_dict(cls, row: Dict[str, Any]) -> "ScenarioVariant":
+        """Inverse of to_dict(); seasonal capacity factors are not part of it and come back empty"""
+        # Longer prefixes first, so that gen_cost_x is not read as gen_ of 'cost_x'
+        annual = {prefix: {} for prefix in ('gen_cost_', 'avail_gen_', 'capacity_factor_', 'curtailment_', 'gen_')}
+        seasonal_generation: Dict[str, Dict[str, float]] = {}
+        seasonal_cost: Dict[str, float] = {}
+        for key, value in row.items():
+            prefix = next((p for p in annual if key.startswith(p)), None)
+            if prefix is not None:
+                annual[prefix][key[len(prefix):]] = value
+            elif '_gen_' in key:
+                season, asset = key.split('_gen_', 1)
+                seasonal_generation.setdefault(season, {})[asset] = value
+            elif key.endswith('_cost') and key not in ('annual_cost', 'cost_load_sensitivity'):
+                seasonal_cost[key[:-len('_cost')]] = value
+
+        return cls(
+            scenario_name=row['base_scenario'],
+            variant_type=row['variant'],
+            load_factor=row['load_factor'],
+            annual_cost=row['annual_cost'],
+            seasonal_data={
+                season: SeasonalData(
+                    generation=seasonal_generation.get(season, {}),
+                    cost=cost,
+                    capacity_factors={}
+                )
+                for season, cost in seasonal_cost.items()
+            },
+            generation_by_asset=annual['gen_'],
+            generation_costs=annual['gen_cost_'],
+            available_capacity=annual['avail_gen_'],
+            capacity_factors=annual['capacity_factor_'],
+            curtailment=annual['curtailment_'],
+            cost_load_sensitivity=(
+                float(row['cost_load_sensitivity']) if pd.notna(row.get('cost_load_sensitivity')) else None
+            )
+        )
+
 # Run a single scenario variant (nominal, high, or low load)
+@traced("scenario_variant")
 def run_scenario_variant(
     scenario_name: str,
     gen_positions: Dict[int, int],
     storage_positions: Dict[int, int],
     load_factor: float,
     variant: str,
-    data_context: Dict[str, Any]
+    data_context: Dict[str, Any],
+    season_results: Optional[Dict[str, Optional["SeasonResult"]]] = None
 ) -> Optional[ScenarioVariant]:
-    """Run a single scenario variant (nominal, high, or low load)"""
+    """
+    Run a single scenario variant (nominal, high, or low load).
+    season_results holds seasons the caller already ran for this variant,
+    which are not looked up again.
+    """
     
     seasonal_data = {}
-    total_gen_year = {}
-    total_gen_cost_year = {}
-    total_avail_gen_year = {}
+    weighted_metrics = []
+    # The load sensitivity comes from the duals, extracted only on request
+    cost_load_sensitivity = 0.0 if 'sensitivities' in data_context.get('season_outputs', season_outputs) else None
     
-    print(f"\nProcessing {scenario_name} ({variant} load) with:")
-    print(f"  Load factor: {load_factor}")
+    log(f"\nProcessing {scenario_name} ({variant} load) with:", INFO)
+    log(f"  Load factor: {load_factor}", INFO)
 
-    for season in ["winter", "summer", "autumn_spring"]:
-        print(f"  Running {season}...")
-        season_result = run_single_season(
-            season=season,
-            gen_positions=gen_positions,
-            storage_positions=storage_positions,
-            load_factor=load_factor,
-            data_context=data_context
-        )
+    for season in data_context['season_weights']:
+        log(f"  Running {season}...", INFO)
+        if season_results is not None and season in season_results:
+            season_result = season_results[season]
+        else:
+            season_result = run_single_season(
+                season=season,
+                gen_positions=gen_positions,
+                storage_positions=storage_positions,
+                load_factor=load_factor,
+                data_context=data_context
+            )
         
         if season_result is None:
             return None
             
         # Convert SeasonResult to SeasonalData
-        generation_dict = {
-            asset: metrics.generation 
-            for asset, metrics in season_result.metrics.items()
-        }
-        capacity_factors = {
-            asset: (metrics.generation / metrics.available if metrics.available > 0 else 0)
-            for asset, metrics in season_result.metrics.items()
-        }
-        
         seasonal_data[season] = SeasonalData(
-            generation=generation_dict,
+            generation=season_result.metrics.as_dict('generation'),
             cost=season_result.cost,
-            capacity_factors=capacity_factors
+            capacity_factors=season_result.metrics.as_dict('capacity_factor')
         )
-        
-        # Accumulate annual metrics
-        weight = data_context['season_weights'][season]
-        for asset, metrics in season_result.metrics.items():
-            total_gen_year[asset] = total_gen_year.get(asset, 0) + metrics.generation * weight
-            total_gen_cost_year[asset] = total_gen_cost_year.get(asset, 0) + metrics.cost * weight
-            total_avail_gen_year[asset] = total_avail_gen_year.get(asset, 0) + metrics.available * weight
-
-    # Calculate capacity factors
-    capacity_factors = {
-        asset: total_gen_year[asset] / total_avail_gen_year[asset]
-        if total_avail_gen_year.get(asset, 0) > 0 else 0
-        for asset in total_gen_year
-    }
+        weighted_metrics.append((season_result.metrics, data_context['season_weights'][season]))
+        if cost_load_sensitivity is not None:
+            if season_result.load_sensitivity is None:
+                raise ValueError(
+                    f"No load sensitivity for {scenario_name} ({variant}) in {season}: its solve "
+                    f"reported no duals; use a backend that does or drop 'sensitivities' from the outputs"
+                )
+            cost_load_sensitivity += data_context['season_weights'][season] * season_result.load_sensitivity
+
+    # Scale the seasons to a year
+    annual = weighted_sum(weighted_metrics)
 
     annual_cost = sum(
         data.cost * data_context['season_weights'][season] 
@@ -180,22 +333,27 @@ def run_scenario_variant(
         load_factor=load_factor,
         annual_cost=annual_cost,
         seasonal_data=seasonal_data,
-        generation_by_asset=total_gen_year,
-        generation_costs=total_gen_cost_year,
-        available_capacity=total_avail_gen_year,
-        capacity_factors=capacity_factors
+        generation_by_asset=annual.as_dict('generation'),
+        generation_costs=annual.as_dict('cost'),
+        available_capacity=annual.as_dict('available'),
+        capacity_factors=annual.as_dict('capacity_factor'),
+        curtailment=annual.as_dict('curtailment'),
+        cost_load_sensitivity=cost_load_sensitivity
     )
 
 
-def load_data_context() -> Dict[str, Any]:
+@traced("load_data_context")
+def load_data_context(config: Optional[RunConfig] = None) -> Dict[str, Any]:
     """
     Load and preprocess all required data for scenario analysis.
     Returns a context dictionary containing all necessary data and mappings.
     """
+    config = config or RunConfig()
+
     # Load base data files
     bus = pd.read_csv(bus_file)
     branch = pd.read_csv(branch_file)
-    master_gen = pd.read_csv(master_gen_file, parse_dates=["time"]).sort_values("time")
+    master_gen = load_gen_store(master_gen_store, master_gen_file)
     master_load = pd.read_csv(master_load_file, parse_dates=["time"]).sort_values("time")
     scenarios_df = pd.read_csv(scenarios_params_file)
 
@@ -205,10 +363,36 @@ def load_data_context() -> Dict[str, Any]:
     branch["id"] = np.arange(1, len(branch) + 1)
 
     # Create mappings
-    id_to_type = master_gen.drop_duplicates(subset=['id'])[['id', 'type']].set_index('id')['type'].to_dict()
-    type_to_id = master_gen.drop_duplicates(subset=['type'])[['type', 'id']].set_index('type')['id'].to_dict()
-    id_to_gencost = master_gen.drop_duplicates(subset=['id'])[['id', 'gencost']].set_index('id')['gencost'].to_dict()
-    id_to_pmax = master_gen.drop_duplicates(subset=['id'])[['id', 'pmax']].set_index('id')['pmax'].to_dict()
+    assets = master_gen.assets.set_index('id')
+    id_to_type = assets['type'].to_dict()
+    type_to_id = master_gen.assets.drop_duplicates(subset=['type']).set_index('type')['id'].to_dict()
+    id_to_gencost = assets['gencost'].to_dict()
+    id_to_pmax = assets['pmax'].to_dict()
+
+    # Seasons to solve and their weight in the annual totals
+    if config.simulation_mode == "full_year":
+        weights = full_year_weights
+    elif config.simulation_mode == "representative":
+        weights = season_weights
+    elif config.simulation_mode == "clustered":
+        weights = pd.read_csv(representative_weights_file).set_index('season')['weight'].to_dict()
+    else:
+        raise ValueError(f"Unknown simulation_mode '{config.simulation_mode}'")
+    if config.seasons is not None:
+        unknown = set(config.seasons) - set(weights)
+        if unknown:
+            raise ValueError(
+                f"Season(s) {sorted(unknown)} are not part of simulation_mode "
+                f"'{config.simulation_mode}' ({sorted(weights)})"
+            )
+        weights = {season: weights[season] for season in config.seasons}
+    for seasons, name in ((master_gen.seasons, "master_gen"), (master_load['season'].unique(), "master_load")):
+        missing = set(weights) - set(seasons)
+        if missing:
+            raise ValueError(
+                f"{name} has no rows for season(s) {sorted(missing)}; "
+                f"regenerate it with create_{name}.py"
+            )
 
     return {
         # Raw data
@@ -225,10 +409,24 @@ def load_data_context() -> Dict[str, Any]:
         'id_to_pmax': id_to_pmax,
         
         # Constants
-        'season_weights': season_weights,
+        'season_weights': weights,
+        'solver_options': config.solver_options,
+        'formulation': config.formulation,
+        'lazy_flow_limits': config.lazy_flow_limits,
+        'season_outputs': resolve_outputs(dict.fromkeys(season_outputs + tuple(config.save_frames))),
+        'save_frames': resolve_outputs(config.save_frames),
+        
+        # DCOPF models built so far, keyed by (season, gen positions, storage positions)
+        'season_models': {},
+        
+        # Season results keyed by fingerprint of their inputs
+        'solve_cache': SolveCache(
+            solve_cache_dir if config.persist_solve_cache else None,
+            max_bytes=solve_cache_max_mb * 1024 ** 2
+        ),
         
         # Paths
-        'results_root': results_root
+        'results_root': config.results_root
     }
 
 def parse_positions(positions_str: str, type_to_id: Dict[str, int]) -> Dict[int, int]:
@@ -249,21 +447,110 @@ def parse_positions(positions_str: str, type_to_id: Dict[str, int]) -> Dict[int,
             for bus, gen_type in positions_raw.items()
         }
     except (ValueError, KeyError) as e:
-        print(f"Error parsing positions: {e}")
+        log(f"Error parsing positions: {e}", INFO)
         return {}
 
-@dataclass
-class SeasonMetrics:
-    generation: float
-    cost: float
-    available: float
-
 @dataclass
 class SeasonResult:
-    metrics: Dict[str, SeasonMetrics]
+    metrics: TypeMetrics
     cost: float
     storage_data: Optional[pd.DataFrame] = None
+    frames: Optional[Dict[str, pd.DataFrame]] = None  # the data_context's save_frames
+    load_sensitivity: Optional[float] = None          # d cost / d load scaling, from the duals
+
+def get_season_model(
+    season: str,
+    gen_positions: Dict[int, int],
+    storage_positions: Dict[int, int],
+    data_context: Dict[str, Any],
+    units: Optional[pd.DataFrame] = None,
+    profiles: Optional[pd.DataFrame] = None
+) -> Optional[DCOPFModel]:
+    """Return the DCOPF model of an asset set and season, building it on first use"""
+    key = (season, tuple(sorted(gen_positions.items())), tuple(sorted(storage_positions.items())))
+    models = data_context.setdefault('season_models', {})
+    if key not in models:
+        if units is None or profiles is None:
+            units, profiles = season_assets(season, gen_positions, storage_positions, data_context)
+        log(f"Types in time series: {profiles['type'].unique()}")
+        models[key] = DCOPFModel.from_frames(
+            profiles,
+            data_context['branch'],
+            data_context['bus'],
+            build_demand_time_series(data_context['master_load'], 1.0, season),
+            delta_t=1,
+            units=units,
+            solver=data_context.get('solver_options'),
+            formulation=data_context.get('formulation', 'angle'),
+            lazy_flow_limits=data_context.get('lazy_flow_limits', False)
+        )
+    return models[key]
+
+def season_assets(
+    season: str,
+    gen_positions: Dict[int, int],
+    storage_positions: Dict[int, int],
+    data_context: Dict[str, Any]
+) -> tuple:
+    """
+    Unit table of the placed assets and the season profiles of their ids,
+    one per id. Assets without data in the season are left out.
+    """
+    units = build_unit_table(gen_positions, storage_positions)
+    profiles = build_season_profiles(data_context['master_gen'], units, season)
+    return units[units['id'].isin(profiles['id'])], profiles
+
+def season_fingerprint(
+    units: pd.DataFrame,
+    profiles: pd.DataFrame,
+    demand_ts: pd.DataFrame,
+    data_context: Dict[str, Any]
+) -> str:
+    """Fingerprint of everything a SeasonResult depends on"""
+    asset_params = {
+        gen_id: (
+            data_context['id_to_type'].get(gen_id),
+            data_context['id_to_gencost'].get(gen_id),
+            data_context['id_to_pmax'].get(gen_id)
+        )
+        for gen_id in sorted(units['id'].unique())
+    }
+    return fingerprint(
+        units,
+        profiles,
+        demand_ts,
+        data_context['branch'],
+        data_context['bus'],
+        data_context.get('solver_options'),
+        data_context.get('formulation', 'angle'),
+        data_context.get('lazy_flow_limits', False),
+        data_context.get('save_frames', ()),
+        data_context.get('season_outputs', season_outputs),
+        asset_params
+    )
+
+def season_key(
+    season: str,
+    gen_positions: Dict[int, int],
+    storage_positions: Dict[int, int],
+    load_factor: float,
+    data_context: Dict[str, Any]
+) -> str:
+    """
+    Solve-cache key of a season job. The inputs of an asset set and season
+    are fingerprinted once at load factor 1 and kept in the data context;
+    a load variant only differs in the factor on that demand, so its key
+    combines the stored fingerprint with the factor.
+    """
+    model_key = (season, tuple(sorted(gen_positions.items())), tuple(sorted(storage_positions.items())))
+    fingerprints = data_context.setdefault('season_fingerprints', {})
+    if model_key not in fingerprints:
+        units, profiles = season_assets(season, gen_positions, storage_positions, data_context)
+        demand_ts = build_demand_time_series(data_context['master_load'], 1.0, season)
+        fingerprints[model_key] = season_fingerprint(units, profiles, demand_ts, data_context)
+    return fingerprint(fingerprints[model_key], float(load_factor))
 
+@traced("season")
 def run_single_season(
     season: str,
     gen_positions: Dict[int, int],
@@ -272,94 +559,170 @@ def run_single_season(
     data_context: Dict[str, Any]
 ) -> Optional[SeasonResult]:
     """Run DCOPF for a single season and collect results"""
-    # Build time series
-    gen_ts = build_gen_time_series(
-        data_context['master_gen'], 
-        gen_positions, 
-        storage_positions,
-        season
-    )
+    # Same inputs as an earlier solve: reuse its result
+    cache = data_context.get('solve_cache')
+    cache_key = None
+    if cache is not None:
+        cache_key = season_key(season, gen_positions, storage_positions, load_factor, data_context)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            log(f"Using cached {season} result (load factor {load_factor})")
+            return cached
     
-    # Build demand time series
-    demand_ts = build_demand_time_series(
-        data_context['master_load'],
-        load_factor,
-        season
-    )
+    # Build generation and demand time series
+    with span("build_time_series", season=season):
+        units, profiles = season_assets(season, gen_positions, storage_positions, data_context)
+        demand_ts = build_demand_time_series(
+            data_context['master_load'],
+            load_factor,
+            season
+        )
     
     # Print debug info
-    print(f"\nAssets in {season}:")
-    print("Generators:", gen_positions)
-    print("Storage:", storage_positions)
-    print("Types in time series:", gen_ts['type'].unique())
-    print(f"Load factor: {load_factor}")
-    
-    # Run DCOPF
-    results = dcopf(
-        gen_ts, 
-        data_context['branch'], 
-        data_context['bus'], 
-        demand_ts, 
-        delta_t=1
-    )
+    log(f"\nAssets in {season}:")
+    log(f"Generators: {gen_positions}")
+    log(f"Storage: {storage_positions}")
+    log(f"Load factor: {load_factor}")
     
-    # Debug prints to check DCOPF results structure
-    print("\nDCOPF Results Structure:")
-    print("Available keys:", results.keys())
-    if 'storage' in results:
-        print("\nStorage data found!")
-        print("Storage data columns:", results['storage'].columns.tolist())
-        print("First few rows of storage data:")
-        print(results['storage'].head())
-        print("\nStorage data shape:", results['storage'].shape)
-        print("Storage data types:", results['storage'].dtypes)
-    else:
-        print("\nNo storage data in DCOPF results")
+    # Run DCOPF on the season's persistent model: between load-factor
+    # variants only the demand changes, so the LP is updated, not rebuilt
+    model = get_season_model(season, gen_positions, storage_positions, data_context, units, profiles)
+    if model is None:
+        log(f"Could not build DCOPF model for {season}", INFO)
+        return None
+    model.set_demand(demand_ts)
+    results = model.solve(data_context.get('season_outputs', season_outputs))
     
     if not results or results.get("status") != "Optimal":
-        print(f"Failed to find optimal solution for {season}")
+        log(f"Failed to find optimal solution for {season}", INFO)
         return None
     
-    # Process generation metrics
-    metrics_by_type = {}
-    
-    # Group generation by type
-    for _, gen_row in results['generation'].iterrows():
-        gen_type = data_context['id_to_type'].get(gen_row['id'])
-        if gen_type:
-            if gen_type not in metrics_by_type:
-                metrics_by_type[gen_type] = SeasonMetrics(
-                    generation=0,
-                    cost=0,
-                    available=0
-                )
-            
-            # Add generation
-            metrics_by_type[gen_type].generation += gen_row['gen']
-            
-            # Add cost
-            if gen_row['id'] in data_context['id_to_gencost']:
-                cost = gen_row['gen'] * data_context['id_to_gencost'][gen_row['id']]
-                metrics_by_type[gen_type].cost += cost
-            
-            # Calculate available capacity
-            if gen_row['id'] in data_context['id_to_pmax']:
-                metrics_by_type[gen_type].available += data_context['id_to_pmax'][gen_row['id']]
-    
-    # Extract storage data if available
-    storage_data = None
-    if 'storage' in results:
-        storage_data = results['storage'].copy()
-        # Use 'E' column as Storage_SoC (as in your PULP code)
-        if 'E' in storage_data.columns:
-            storage_data['Storage_SoC'] = storage_data['E']
-            storage_data.set_index('time', inplace=True)
-    
-    return SeasonResult(
+    # Debug prints to check DCOPF results structure; formatting whole
+    # frames is not free, so only do it when they will be shown
+    if get_verbosity() >= DEBUG:
+        log("\nDCOPF Results Structure:")
+        log(f"Available keys: {results.keys()}")
+        if 'storage' in results:
+            log("\nStorage data found!")
+            log(f"Storage data columns: {results['storage'].columns.tolist()}")
+            log("First few rows of storage data:")
+            log(results['storage'].head())
+            log(f"\nStorage data shape: {results['storage'].shape}")
+            log(f"Storage data types: {results['storage'].dtypes}")
+        else:
+            log("\nNo storage data in DCOPF results")
+    
+    with span("metrics", season=season):
+        # Generation, cost, available energy and curtailment per asset type
+        metrics_by_type = dcopf_type_metrics(
+            model.data,
+            results['generation'],
+            data_context['id_to_type'],
+            storage_cost=data_context['id_to_gencost']
+        )
+    
+        # Extract storage data if available
+        storage_data = None
+        if 'storage' in results:
+            storage_data = results['storage'].copy()
+            # Use 'E' column as Storage_SoC (as in your PULP code)
+            if 'E' in storage_data.columns:
+                storage_data['Storage_SoC'] = storage_data['E']
+                storage_data.set_index('time', inplace=True)
+    
+    season_result = SeasonResult(
         metrics=metrics_by_type,
         cost=results.get("cost", 0.0),
-        storage_data=storage_data
+        storage_data=storage_data,
+        frames={name: results[name] for name in data_context.get('save_frames', ()) if name in results} or None,
+        load_sensitivity=(
+            float(results['sensitivities']['sensitivity'].iloc[0]) if 'sensitivities' in results else None
+        )
     )
+    if cache is not None:
+        cache.put(cache_key, season_result)
+    return season_result
+
+# Data context of a worker process, set once by the pool initializer
+_worker_context: Optional[Dict[str, Any]] = None
+
+def _init_season_worker(shared_context: Dict[str, Any], level: int, tracing: bool) -> None:
+    """Pool initializer: keep the shared data for every job of this worker"""
+    global _worker_context
+    set_verbosity(level)
+    TRACER.enabled = tracing
+    TRACER.drain()  # spans inherited from a forked parent are not this worker's
+    _worker_context = dict(shared_context)
+    _worker_context['season_models'] = {}
+    _worker_context['solve_cache'] = SolveCache()
+
+def _solve_season_batch(batch):
+    """
+    Solve the jobs of one asset set and season in a worker, reusing its
+    model. Returns the (cache key, result) pairs and the spans recorded.
+    """
+    solved = []
+    for season, gen_positions, storage_positions, load_factor, cache_key in batch:
+        result = run_single_season(
+            season=season,
+            gen_positions=gen_positions,
+            storage_positions=storage_positions,
+            load_factor=load_factor,
+            data_context=_worker_context
+        )
+        solved.append((cache_key, result))
+    return solved, TRACER.drain()
+
+def solve_seasons_parallel(
+    jobs: List[tuple],
+    data_context: Dict[str, Any],
+    max_workers: int
+) -> None:
+    """
+    Solve (season, gen_positions, storage_positions, load_factor) jobs on a
+    process pool and store the results in the solve cache of data_context,
+    from which run_single_season then serves them; they count as solved,
+    not as reused.
+
+    Jobs already cached, or duplicated, are not resubmitted; their keys
+    (season_key) hash each asset set and season only once, however many
+    load factors it is solved for. Jobs sharing an
+    asset set and season form one batch so that a worker builds the DCOPF
+    model once and only updates the demand between load factors.
+    """
+    cache = data_context['solve_cache']
+    batches: Dict[tuple, List[tuple]] = {}
+    seen = set()
+    for season, gen_positions, storage_positions, load_factor in jobs:
+        key = season_key(season, gen_positions, storage_positions, load_factor, data_context)
+        if key in seen or key in cache:
+            continue
+        seen.add(key)
+        model_key = (season, tuple(sorted(gen_positions.items())), tuple(sorted(storage_positions.items())))
+        batches.setdefault(model_key, []).append(
+            (season, gen_positions, storage_positions, load_factor, key)
+        )
+
+    n_workers = min(max_workers, len(batches))
+    if n_workers <= 1:
+        return
+
+    # Only the data shared by all jobs goes to the workers, once each
+    shared_context = {
+        key: value for key, value in data_context.items()
+        if key not in ('season_models', 'solve_cache')
+    }
+    log(f"\nSolving {len(seen)} season jobs on {n_workers} worker processes...", INFO)
+    with ProcessPoolExecutor(
+        max_workers=n_workers,
+        initializer=_init_season_worker,
+        initargs=(shared_context, get_verbosity(), TRACER.enabled)
+    ) as executor:
+        for solved, spans in executor.map(_solve_season_batch, list(batches.values())):
+            TRACER.extend(spans)
+            for key, result in solved:
+                if result is not None:
+                    cache.put(key, result, miss=True)
 
 class MultiScenario:
     """Main class to handle multiple scenario analysis for power system investments"""
@@ -476,51 +839,149 @@ class MultiScenario:
         """Store results for a specific scenario"""
         pass
 
-def main():
-    # Load all data
-    data_context = load_data_context()
-    
-    # Ask for sensitivity analysis
-    run_sensitivity = ask_user_confirmation(
-        "Do you want to run sensitivity analysis (±20% load)?"
-    )
+# Files the stage results are saved as in a results directory
+SCENARIO_RESULTS = "scenario_results.csv"
+INVESTMENT_RESULTS = "scenario_results_with_investment.csv"
+STORAGE_DATA = "storage_data.csv"
+SOLVE_CONFIG = "solve_config.json"
 
-    scenario_variants: List[ScenarioVariant] = []
-    
-    # Dictionary to collect storage data from all scenarios
-    all_scenarios_storage = {}
+def _read_stage_output(results_dir: str, name: str, stage: str) -> pd.DataFrame:
+    """A stage result stored in results_dir, with a hint at the stage that writes it"""
+    path = os.path.join(results_dir, name)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{path} not found; run the '{stage}' stage first")
+    return pd.read_csv(path)
+
+@dataclass
+class SolveResults:
+    """
+    Output of the solve stage, handed to the investment, plot and report
+    stages in memory. save() and load() persist it in a results directory:
+    scenario_results.csv, the settings they were solved with in
+    solve_config.json plus, per scenario, storage_data.csv and the saved
+    result frames under frames/.
+    """
+    variants: List[ScenarioVariant] = field(default_factory=list)
+    # scenario -> storage dispatch of its nominal variant, indexed by time
+    storage: Dict[str, pd.DataFrame] = field(default_factory=dict)
+    # scenario -> "{variant}_{season}_{frame}" -> result frame (RunConfig.save_frames)
+    frames: Dict[str, Dict[str, pd.DataFrame]] = field(default_factory=dict)
+    # RunConfig.solve_settings() of the solve; None for results saved without them
+    solve_settings: Optional[Dict[str, Any]] = None
+
+    def table(self) -> pd.DataFrame:
+        """One row per variant, the columns of ScenarioVariant.to_dict()"""
+        return pd.DataFrame([variant.to_dict() for variant in self.variants])
+
+    def save(self, results_dir: str) -> None:
+        os.makedirs(results_dir, exist_ok=True)
+        self.table().to_csv(os.path.join(results_dir, SCENARIO_RESULTS), index=False)
+        if self.solve_settings is not None:
+            with open(os.path.join(results_dir, SOLVE_CONFIG), "w") as f:
+                json.dump(self.solve_settings, f, indent=2)
+        for scenario_name, storage_data in self.storage.items():
+            os.makedirs(os.path.join(results_dir, scenario_name), exist_ok=True)
+            storage_data.to_csv(os.path.join(results_dir, scenario_name, STORAGE_DATA))
+        for scenario_name, frames in self.frames.items():
+            frames_dir = os.path.join(results_dir, scenario_name, "frames")
+            os.makedirs(frames_dir, exist_ok=True)
+            for name, frame in frames.items():
+                frame.to_csv(os.path.join(frames_dir, f"{name}.csv"), index=False)
+        log(f"Solve results saved to {results_dir}", INFO)
+
+    @classmethod
+    def load(cls, results_dir: str) -> "SolveResults":
+        """The results save() wrote to results_dir; saved result frames are not read back"""
+        table = _read_stage_output(results_dir, SCENARIO_RESULTS, "solve")
+        storage = {}
+        for scenario_name in table['base_scenario'].unique():
+            path = os.path.join(results_dir, scenario_name, STORAGE_DATA)
+            if os.path.exists(path):
+                storage[scenario_name] = pd.read_csv(path, index_col='time', parse_dates=['time'])
+        solve_settings = None
+        if os.path.exists(os.path.join(results_dir, SOLVE_CONFIG)):
+            with open(os.path.join(results_dir, SOLVE_CONFIG)) as f:
+                solve_settings = json.load(f)
+        return cls(
+            variants=[ScenarioVariant.from_dict(row) for row in table.to_dict('records')],
+            storage=storage,
+            solve_settings=solve_settings
+        )
+
+def save_investment_results(final_results: pd.DataFrame, results_dir: str) -> None:
+    os.makedirs(results_dir, exist_ok=True)
+    final_results.to_csv(os.path.join(results_dir, INVESTMENT_RESULTS), index=False)
+
+def load_investment_results(results_dir: str) -> pd.DataFrame:
+    return _read_stage_output(results_dir, INVESTMENT_RESULTS, "invest")
+
+def solve_scenarios(
+    data_context: Dict[str, Any],
+    config: RunConfig,
+    scenarios_df: Optional[pd.DataFrame] = None
+) -> SolveResults:
+    """
+    Solve every selected scenario (of scenarios_df, by default the scenarios
+    file) and load variant. Nothing is written; see SolveResults.save().
+    """
+    if scenarios_df is None:
+        scenarios_df = data_context['scenarios_df']
+    if config.scenarios is not None:
+        unknown = set(config.scenarios) - set(scenarios_df['scenario_name'])
+        if unknown:
+            raise ValueError(f"Unknown scenario(s) {sorted(unknown)}")
+        scenarios_df = scenarios_df[scenarios_df['scenario_name'].isin(config.scenarios)]
+
+    solved = SolveResults(solve_settings=config.solve_settings())
     
-    for _, row in data_context['scenarios_df'].iterrows():
-        scenario_name = row["scenario_name"]
-        gen_positions = parse_positions(row["gen_positions"], data_context['type_to_id'])
-        storage_positions = parse_positions(row["storage_units"], data_context['type_to_id'])
+    scenarios = []
+    for _, row in scenarios_df.iterrows():
         base_load_factor = float(row["load_factor"])
-
+        scenarios.append((
+            row["scenario_name"],
+            parse_positions(row["gen_positions"], data_context['type_to_id']),
+            parse_positions(row["storage_units"], data_context['type_to_id']),
+            [(name, base_load_factor * factor) for name, factor in config.variants.items()]
+        ))
+    
+    # Solve every independent season LP up front; the loop below then
+    # assembles the variants in input order from the solve cache
+    solve_seasons_parallel(
+        [
+            (season, gen_positions, storage_positions, load_factor)
+            for _, gen_positions, storage_positions, variants_to_run in scenarios
+            for _, load_factor in variants_to_run
+            for season in data_context['season_weights']
+        ],
+        data_context,
+        config.max_workers
+    )
+    
+    for scenario_name, gen_positions, storage_positions, variants_to_run in scenarios:
         # Storage data collection for nominal load only
         storage_data = pd.DataFrame()
         
-        # Run variants
-        variants_to_run = [("nominal", base_load_factor)]
-        if run_sensitivity:
-            variants_to_run.extend([
-                ("high", base_load_factor * 1.2),
-                ("low", base_load_factor * 0.8)
-            ])
-        
         for variant_name, load_factor in variants_to_run:
-            # Run scenario and collect results
-            for season in ["winter", "summer", "autumn_spring"]:
-                season_result = run_single_season(
+            # Run scenario and collect results; run_scenario_variant below
+            # takes these season results over
+            season_results = {}
+            for season in data_context['season_weights']:
+                season_result = season_results[season] = run_single_season(
                     season=season,
                     gen_positions=gen_positions,
                     storage_positions=storage_positions,
                     load_factor=load_factor,
                     data_context=data_context
                 )
+                if season_result is None:
+                    continue
                 
                 # Collect storage data for nominal load case
-                if variant_name == "nominal" and season_result and season_result.storage_data is not None:
+                if variant_name == "nominal" and season_result.storage_data is not None:
                     storage_data = pd.concat([storage_data, season_result.storage_data])
+
+                for frame_name, frame in (season_result.frames or {}).items():
+                    solved.frames.setdefault(scenario_name, {})[f"{variant_name}_{season}_{frame_name}"] = frame
             
             result = run_scenario_variant(
                 scenario_name=scenario_name,
@@ -528,41 +989,144 @@ def main():
                 storage_positions=storage_positions,
                 load_factor=load_factor,
                 variant=variant_name,
-                data_context=data_context
+                data_context=data_context,
+                season_results=season_results
             )
             if result:
-                scenario_variants.append(result)
+                solved.variants.append(result)
         
-        # Store storage data if available
+        # Keep the storage data for the plot stage
         if not storage_data.empty:
-            storage_data = storage_data.sort_index()
-            all_scenarios_storage[scenario_name] = storage_data
-            
-            # Create plots with this scenario's data
-            if 'Storage_SoC' in storage_data.columns:
-                create_scenario_plots({scenario_name: storage_data})
-                print(f"Created storage plots for scenario {scenario_name}")
-            else:
-                print(f"Warning: No Storage_SoC column found in scenario {scenario_name}")
-    
-    # Convert to DataFrame
-    results_df = pd.DataFrame([
-        variant.to_dict() for variant in scenario_variants
-    ])
-
-    # Save initial results
-    results_df.to_csv(os.path.join(results_root, "scenario_results.csv"), index=False)
-    print("Initial results saved to CSV.")
-
-    # Then perform investment analysis
-    print("\nPerforming investment analysis...")
+            solved.storage[scenario_name] = storage_data.sort_index()
+    
+    cache = data_context['solve_cache']
+    log(f"\nSeason solves: {cache.misses} solved, {cache.hits} reused from cache", INFO)
+    return solved
+
+class VariantSolver:
+    """
+    Solves load variants on demand, for the investment stage: data and
+    models are loaded on the first request, the season LPs of all variants
+    of a request are solved as one parallel batch, and every variant is
+    kept, so a variant is never solved twice. Scenario names that are not
+    in the scenarios table raise a ValueError, config.scenarios already
+    when the solver is built with that table.
+    """
+
+    def __init__(
+        self,
+        config: Optional[RunConfig] = None,
+        data_context: Optional[Dict[str, Any]] = None,
+        scenarios_df: Optional[pd.DataFrame] = None
+    ):
+        self.config = config or RunConfig()
+        self.data_context = data_context
+        self.scenarios_df = scenarios_df
+        self.variants: Dict[Tuple[str, str], ScenarioVariant] = {}
+        if scenarios_df is not None and self.config.scenarios is not None:
+            self._check_scenarios(scenarios_df, self.config.scenarios)
+
+    @staticmethod
+    def _check_scenarios(scenarios_df: pd.DataFrame, names) -> None:
+        """ValueError listing the names that are not scenarios of scenarios_df"""
+        unknown = set(names) - set(scenarios_df['scenario_name'])
+        if unknown:
+            raise ValueError(f"Unknown scenario(s) {sorted(unknown)}")
+
+    def __call__(self, requests: List[Tuple[str, str, float]]) -> List[ScenarioVariant]:
+        """
+        The variants of (scenario, variant name, factor on the scenario's
+        load_factor) requests, solving those not solved yet; variants that
+        fail to solve are left out
+        """
+        missing = [request for request in requests if request[:2] not in self.variants]
+        if missing:
+            if self.data_context is None:
+                self.data_context = load_data_context(self.config)
+            scenarios_df = self.scenarios_df if self.scenarios_df is not None else self.data_context['scenarios_df']
+            self._check_scenarios(scenarios_df, [scenario_name for scenario_name, _, _ in missing])
+            scenarios = scenarios_df.set_index('scenario_name')
+            type_to_id = self.data_context['type_to_id']
+            jobs = [
+                (
+                    scenario_name,
+                    variant_name,
+                    parse_positions(scenarios.loc[scenario_name, 'gen_positions'], type_to_id),
+                    parse_positions(scenarios.loc[scenario_name, 'storage_units'], type_to_id),
+                    float(scenarios.loc[scenario_name, 'load_factor']) * factor
+                )
+                for scenario_name, variant_name, factor in missing
+            ]
+
+            log(f"\nSolving {len(jobs)} missing load variant(s)...", INFO)
+            solve_seasons_parallel(
+                [
+                    (season, gen_positions, storage_positions, load_factor)
+                    for _, _, gen_positions, storage_positions, load_factor in jobs
+                    for season in self.data_context['season_weights']
+                ],
+                self.data_context,
+                self.config.max_workers
+            )
+            for scenario_name, variant_name, gen_positions, storage_positions, load_factor in jobs:
+                result = run_scenario_variant(
+                    scenario_name=scenario_name,
+                    gen_positions=gen_positions,
+                    storage_positions=storage_positions,
+                    load_factor=load_factor,
+                    variant=variant_name,
+                    data_context=self.data_context
+                )
+                if result:
+                    self.variants[(scenario_name, variant_name)] = result
+        return [self.variants[request[:2]] for request in requests if request[:2] in self.variants]
+
+def invest_scenarios(
+    solved: SolveResults,
+    scenarios_df: Optional[pd.DataFrame] = None,
+    variants: Optional[Dict[str, float]] = None,
+    solver: Optional[VariantSolver] = None,
+    data_context: Optional[Dict[str, Any]] = None
+) -> pd.DataFrame:
+    """
+    Investment analysis of the solved variants, merged with their
+    operation; the rows of scenario_results_with_investment.csv.
+    scenarios_df defines the scenarios' assets, by default the scenarios file.
+
+    variants (name -> factor on the scenario's load_factor) are analyzed
+    for every scenario too; those not in solved are solved by solver and
+    added to solved, or left out without one.
+
+    The unit ratings come from the generator store of data_context (or of
+    the solver's), which is only opened here when neither has it loaded.
+    """
+    if scenarios_df is None:
+        scenarios_df = pd.read_csv(scenarios_params_file)
+    if data_context is None and solver is not None:
+        data_context = solver.data_context
+    if data_context is not None:
+        ratings = data_context['master_gen'].type_ratings()
+    else:
+        ratings = load_gen_store(master_gen_store, master_gen_file).type_ratings()
+
+    def solve_missing(requests):
+        new_variants = solver(requests)
+        solved.variants.extend(new_variants)
+        return [variant.to_dict() for variant in new_variants]
+
+    log("\nPerforming investment analysis...", INFO)
     analysis = InvestmentAnalysis()
-    investment_results = analysis.analyze_scenario(
-        os.path.join(results_root, "scenario_results.csv"),
-        master_gen_file
-    )
+    with span("investment"):
+        investment_results = analysis.analyze(
+            solved.table(),
+            scenarios_df,
+            variants=variants,
+            solve_missing=solve_missing if solver is not None else None,
+            ratings=ratings
+        )
+    results_df = solved.table()
     
-    print("Investment analysis columns:", investment_results.columns.tolist())
+    log(f"Investment analysis columns: {investment_results.columns.tolist()}")
 
     # Check if base_scenario is in the index
     if 'base_scenario' in investment_results.index.names:
@@ -570,12 +1134,12 @@ def main():
         if 'base_scenario' not in investment_results.columns:
             investment_results = investment_results.reset_index()
     
-    # Filter for nominal variants
-    nominal_results = results_df[results_df['variant'] == 'nominal'].copy()
+    # Operation of every variant
+    variant_results = results_df.copy()
 
     # Get the actual columns that exist in the DataFrame
-    available_columns = nominal_results.columns.tolist()
-    print("\nAvailable columns in nominal_results:", available_columns)
+    available_columns = variant_results.columns.tolist()
+    log(f"\nAvailable columns in variant_results: {available_columns}")
 
     # Define essential columns based on what's available
     base_essential_columns = [
@@ -584,20 +1148,30 @@ def main():
         'load_factor',
         'annual_cost'
     ]
+    # Only solves with "sensitivities" among their outputs have it
+    if 'cost_load_sensitivity' in available_columns:
+        base_essential_columns.append('cost_load_sensitivity')
 
-    # Add generation columns that exist
-    gen_columns = [col for col in available_columns if col.startswith('gen_')]
+    # Add generation, capacity factor and curtailment columns that exist
+    gen_columns = [
+        col for col in available_columns
+        if col.startswith(('gen_', 'capacity_factor_', 'curtailment_'))
+    ]
     essential_columns = base_essential_columns + gen_columns
 
-    print("\nSelected essential columns:", essential_columns)
+    log(f"\nSelected essential columns: {essential_columns}")
 
-    # Filter columns
-    nominal_results = nominal_results[essential_columns]
+    # Filter columns; the investment results carry their own load factor,
+    # cost and generation, which take precedence
+    variant_results = variant_results[[
+        col for col in essential_columns
+        if col in ('base_scenario', 'variant') or col not in investment_results.columns
+    ]]
 
     # Merge the results
-    final_results = nominal_results.merge(
-        investment_results,
-        on='base_scenario',
+    final_results = investment_results.merge(
+        variant_results,
+        on=['base_scenario', 'variant'],
         how='left'
     )
 
@@ -622,10 +1196,14 @@ def main():
         'annual_costs'
     ]
 
-    # Define NPV and annuity columns
+    # Define NPV, annuity, LCOE and Monte Carlo risk columns
     financial_columns = [
         'npv_10y', 'npv_20y', 'npv_30y',
-        'annuity_10y', 'annuity_20y', 'annuity_30y'
+        'annuity_10y', 'annuity_20y', 'annuity_30y',
+        'lcoe_10y', 'lcoe_20y', 'lcoe_30y',
+        'npv_p10_10y', 'npv_p50_10y', 'npv_p90_10y', 'loss_probability_10y',
+        'npv_p10_20y', 'npv_p50_20y', 'npv_p90_20y', 'loss_probability_20y',
+        'npv_p10_30y', 'npv_p50_30y', 'npv_p90_30y', 'loss_probability_30y'
     ]
 
     # Get generation-related columns
@@ -649,83 +1227,167 @@ def main():
     # Reorder columns, but only include ones that exist
     final_columns = [col for col in column_order 
                      if col in final_results.columns]
-    final_results = final_results[final_columns]
+    return final_results[final_columns]
 
-    # Save the final results
-    final_results.to_csv(os.path.join(results_root, "scenario_results_with_investment.csv"), 
-                         index=False)
+def plot_storage(storage: Dict[str, pd.DataFrame], results_dir: str = results_root) -> None:
+    """Storage state-of-charge plots of SolveResults.storage, into each scenario's figure folder"""
+    from visualization.report_plots import create_scenario_plots
 
-    # Ask user for generation preferences
-    generate_plots = ask_user_confirmation("Do you want to generate plots?")
-    generate_individual = ask_user_confirmation("Do you want to generate individual scenario reports?")
-    generate_global = ask_user_confirmation("Do you want to generate a global comparison report?")
+    for scenario_name, storage_data in storage.items():
+        if 'Storage_SoC' in storage_data.columns:
+            with span("plots", scenario=scenario_name):
+                create_scenario_plots({scenario_name: storage_data}, results_dir)
+            log(f"Created storage plots for scenario {scenario_name}", INFO)
+        else:
+            log(f"Warning: No Storage_SoC column found in scenario {scenario_name}", INFO)
 
-    if generate_plots:
-        print("\nGenerating plots...")
-        # Group scenarios by base scenario
-        scenario_groups = final_results.groupby('base_scenario')
-        
-        for base_scenario, group in scenario_groups:
-            print(f"\nProcessing scenario: {base_scenario}")
-            
-            # Get variants with debug printing
-            nominal_data = group[group['variant'] == 'nominal'].iloc[0].to_dict()
-            
-            # Get high variant
-            high_data = {}
-            high_variant = group[group['variant'] == 'high']
-            if not high_variant.empty:
-                high_data = high_variant.iloc[0].to_dict()
-                print(f"Found high variant for {base_scenario}")
-            else:
-                print(f"No high variant for {base_scenario}")
-                
-            # Get low variant
-            low_data = {}
-            low_variant = group[group['variant'] == 'low']
-            if not low_variant.empty:
-                low_data = low_variant.iloc[0].to_dict()
-                print(f"Found low variant for {base_scenario}")
-            else:
-                print(f"No low variant for {base_scenario}")
-            
-            # Add sensitivity data to nominal data
-            nominal_data['high_variant'] = high_data
-            nominal_data['low_variant'] = low_data
-            
-            # Create plots
-            create_annual_summary_plots(nominal_data, results_root)
+def plot_summaries(final_results: pd.DataFrame, results_dir: str = results_root) -> None:
+    """Annual summary plots of every scenario of invest_scenarios(), with its load variants"""
+    from visualization.summary_plots import create_annual_summary_plots
 
-    if generate_individual or generate_global:
-        print("\nGenerating requested reports...")
+    log("\nGenerating plots...", INFO)
+    # Group scenarios by base scenario
+    scenario_groups = final_results.groupby('base_scenario')
+    
+    for base_scenario, group in scenario_groups:
+        log(f"\nProcessing scenario: {base_scenario}", INFO)
         
-        # Generate individual reports if requested
-        if generate_individual:
-            print("\nGenerating individual scenario reports...")
-            # Only process nominal variants for reports
-            nominal_results = final_results[final_results['variant'] == 'nominal']
-            for _, row in nominal_results.iterrows():
-                if row['annual_cost'] is not None:
-                    critic.analyze_scenario(row.to_dict(), results_root)
-            print("Individual reports completed.")
+        # Get variants with debug printing
+        nominal_data = group[group['variant'] == 'nominal'].iloc[0].to_dict()
         
-        # Generate global report if requested
-        if generate_global:
-            print("\nGenerating global comparison report...")
-            # Use only nominal variants for global comparison
-            nominal_results = final_results[final_results['variant'] == 'nominal']
-            critic.create_global_comparison_report(nominal_results, results_root)
-            print("Global report completed.")
+        # Get high variant
+        high_data = {}
+        high_variant = group[group['variant'] == 'high']
+        if not high_variant.empty:
+            high_data = high_variant.iloc[0].to_dict()
+            log(f"Found high variant for {base_scenario}")
+        else:
+            log(f"No high variant for {base_scenario}")
+            
+        # Get low variant
+        low_data = {}
+        low_variant = group[group['variant'] == 'low']
+        if not low_variant.empty:
+            low_data = low_variant.iloc[0].to_dict()
+            log(f"Found low variant for {base_scenario}")
+        else:
+            log(f"No low variant for {base_scenario}")
         
-        print("All requested reports generated.")
-    else:
-        print("\nSkipping report generation.")
+        # Add sensitivity data to nominal data
+        nominal_data['high_variant'] = high_data
+        nominal_data['low_variant'] = low_data
+        
+        # Create plots
+        with span("plots", scenario=base_scenario):
+            create_annual_summary_plots(nominal_data, results_dir)
 
-    # Update README with scenario links
+def report_scenarios(
+    final_results: pd.DataFrame,
+    results_dir: str = results_root,
+    individual: bool = True,
+    global_report: bool = True
+) -> None:
+    """LLM reports of the nominal variants of invest_scenarios(): one per scenario and/or a global comparison"""
+    if not (individual or global_report):
+        log("\nSkipping report generation.", INFO)
+        return
+
+    log("\nGenerating requested reports...", INFO)
+    critic = get_critic()
+    # Only nominal variants are reported on
+    nominal_results = final_results[final_results['variant'] == 'nominal']
+    
+    # Generate individual reports if requested
+    if individual:
+        log("\nGenerating individual scenario reports...", INFO)
+        for _, row in nominal_results.iterrows():
+            if row['annual_cost'] is not None:
+                with span("reports", scenario=row['base_scenario']):
+                    critic.analyze_scenario(row.to_dict(), results_dir)
+        log("Individual reports completed.", INFO)
+    
+    # Generate global report if requested
+    if global_report:
+        log("\nGenerating global comparison report...", INFO)
+        with span("reports", scenario="global"):
+            critic.create_global_comparison_report(nominal_results, results_dir)
+        log("Global report completed.", INFO)
+    
+    log("All requested reports generated.", INFO)
+
+def run_stages(
+    config: Optional[RunConfig] = None,
+    data_context: Optional[Dict[str, Any]] = None,
+    scenarios_df: Optional[pd.DataFrame] = None,
+    results_dir: Optional[str] = None
+) -> Tuple[SolveResults, pd.DataFrame]:
+    """
+    Solve and investment stages in memory, for notebooks and services:
+    returns the SolveResults and the investment table. Pass data_context
+    to reuse loaded data, models and cached solves across calls, and
+    scenarios_df (columns of scenarios_parameters.csv) to run scenarios
+    that are not in the file. With results_dir both results are saved too.
+    """
+    config = config or RunConfig()
+    if data_context is None:
+        data_context = load_data_context(config)
+    if scenarios_df is None:
+        scenarios_df = data_context['scenarios_df']
+
+    solved = solve_scenarios(data_context, config, scenarios_df)
+    final_results = invest_scenarios(solved, scenarios_df, data_context=data_context)
+    if results_dir is not None:
+        solved.save(results_dir)
+        save_investment_results(final_results, results_dir)
+    return solved, final_results
+
+def refresh_readme() -> None:
+    """Rewrite README.md with links to the scenario reports"""
     project_root = get_project_root()
     readme_path = os.path.join(project_root, 'README.md')
     create_readme_template(readme_path)  # Create/update the full README
     update_readme_with_scenarios()       # Update the scenario links
 
+def write_trace(path: Optional[str] = trace_file, fmt: str = trace_format) -> None:
+    """Write the recorded spans to path and log the per-phase totals"""
+    if path is None:
+        return
+    TRACER.write(path, fmt)
+    log(f"\nTrace written to {path}", INFO)
+    for name, totals in TRACER.summary().items():
+        log(f"  {name:24s} {totals['count']:5d} x  {totals['wall_s']:9.3f} s wall  "
+            f"{totals['cpu_s']:9.3f} s CPU", INFO)
+
+def main():
+    """Interactive run of all stages with the module settings; see cli.py for batch runs"""
+    set_verbosity(verbosity)
+    TRACER.enabled = trace_file is not None
+
+    # Ask for sensitivity analysis
+    run_sensitivity = ask_user_confirmation(
+        "Do you want to run sensitivity analysis (±20% load)?"
+    )
+    config = RunConfig(
+        variants=dict(sensitivity_variants) if run_sensitivity else {"nominal": sensitivity_variants["nominal"]}
+    )
+
+    # Solve and perform the investment analysis; the stages hand their
+    # results over in memory, the files are for later reruns and the reports
+    solved, final_results = run_stages(config, results_dir=config.results_root)
+    plot_storage(solved.storage, config.results_root)
+
+    # Ask user for generation preferences
+    generate_plots = ask_user_confirmation("Do you want to generate plots?")
+    generate_individual = ask_user_confirmation("Do you want to generate individual scenario reports?")
+    generate_global = ask_user_confirmation("Do you want to generate a global comparison report?")
+
+    if generate_plots:
+        plot_summaries(final_results, config.results_root)
+    report_scenarios(final_results, config.results_root, generate_individual, generate_global)
+
+    # Update README with scenario links
+    refresh_readme()
+    write_trace()
+
 if __name__ == "__main__":
     main()
@@ -340,6 +340,7 @@ Generated on: {now}
 | NPV (10 years) | CHF {scenario_data.get('npv_10y', 0):,.0f} |
 | NPV (20 years) | CHF {scenario_data.get('npv_20y', 0):,.0f} |
 | NPV (30 years) | CHF {scenario_data.get('npv_30y', 0):,.0f} |
+{self._format_risk_rows(scenario_data)}
 
 </div>
 <div style="width: 48%;">
@@ -369,6 +370,19 @@ Generated on: {now}
 """
         return markdown
 
+    def _format_risk_rows(self, scenario_data: dict, years: int = 30) -> str:
+        """Monte Carlo NPV range and probability of loss as table rows, empty without risk columns"""
+        if pd.isna(scenario_data.get(f'npv_p50_{years}y')):
+            return ''
+        rows = [
+            f"| NPV P{level} ({years} years) | CHF {scenario_data[f'npv_p{level}_{years}y']:,.0f} |"
+            for level in (10, 50, 90)
+        ]
+        loss = scenario_data.get(f'loss_probability_{years}y')
+        if pd.notna(loss):
+            rows.append(f"| Probability of Loss ({years} years) | {loss:.1%} |")
+        return '\n'.join(rows)
+
     def _format_dict_as_table(self, d: Dict[str, Any], format_str: str = "{:,.0f}") -> str:
         """Format dictionary as markdown table rows with Swiss number formatting"""
         rows = []
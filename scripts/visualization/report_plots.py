@@ -3,31 +3,35 @@ import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 import os
-from typing import Dict
+from typing import Dict, Optional
 
-def create_scenario_plots(all_scenarios_data: Dict[str, pd.DataFrame]):
+def create_scenario_plots(all_scenarios_data: Dict[str, pd.DataFrame], results_root: Optional[str] = None):
     """
     Create plots for all scenarios' storage data in one image:
     - Left subplot: Summer Storage SoC for all scenarios
     - Right subplot: Winter Storage SoC for all scenarios
+    Figures go to <results_root>/<scenario>/figure, by default data/results.
     """
-    # Get project root directory (where data/ is located)
-    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if results_root is None:
+        # Get project root directory (where data/ is located)
+        project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        results_root = os.path.join(project_root, 'data', 'results')
     
     # Colors for different storage units
     colors = plt.cm.tab10(np.linspace(0, 1, 10))  # Up to 10 different colors
     
     for scenario_name, scenario_data in all_scenarios_data.items():
         # Ensure scenario directory exists with correct path
-        scenario_dir = os.path.join(project_root, 'data', 'results', f'{scenario_name}', 'figure')
+        scenario_dir = os.path.join(results_root, f'{scenario_name}', 'figure')
         os.makedirs(scenario_dir, exist_ok=True)
         
         if isinstance(scenario_data.index, pd.Index):
             scenario_data.index = pd.to_datetime(scenario_data.index)
         
-        # Group data by storage_id if it exists
-        if 'storage_id' in scenario_data.columns:
-            storage_units = scenario_data['storage_id'].unique()
+        # Group data by storage unit, or by storage_id for data without units
+        unit_column = 'unit' if 'unit' in scenario_data.columns else 'storage_id'
+        if unit_column in scenario_data.columns:
+            storage_units = scenario_data[unit_column].unique()
         else:
             storage_units = [1]  # Default if no storage_id column
             
@@ -45,16 +49,16 @@ def create_scenario_plots(all_scenarios_data: Dict[str, pd.DataFrame]):
             
             # Plot each storage unit
             for idx, storage_id in enumerate(storage_units):
-                if 'storage_id' in scenario_data.columns:
-                    storage_data = scenario_data[scenario_data['storage_id'] == storage_id]
-                    summer_storage = summer_period[summer_period['storage_id'] == storage_id]
-                    winter_storage = winter_period[winter_period['storage_id'] == storage_id]
+                if unit_column in scenario_data.columns:
+                    storage_data = scenario_data[scenario_data[unit_column] == storage_id]
+                    summer_storage = summer_period[summer_period[unit_column] == storage_id]
+                    winter_storage = winter_period[winter_period[unit_column] == storage_id]
                 else:
                     storage_data = scenario_data
                     summer_storage = summer_period
                     winter_storage = winter_period
                 
-                label = f'Storage {storage_id}'
+                label = f'Storage unit {storage_id}' if unit_column == 'unit' else f'Storage {storage_id}'
                 color = colors[idx]
                 
                 # Summer plot
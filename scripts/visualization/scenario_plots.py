@@ -6,61 +6,37 @@ import numpy as np
 import pandas as pd
 import os
 
+from core.metrics import type_metrics
+
 def plot_scenario_results(results, demand_time_series, branch, bus, scenario_folder, 
                          season_key, id_to_type, id_to_gencost, id_to_pmax):
     """Plot and analyze scenario results"""
-    # Get unique time points
-    time_points = sorted(demand_time_series['time'].unique())
-    
     # Create scenario folder
     os.makedirs(scenario_folder, exist_ok=True)
     
-    # Initialize data structures
-    total_gen_per_asset = {}
-    total_gen_cost_per_asset = {}
-    remaining_capacity_series = {}
-    winter_gen = {}
-    summer_gen = {}
-    
-    # Process generation and demand data
-    for time in time_points:
-        # Get generation for this time point
-        gen_at_t = results['generation'][results['generation']['time'] == time]
-        
-        # Debug print
-        print(f"\nTime {time}:")
-        print("Generation data:", gen_at_t[['id', 'gen']].to_string())
-        
-        # Aggregate generation by type
-        for _, gen_row in gen_at_t.iterrows():
-            gen_type = id_to_type.get(gen_row['id'])
-            if gen_type:
-                # For storage types, gen is already net output (discharge - charge)
-                total_gen_per_asset[gen_type] = total_gen_per_asset.get(gen_type, 0) + gen_row['gen']
-                
-                # Calculate generation cost
-                if gen_row['id'] in id_to_gencost:
-                    cost = gen_row['gen'] * id_to_gencost[gen_row['id']]
-                    total_gen_cost_per_asset[gen_type] = total_gen_cost_per_asset.get(gen_type, 0) + cost
-    
-    # # Debug print
-    # print("\nTotal generation per asset type:")
-    # for asset_type, total_gen in total_gen_per_asset.items():
-    #     print(f"{asset_type}: {total_gen}")
+    # Dispatch of every unit of known type as a (unit x hour) array
+    dispatch = results['generation'][results['generation']['id'].isin(list(id_to_type))]
+    gen = dispatch.pivot_table(index=['id', 'node'], columns='time', values='gen', aggfunc='sum')
+    ids = gen.index.get_level_values('id').to_numpy()
+    gen = gen.to_numpy()
+    n_hours = gen.shape[1]
 
-    # Calculate remaining capacity
-    for gen_type in set(id_to_type.values()):
-        gen_ids = [id for id, typ in id_to_type.items() if typ == gen_type]
-        total_pmax = sum(id_to_pmax.get(id, 0) for id in gen_ids)
-        used_capacity = total_gen_per_asset.get(gen_type, 0)
-        remaining = total_pmax - used_capacity if total_pmax > used_capacity else 0
-        remaining_capacity_series[gen_type] = remaining
+    # Aggregate generation, cost and available energy by type; for storage
+    # types gen is already net output (discharge - charge)
+    metrics = type_metrics(
+        np.array([id_to_type[i] for i in ids], dtype=str),
+        gen,
+        np.repeat(np.array([id_to_pmax.get(i, 0.0) for i in ids], dtype=float)[:, None], n_hours, axis=1),
+        np.repeat(np.array([id_to_gencost.get(i, 0.0) for i in ids], dtype=float)[:, None], n_hours, axis=1)
+    )
+    total_gen_per_asset = metrics.as_dict('generation')
+    total_gen_cost_per_asset = metrics.as_dict('cost')
 
-    # Store seasonal data
-    if season_key == 'winter':
-        winter_gen = total_gen_per_asset.copy()
-    elif season_key == 'summer':
-        summer_gen = total_gen_per_asset.copy()
+    # Remaining capacity: available energy the dispatch did not use
+    remaining_capacity_series = dict(zip(
+        metrics.types.tolist(),
+        np.clip(metrics.available - metrics.generation, 0, None).tolist()
+    ))
 
     # Create figure directory
     figure_dir = os.path.join(scenario_folder, "figure")
@@ -83,7 +59,7 @@ def plot_scenario_results(results, demand_time_series, branch, bus, scenario_fol
     
     # Customize plot
     plt.xlabel('Asset Type')
-    plt.ylabel('Power (MW)')
+    plt.ylabel('Energy (MWh)')
     plt.title(f'Generation and Remaining Capacity - {season_key.capitalize()}')
     plt.xticks(x, all_types, rotation=45)
     plt.legend()
@@ -162,29 +162,46 @@ def create_annual_summary_plots(scenario_data: dict, results_root: str) -> None:
         '30y': scenario_data.get('npv_30y', 0) / 1e6
     }
     
-    # Calculate high and low variants based on load factor sensitivity
-    nominal_load = 1.0
-    high_load = 1.2
-    low_load = 0.8
-    
     # Prepare data for plotting
     years = [10, 20, 30]  # x-axis values
     nominal_values = list(npv_data.values())
     
-    # Calculate high and low values based on load factor scaling
-    high_values = [v * (high_load/nominal_load) for v in nominal_values]
-    low_values = [v * (low_load/nominal_load) for v in nominal_values]
+    # Solved high and low load variants, when the sensitivity was run
+    high_variant = scenario_data.get('high_variant') or {}
+    low_variant = scenario_data.get('low_variant') or {}
+    
+    if all(pd.notna(scenario_data.get(f'npv_p{level}_{y}y')) for level in (10, 90) for y in years):
+        # Monte Carlo P10-P90 range of the investment analysis
+        low_values = [scenario_data[f'npv_p10_{y}y'] / 1e6 for y in years]
+        high_values = [scenario_data[f'npv_p90_{y}y'] / 1e6 for y in years]
+        range_label = 'Monte Carlo P10-P90'
+    elif all(pd.notna(variant.get(f'npv_{y}y')) for variant in (high_variant, low_variant) for y in years):
+        # NPV of the solved high and low load variants
+        high_values = [high_variant[f'npv_{y}y'] / 1e6 for y in years]
+        low_values = [low_variant[f'npv_{y}y'] / 1e6 for y in years]
+        range_label = 'Load Sensitivity Range'
+    else:
+        high_values = low_values = None
+        range_label = 'Nominal'
     
     # Debug prints
     print(f"\nDebug NPV values for {scenario_name}:")
-    print("Nominal (load=1.0):", nominal_values)
-    print("High (load=1.2):", high_values)
-    print("Low (load=0.8):", low_values)
+    print("Nominal:", nominal_values)
+    print("High:", high_values)
+    print("Low:", low_values)
     
     # Plot shaded area for uncertainty
-    ax3.fill_between(years, low_values, high_values, 
-                    alpha=0.3, color='grey', 
-                    label='Load Sensitivity Range')
+    if high_values is not None:
+        ax3.fill_between(years, low_values, high_values, 
+                        alpha=0.3, color='grey', 
+                        label=range_label)
+    
+    # Solved load variants on top of the Monte Carlo range
+    if range_label == 'Monte Carlo P10-P90':
+        for name, variant in (('High Load', high_variant), ('Low Load', low_variant)):
+            if all(pd.notna(variant.get(f'npv_{y}y')) for y in years):
+                ax3.plot(years, [variant[f'npv_{y}y'] / 1e6 for y in years], '--',
+                         linewidth=1, label=f'{name} NPV')
     
     # Plot nominal line
     line = ax3.plot(years, nominal_values, 'o-', 
@@ -200,7 +217,7 @@ def create_annual_summary_plots(scenario_data: dict, results_root: str) -> None:
                 bbox=dict(facecolor='white', edgecolor='none', alpha=0.7))
     
     # Customize plot
-    ax3.set_title('Net Present Value (NPV) with Load Sensitivity')
+    ax3.set_title('Net Present Value (NPV)' if high_values is None else f'Net Present Value (NPV) with {range_label}')
     ax3.set_xlabel('Years')
     ax3.set_ylabel('NPV (Million CHF)')
     